@@ -0,0 +1,130 @@
+"""
+Database pool load test: how request throughput changes with the pool size.
+
+    uv run python benchmarks/db_pool_benchmark.py --pool-sizes 1 2 5 10 20 --concurrency 50
+    uv run python benchmarks/db_pool_benchmark.py --database-uri postgresql+asyncpg://...
+
+Each simulated request checks out a session, reads a page of job listings and then keeps the
+connection for --hold-ms (like a handler awaiting something else mid-transaction). Creates its
+schema from scratch (drops existing tables first, so never point it at a real database).
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from job_agent.db_pool import DbPoolConfig, DbPoolMetrics, create_db_engine
+from job_agent.models import Base, JobListing
+from job_agent.services.job_listing_service import JobService
+
+
+async def _seed(database_uri: str) -> None:
+    engine = create_async_engine(database_uri)
+    now = datetime(2025, 8, 1)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            insert(JobListing),
+            [
+                {
+                    "title": f"Engineer {i}",
+                    "company": "Software Corp",
+                    "application_url": f"https://jobs.example.com/{i}",
+                    "source": "benchmark",
+                    "external_id": str(i),
+                    "posted_at": now - timedelta(minutes=i),
+                    "scraped_at": now,
+                    "updated_at": now,
+                }
+                for i in range(1000)
+            ],
+        )
+    await engine.dispose()
+
+
+async def _run_level(args: argparse.Namespace, pool_size: int) -> None:
+    config = DbPoolConfig(
+        pool_size=pool_size,
+        max_overflow=args.max_overflow,
+        timeout=args.timeout,
+        # Only the stats matter here, not one warning per checkout
+        slow_checkout_seconds=float("inf"),
+    )
+    metrics = DbPoolMetrics(config)
+    engine = create_db_engine(args.database_uri, config, metrics)
+    session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    latencies: list[float] = []
+    errors = 0
+    remaining = iter(range(args.requests))
+
+    async def request() -> None:
+        async with session_maker() as db:
+            await JobService(db, None).list_jobs(limit=20)  # type: ignore[arg-type]
+            await asyncio.sleep(args.hold_ms / 1000)
+
+    async def client() -> None:
+        nonlocal errors
+        for _ in remaining:
+            started = time.perf_counter()
+            try:
+                await request()
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+    await engine.dispose()
+
+    stats = metrics.stats()
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    print(
+        f"{pool_size:>9} {args.requests / elapsed:>9.0f} {quantiles[49] * 1000:>8.1f} "
+        f"{quantiles[98] * 1000:>8.1f} "
+        f"{stats.wait_seconds_total / max(stats.checkouts, 1) * 1000:>12.1f} "
+        f"{stats.wait_seconds_max * 1000:>11.1f} {stats.peak_checked_out:>5} {errors:>7}"
+    )
+
+
+async def _benchmark(args: argparse.Namespace) -> None:
+    await _seed(args.database_uri)
+    print(
+        f"{'pool size':>9} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} "
+        f"{'mean wait ms':>12} {'max wait ms':>11} {'peak':>5} {'errors':>7}"
+    )
+    for pool_size in args.pool_sizes:
+        await _run_level(args, pool_size)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pool-sizes", type=int, nargs="+", default=[1, 2, 5, 10, 20])
+    parser.add_argument("--max-overflow", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--hold-ms", type=float, default=5)
+    parser.add_argument(
+        "--database-uri",
+        default=None,
+        help="Defaults to a throwaway sqlite file. Existing tables are dropped!",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if args.database_uri is None:
+            args.database_uri = f"sqlite+aiosqlite:///{tmp_dir}/db_pool_benchmark.db"
+        asyncio.run(_benchmark(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+PDF extraction under concurrent uploads: the process pool against pypdf in a thread.
+
+    uv run python benchmarks/pdf_extraction_benchmark.py --concurrency 8 --pages 10
+    uv run python benchmarks/pdf_extraction_benchmark.py --workers 1 2 4
+
+Each upload is the sample resume repeated --pages times. While the uploads run, a heartbeat
+coroutine ticks every millisecond, its lag is how long every other request on the worker would
+have been stalled.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from io import BytesIO
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from pypdf import PdfReader, PdfWriter
+
+from job_agent.pdf_extraction import PdfExtractorConfig, PdfTextExtractor
+
+SAMPLE_RESUME = Path(__file__).parent.parent / "tests" / "data" / "resume-sample.pdf"
+
+
+def _make_pdf(pages: int) -> bytes:
+    sample = SAMPLE_RESUME.read_bytes()
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.append(PdfReader(BytesIO(sample)))
+    out = BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+async def _thread_extract(pdf: bytes) -> str:
+    # The old path, kept here for comparison
+    def read() -> str:
+        reader = PdfReader(stream=BytesIO(pdf))
+        text = ""
+        for page in reader.pages:
+            text += page.extract_text() + "\n"
+        return text
+
+    return await asyncio.to_thread(read)
+
+
+async def _run(
+    name: str, extract: Callable[[bytes], Awaitable[str]], pdf: bytes, args
+) -> None:
+    lags: list[float] = []
+    done = asyncio.Event()
+
+    async def heartbeat() -> None:
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.append(time.perf_counter() - started - 0.001)
+
+    latencies: list[float] = []
+    remaining = iter(range(args.uploads))
+
+    async def client() -> None:
+        for _ in remaining:
+            started = time.perf_counter()
+            await extract(pdf)
+            latencies.append(time.perf_counter() - started)
+
+    beat = asyncio.create_task(heartbeat())
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await beat
+
+    lag_quantiles = statistics.quantiles(lags, n=100, method="inclusive")
+    print(
+        f"{name:<12} {args.uploads / elapsed:>9.1f} "
+        f"{statistics.median(latencies) * 1000:>8.0f} {max(latencies) * 1000:>8.0f} "
+        f"{lag_quantiles[98] * 1000:>11.1f} {max(lags) * 1000:>11.1f}"
+    )
+
+
+async def _benchmark(args: argparse.Namespace) -> None:
+    pdf = _make_pdf(args.pages)
+    print(
+        f"{args.uploads} uploads of {args.pages} pages ({len(pdf) / 1024:.0f} KiB), "
+        f"{args.concurrency} at a time"
+    )
+    print(
+        f"{'path':<12} {'docs/s':>9} {'p50 ms':>8} {'max ms':>8} "
+        f"{'p99 lag ms':>11} {'max lag ms':>11}"
+    )
+    await _run("thread", _thread_extract, pdf, args)
+    for workers in args.workers:
+        extractor = PdfTextExtractor(
+            PdfExtractorConfig(
+                workers=workers, max_pages=args.pages, timeout_seconds=60
+            )
+        )
+        # Start the worker processes up front, spawning them isn't what's being measured
+        await asyncio.gather(*(extractor.extract_text(pdf) for _ in range(workers)))
+        try:
+            await _run(f"pool x{workers}", extractor.extract_text, pdf, args)
+        finally:
+            extractor.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--uploads", type=int, default=32)
+    parser.add_argument("--pages", type=int, default=10)
+    asyncio.run(_benchmark(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+Scraper throughput benchmark, run against the local hiring.cafe stand-in so it works offline.
+
+    uv run python benchmarks/scraper_benchmark.py --concurrency 1 8 32 128 --requests 500
+
+Reports requests/sec, p50/p99 latency and peak RSS of the benchmark process (the stand-in
+runs in its own process) for HiringCafeJobScraper.scrape_job and JobService.fetch_job.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import multiprocessing
+import os
+import resource
+import socket
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from job_agent.models import Base
+from job_agent.scrape.http import HttpPoolConfig, HttpPoolMetrics, create_client_session
+from job_agent.scrape.job_scraper import HiringCafeJobScraper
+from job_agent.scrape.rate_limit import (
+    AdaptiveRateLimiter,
+    RateLimiterConfig,
+    RetryPolicy,
+)
+from job_agent.scrape.stand_in import HiringCafeStandIn, StandInConfig
+from job_agent.services.job_listing_service import JobService
+from job_agent.services.schemas import ScrapeJobListingRequest
+
+FIXTURES_DIR = Path(__file__).parent.parent / "tests" / "data" / "hiring_cafe"
+SCENARIOS = ("scrape_job", "fetch_job")
+
+
+@dataclass
+class LevelResult:
+    scenario: str
+    concurrency: int
+    requests: int
+    errors: int
+    requests_per_second: float
+    p50_ms: float
+    p99_ms: float
+    peak_rss_mb: float
+
+
+def _serve_stand_in(fixtures_dir: str, config: StandInConfig, port: int) -> None:
+    async def serve() -> None:
+        stand_in = HiringCafeStandIn.from_directory(fixtures_dir, config)
+        await stand_in.start(port=port)
+        await asyncio.Event().wait()
+
+    asyncio.run(serve())
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_port(port: int, timeout_seconds: float = 10) -> None:
+    deadline = time.monotonic() + timeout_seconds
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"Stand-in never came up on port {port}")
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # No procfs (macOS), fall back to the process high water mark
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+async def _run_level(
+    scenario: str,
+    call: Callable[[str], Awaitable[object]],
+    concurrency: int,
+    requests: int,
+) -> LevelResult:
+    counter = itertools.count()
+    latencies: list[float] = []
+    errors = 0
+    peak_rss = _rss_bytes()
+
+    async def worker() -> None:
+        nonlocal errors
+        while next(counter) < requests:
+            # Unique ids so every request misses the scrape cache
+            job_id = uuid.uuid4().hex
+            started = time.perf_counter()
+            try:
+                await call(job_id)
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    async def sample_rss() -> None:
+        nonlocal peak_rss
+        while True:
+            peak_rss = max(peak_rss, _rss_bytes())
+            await asyncio.sleep(0.01)
+
+    sampler = asyncio.create_task(sample_rss())
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    sampler.cancel()
+
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return LevelResult(
+        scenario=scenario,
+        concurrency=concurrency,
+        requests=requests,
+        errors=errors,
+        requests_per_second=requests / elapsed,
+        p50_ms=quantiles[49] * 1000,
+        p99_ms=quantiles[98] * 1000,
+        peak_rss_mb=peak_rss / (1024 * 1024),
+    )
+
+
+async def _benchmark(args: argparse.Namespace, base_url: str) -> list[LevelResult]:
+    engine = create_async_engine(args.database_uri)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    results = []
+    for scenario in args.scenarios:
+        for concurrency in args.concurrency:
+            pool_config = HttpPoolConfig(
+                limit=max(concurrency, 100), limit_per_host=concurrency
+            )
+            async with create_client_session(
+                pool_config, HttpPoolMetrics(pool_config)
+            ) as session:
+                # The real limits protect hiring.cafe, here they'd only cap the numbers
+                scraper = HiringCafeJobScraper(
+                    session,
+                    base_url,
+                    rate_limiter=AdaptiveRateLimiter(
+                        RateLimiterConfig(rate_per_second=1e9, burst=10**9)
+                    ),
+                    retry_policy=RetryPolicy(base_delay_seconds=0.01),
+                )
+
+                async def scrape_job(job_id: str) -> object:
+                    return await scraper.scrape_job(job_id)
+
+                async def fetch_job(job_id: str) -> object:
+                    async with session_maker() as db:
+                        return await JobService(db, scraper).fetch_job(
+                            ScrapeJobListingRequest(
+                                job_url=f"https://hiring.cafe/job/{job_id}"
+                            )
+                        )
+
+                call = scrape_job if scenario == "scrape_job" else fetch_job
+                result = await _run_level(scenario, call, concurrency, args.requests)
+                results.append(result)
+                print(
+                    f"{result.scenario:<12} {result.concurrency:>6} {result.requests_per_second:>10.1f}"
+                    f" {result.p50_ms:>9.1f} {result.p99_ms:>9.1f} {result.peak_rss_mb:>9.1f}"
+                    f" {result.errors:>7}"
+                )
+
+    await engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 128])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS)
+    )
+    parser.add_argument("--fixtures", default=str(FIXTURES_DIR))
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--padding-bytes", type=int, default=0)
+    parser.add_argument(
+        "--database-uri",
+        default=None,
+        help="Database for the fetch_job scenario, defaults to a throwaway sqlite file",
+    )
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if args.database_uri is None:
+            args.database_uri = f"sqlite+aiosqlite:///{tmp_dir}/benchmark.db"
+
+        port = _free_port()
+        stand_in = multiprocessing.Process(
+            target=_serve_stand_in,
+            args=(
+                args.fixtures,
+                StandInConfig(
+                    latency_seconds=args.latency,
+                    latency_jitter_seconds=args.jitter,
+                    error_rate=args.error_rate,
+                    padding_bytes=args.padding_bytes,
+                    seed=0,
+                ),
+                port,
+            ),
+            daemon=True,
+        )
+        stand_in.start()
+        try:
+            _wait_for_port(port)
+            print(
+                f"{'scenario':<12} {'conc':>6} {'req/s':>10} {'p50 ms':>9} {'p99 ms':>9}"
+                f" {'rss MB':>9} {'errors':>7}"
+            )
+            results = asyncio.run(_benchmark(args, f"http://127.0.0.1:{port}"))
+        finally:
+            stand_in.terminate()
+            stand_in.join()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump([asdict(result) for result in results], f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Full-text search latency benchmark over a synthetic job_listing table.
+
+    uv run python benchmarks/search_benchmark.py --rows 1000000
+    uv run python benchmarks/search_benchmark.py --database-uri postgresql+asyncpg://...
+
+Fills a fresh schema with --rows listings (drops existing tables first, so never point it
+at a real database), then reports p50/p99 latency of JobService.search_jobs per query.
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from job_agent.models import Base, JobListing
+from job_agent.services.job_listing_service import JobService
+
+TITLES = [
+    "Software Engineer",
+    "Senior Backend Engineer",
+    "Frontend Developer",
+    "Data Scientist",
+    "Machine Learning Engineer",
+    "Site Reliability Engineer",
+    "Product Manager",
+    "Accountant",
+    "Registered Nurse",
+    "Graphic Designer",
+    "Sales Representative",
+    "Mechanical Engineer",
+]
+COMPANIES = [
+    f"{word} {suffix}"
+    for word in (
+        "Acme",
+        "Globex",
+        "Initech",
+        "Umbrella",
+        "Hooli",
+        "Stark",
+        "Wayne",
+        "Tyrell",
+    )
+    for suffix in ("Corp", "Labs", "Group", "Ltd")
+]
+WORDS = (
+    "python java kotlin rust golang typescript react kubernetes terraform postgres "
+    "aws azure gcp kafka spark airflow docker linux security payments billing "
+    "customer growth platform mobile ios android design research analytics "
+    "team build ship scale reliable services users product collaborate mentor "
+    "remote hybrid office benefits salary equity learning budget flexible hours"
+).split()
+QUERIES = [
+    "kubernetes",
+    "senior backend engineer",
+    "rust",
+    "machine learning python",
+    "payments platform",
+    "nurse",
+    "accountant remote",
+    "zzzz-no-such-term",
+]
+
+
+async def _fill(engine, rows: int, batch_size: int, seed: int) -> None:
+    rng = random.Random(seed)
+    now = datetime(2025, 8, 1)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    started = time.perf_counter()
+    for offset in range(0, rows, batch_size):
+        batch = [
+            {
+                "title": rng.choice(TITLES),
+                "company": rng.choice(COMPANIES),
+                "application_url": f"https://jobs.example.com/{offset + i}",
+                "description": " ".join(rng.choices(WORDS, k=120)),
+                "source": "benchmark",
+                "external_id": str(offset + i),
+                "posted_at": now - timedelta(minutes=offset + i),
+                "scraped_at": now,
+                "updated_at": now,
+            }
+            for i in range(min(batch_size, rows - offset))
+        ]
+        async with engine.begin() as conn:
+            await conn.execute(insert(JobListing), batch)
+    print(f"Inserted {rows} listings in {time.perf_counter() - started:.1f}s")
+
+    async with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            await conn.exec_driver_sql("ANALYZE job_listing")
+        elif engine.dialect.name == "sqlite":
+            await conn.exec_driver_sql(
+                "INSERT INTO job_listing_fts(job_listing_fts) VALUES ('optimize')"
+            )
+
+
+async def _benchmark(args: argparse.Namespace) -> None:
+    engine = create_async_engine(args.database_uri)
+    if not args.skip_fill:
+        await _fill(engine, args.rows, args.batch_size, args.seed)
+    session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    print(f"{'query':<28} {'results':>8} {'p50 ms':>9} {'p99 ms':>9}")
+    for query in QUERIES:
+        latencies = []
+        results = []
+        for _ in range(args.iterations):
+            async with session_maker() as db:
+                started = time.perf_counter()
+                results = await JobService(db, None).search_jobs(query, args.limit)  # type: ignore[arg-type]
+                latencies.append(time.perf_counter() - started)
+
+        quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+        print(
+            f"{query:<28} {len(results):>8} {quantiles[49] * 1000:>9.1f} {quantiles[98] * 1000:>9.1f}"
+        )
+
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--database-uri",
+        default=None,
+        help="Defaults to a throwaway sqlite file. Existing tables are dropped!",
+    )
+    parser.add_argument(
+        "--skip-fill",
+        action="store_true",
+        help="Reuse the listings from a previous run against --database-uri",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if args.database_uri is None:
+            args.database_uri = f"sqlite+aiosqlite:///{tmp_dir}/search_benchmark.db"
+        asyncio.run(_benchmark(args))
+
+
+if __name__ == "__main__":
+    main()
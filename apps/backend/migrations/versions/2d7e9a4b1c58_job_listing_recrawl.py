@@ -0,0 +1,41 @@
+"""Job listing re-crawl columns
+
+Revision ID: 2d7e9a4b1c58
+Revises: 8f3b2d61c4a7
+Create Date: 2025-08-18 14:27:05.531947
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2d7e9a4b1c58"
+down_revision: Union[str, Sequence[str], None] = "8f3b2d61c4a7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "job_listing", sa.Column("content_hash", sa.String(length=64), nullable=True)
+    )
+    op.add_column(
+        "job_listing", sa.Column("etag", sa.String(length=255), nullable=True)
+    )
+    op.add_column("job_listing", sa.Column("closed_at", sa.DateTime(), nullable=True))
+    op.create_index(
+        "ix_job_listing_scraped_at", "job_listing", ["scraped_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_job_listing_scraped_at", table_name="job_listing")
+    op.drop_column("job_listing", "closed_at")
+    op.drop_column("job_listing", "etag")
+    op.drop_column("job_listing", "content_hash")
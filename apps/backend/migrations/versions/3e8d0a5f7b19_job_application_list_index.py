@@ -0,0 +1,32 @@
+"""Job application list index
+
+Revision ID: 3e8d0a5f7b19
+Revises: 7b2f9c4e1a06
+Create Date: 2025-08-25 09:12:04.581337
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3e8d0a5f7b19"
+down_revision: Union[str, Sequence[str], None] = "7b2f9c4e1a06"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_job_application_candidate_id_id",
+        "job_application",
+        ["candidate_id", "id"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_job_application_candidate_id_id", table_name="job_application")
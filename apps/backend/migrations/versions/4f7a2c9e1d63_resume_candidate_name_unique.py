@@ -0,0 +1,41 @@
+"""Resume names unique per candidate
+
+Revision ID: 4f7a2c9e1d63
+Revises: b6d1f3a8c720
+Create Date: 2025-08-29 10:12:47.318560
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4f7a2c9e1d63"
+down_revision: Union[str, Sequence[str], None] = "b6d1f3a8c720"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Duplicates could have slipped past the old check in a race. Applications may point at them,
+    # so rename all but the first rather than deleting them
+    op.execute(
+        """
+        UPDATE resume
+        SET _name = SUBSTR(_name, 1, 36) || ' (' || id || ')'
+        WHERE id NOT IN (
+            SELECT MIN(id) FROM resume GROUP BY candidate_id, _name
+        )
+        """
+    )
+    op.create_index(
+        "ix_resume_candidate_id_name", "resume", ["candidate_id", "_name"], unique=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_resume_candidate_id_name", table_name="resume")
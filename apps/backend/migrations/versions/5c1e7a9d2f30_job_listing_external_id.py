@@ -0,0 +1,38 @@
+"""Job listing external id
+
+Revision ID: 5c1e7a9d2f30
+Revises: bd0006e98069
+Create Date: 2025-08-16 11:02:13.418220
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5c1e7a9d2f30"
+down_revision: Union[str, Sequence[str], None] = "bd0006e98069"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "job_listing", sa.Column("external_id", sa.String(length=500), nullable=True)
+    )
+    op.create_index(
+        "ix_job_listing_source_external_id",
+        "job_listing",
+        ["source", "external_id"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_job_listing_source_external_id", table_name="job_listing")
+    op.drop_column("job_listing", "external_id")
@@ -0,0 +1,69 @@
+"""Resume processing status
+
+Revision ID: 6c2e9b4f0a17
+Revises: 4f7a2c9e1d63
+Create Date: 2025-08-30 14:41:09.502186
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6c2e9b4f0a17"
+down_revision: Union[str, Sequence[str], None] = "4f7a2c9e1d63"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+resume_processing_status = sa.Enum(
+    "PENDING", "PROCESSING", "READY", "FAILED", name="resumeprocessingstatus"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    resume_processing_status.create(op.get_bind())
+    # Everything uploaded so far was extracted during the upload
+    with op.batch_alter_table("resume") as batch_op:
+        batch_op.alter_column("text_content", existing_type=sa.Text(), nullable=True)
+        batch_op.add_column(
+            sa.Column(
+                "processing_status",
+                resume_processing_status,
+                nullable=False,
+                server_default="READY",
+            )
+        )
+        batch_op.add_column(
+            sa.Column(
+                "processing_attempts", sa.Integer(), nullable=False, server_default="0"
+            )
+        )
+        batch_op.add_column(sa.Column("processing_error", sa.Text(), nullable=True))
+        batch_op.add_column(
+            sa.Column("processing_lease_expires_at", sa.DateTime(), nullable=True)
+        )
+    op.create_index(
+        "ix_resume_processing_status_id",
+        "resume",
+        ["processing_status", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_resume_processing_status_id", table_name="resume")
+    # Resumes that never got processed have no text to put back
+    op.execute("UPDATE resume SET text_content = '' WHERE text_content IS NULL")
+    with op.batch_alter_table("resume") as batch_op:
+        batch_op.drop_column("processing_lease_expires_at")
+        batch_op.drop_column("processing_error")
+        batch_op.drop_column("processing_attempts")
+        batch_op.drop_column("processing_status")
+        batch_op.alter_column("text_content", existing_type=sa.Text(), nullable=False)
+    resume_processing_status.drop(op.get_bind(), checkfirst=True)
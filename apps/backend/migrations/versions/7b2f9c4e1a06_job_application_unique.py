@@ -0,0 +1,48 @@
+"""Job application unique per candidate and listing
+
+Revision ID: 7b2f9c4e1a06
+Revises: e5a1b7c3d942
+Create Date: 2025-08-24 10:41:52.306118
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7b2f9c4e1a06"
+down_revision: Union[str, Sequence[str], None] = "e5a1b7c3d942"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep the first application of each duplicate set, the index can't be built around the rest
+    op.execute(
+        """
+        DELETE FROM job_application
+        WHERE job_listing_id IS NOT NULL
+          AND id NOT IN (
+            SELECT MIN(id)
+            FROM job_application
+            WHERE job_listing_id IS NOT NULL
+            GROUP BY candidate_id, job_listing_id
+          )
+        """
+    )
+    op.create_index(
+        "ix_job_application_candidate_id_job_listing_id",
+        "job_application",
+        ["candidate_id", "job_listing_id"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_job_application_candidate_id_job_listing_id", table_name="job_application"
+    )
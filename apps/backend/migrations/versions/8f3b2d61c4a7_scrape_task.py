@@ -0,0 +1,55 @@
+"""Scrape task queue
+
+Revision ID: 8f3b2d61c4a7
+Revises: 5c1e7a9d2f30
+Create Date: 2025-08-17 09:41:52.106384
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8f3b2d61c4a7"
+down_revision: Union[str, Sequence[str], None] = "5c1e7a9d2f30"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+scrape_task_status = sa.Enum(
+    "QUEUED", "RUNNING", "SUCCEEDED", "FAILED", name="scrapetaskstatus"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "scrape_task",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("job_url", sa.String(length=500), nullable=False),
+        sa.Column("status", scrape_task_status, nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("lease_expires_at", sa.DateTime(), nullable=True),
+        sa.Column("job_listing_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["job_listing_id"],
+            ["job_listing.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_scrape_task_status_id", "scrape_task", ["status", "id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_scrape_task_status_id", table_name="scrape_task")
+    op.drop_table("scrape_task")
+    scrape_task_status.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,67 @@
+"""Job application status counts
+
+Revision ID: 9a4c6e2d8f15
+Revises: 3e8d0a5f7b19
+Create Date: 2025-08-26 14:27:45.903612
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9a4c6e2d8f15"
+down_revision: Union[str, Sequence[str], None] = "3e8d0a5f7b19"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+JOB_APPLICATION_STATUSES = (
+    "PENDING",
+    "APPLYING",
+    "APPLIED",
+    "INTERVIEWING",
+    "REJECTED",
+    "OFFERED",
+)
+
+# The type already exists on Postgres, it came in with job_application
+job_application_status = sa.Enum(
+    *JOB_APPLICATION_STATUSES, name="jobapplicationstatus"
+).with_variant(
+    postgresql.ENUM(
+        *JOB_APPLICATION_STATUSES, name="jobapplicationstatus", create_type=False
+    ),
+    "postgresql",
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "job_application_status_count",
+        sa.Column("candidate_id", sa.Integer(), nullable=False),
+        sa.Column("application_status", job_application_status, nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["candidate_id"],
+            ["candidate.id"],
+        ),
+        sa.PrimaryKeyConstraint("candidate_id", "application_status"),
+    )
+    op.execute(
+        """
+        INSERT INTO job_application_status_count (candidate_id, application_status, count)
+        SELECT candidate_id, _application_status, COUNT(*)
+        FROM job_application
+        GROUP BY candidate_id, _application_status
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("job_application_status_count")
@@ -0,0 +1,34 @@
+"""Job listing browse index
+
+Revision ID: a4c8e2f06b91
+Revises: 2d7e9a4b1c58
+Create Date: 2025-08-19 10:06:37.284115
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a4c8e2f06b91"
+down_revision: Union[str, Sequence[str], None] = "2d7e9a4b1c58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_job_listing_posted_at_id",
+        "job_listing",
+        [sa.text("posted_at DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_job_listing_posted_at_id", table_name="job_listing")
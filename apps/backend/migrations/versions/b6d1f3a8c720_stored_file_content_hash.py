@@ -0,0 +1,49 @@
+"""Stored file content hash and reference count
+
+Revision ID: b6d1f3a8c720
+Revises: 9a4c6e2d8f15
+Create Date: 2025-08-28 16:05:31.774209
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b6d1f3a8c720"
+down_revision: Union[str, Sequence[str], None] = "9a4c6e2d8f15"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "stored_file", sa.Column("content_hash", sa.String(length=64), nullable=True)
+    )
+    op.add_column(
+        "stored_file",
+        sa.Column("ref_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    # Existing files were never shared, they have no hash and one reference per resume
+    op.execute(
+        """
+        UPDATE stored_file
+        SET ref_count = (
+            SELECT COUNT(*) FROM resume WHERE resume.stored_file_id = stored_file.id
+        )
+        """
+    )
+    op.create_index(
+        "ix_stored_file_content_hash", "stored_file", ["content_hash"], unique=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_stored_file_content_hash", table_name="stored_file")
+    op.drop_column("stored_file", "ref_count")
+    op.drop_column("stored_file", "content_hash")
@@ -0,0 +1,89 @@
+"""Job listing full-text search
+
+Revision ID: c91d5f3a7e24
+Revises: a4c8e2f06b91
+Create Date: 2025-08-20 16:52:19.770412
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c91d5f3a7e24"
+down_revision: Union[str, Sequence[str], None] = "a4c8e2f06b91"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect_name = op.get_bind().dialect.name
+
+    if dialect_name == "postgresql":
+        # Adding a stored generated column fills it in for existing rows
+        op.execute(
+            """
+            ALTER TABLE job_listing ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(company, '')), 'B') ||
+                setweight(to_tsvector('english', coalesce(description, '')), 'C')
+            ) STORED
+            """
+        )
+        op.execute(
+            "CREATE INDEX ix_job_listing_search_vector ON job_listing USING gin (search_vector)"
+        )
+    elif dialect_name == "sqlite":
+        op.execute(
+            """
+            CREATE VIRTUAL TABLE job_listing_fts USING fts5(
+                title, company, description,
+                content='job_listing', content_rowid='id', tokenize='porter unicode61'
+            )
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER job_listing_fts_insert AFTER INSERT ON job_listing BEGIN
+                INSERT INTO job_listing_fts(rowid, title, company, description)
+                VALUES (new.id, new.title, new.company, new.description);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER job_listing_fts_delete AFTER DELETE ON job_listing BEGIN
+                INSERT INTO job_listing_fts(job_listing_fts, rowid, title, company, description)
+                VALUES ('delete', old.id, old.title, old.company, old.description);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER job_listing_fts_update AFTER UPDATE OF title, company, description
+            ON job_listing BEGIN
+                INSERT INTO job_listing_fts(job_listing_fts, rowid, title, company, description)
+                VALUES ('delete', old.id, old.title, old.company, old.description);
+                INSERT INTO job_listing_fts(rowid, title, company, description)
+                VALUES (new.id, new.title, new.company, new.description);
+            END
+            """
+        )
+        op.execute("INSERT INTO job_listing_fts(job_listing_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect_name = op.get_bind().dialect.name
+
+    if dialect_name == "postgresql":
+        op.execute("DROP INDEX ix_job_listing_search_vector")
+        op.execute("ALTER TABLE job_listing DROP COLUMN search_vector")
+    elif dialect_name == "sqlite":
+        op.execute("DROP TRIGGER job_listing_fts_update")
+        op.execute("DROP TRIGGER job_listing_fts_delete")
+        op.execute("DROP TRIGGER job_listing_fts_insert")
+        op.execute("DROP TABLE job_listing_fts")
@@ -0,0 +1,45 @@
+"""Compressed storage for job listing descriptions
+
+Revision ID: e5a1b7c3d942
+Revises: c91d5f3a7e24
+Create Date: 2025-08-22 10:14:37.218690
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e5a1b7c3d942"
+down_revision: Union[str, Sequence[str], None] = "c91d5f3a7e24"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Only applies to descriptions written from now on, VACUUM FULL recompresses the existing ones
+    if op.get_bind().dialect.name == "postgresql":
+        # lz4 isn't built into every server, those keep the default pglz
+        op.execute(
+            """
+            DO $$
+            BEGIN
+                ALTER TABLE job_listing ALTER COLUMN description SET COMPRESSION lz4;
+            EXCEPTION WHEN feature_not_supported THEN
+                RAISE NOTICE 'lz4 is not available, job_listing.description keeps the default compression';
+            END $$
+            """
+        )
+        op.execute("ALTER TABLE job_listing SET (toast_tuple_target = 512)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            "ALTER TABLE job_listing ALTER COLUMN description SET COMPRESSION default"
+        )
+        op.execute("ALTER TABLE job_listing RESET (toast_tuple_target)")
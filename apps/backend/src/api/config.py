@@ -26,6 +26,58 @@ class Settings(BaseSettings):
 
     mock_delay: bool = False
 
+    db_pool_size: int = 5
+    db_pool_max_overflow: int = 10
+    db_pool_timeout: float = 30
+    db_pool_recycle: float = 1800
+    db_pool_pre_ping: bool = True
+    db_pool_slow_checkout_seconds: float = 0.5
+    # JSON list, e.g. DATABASE_REPLICA_URIS='["postgresql+asyncpg://..."]'. Reads use the primary when empty
+    database_replica_uris: list[str] = []
+    db_replica_failure_cooldown_seconds: float = 30
+    db_read_your_writes_seconds: float = 5
+
+    pdf_extraction_workers: int = 2
+    pdf_extraction_max_pages: int = 20
+    pdf_extraction_timeout_seconds: float = 10
+    resume_max_upload_bytes: int = 10 * 1024 * 1024
+
+    resume_workers_enabled: bool = True
+    resume_worker_concurrency: int = 2
+    resume_worker_poll_interval: float = 1
+    resume_processing_lease_seconds: float = 120
+    resume_processing_max_attempts: int = 3
+
+    scrape_max_concurrency: int = 10
+
+    scrape_http_limit: int = 100
+    scrape_http_limit_per_host: int = 20
+    scrape_http_keepalive_timeout: float = 30
+    scrape_http_dns_cache_ttl: int = 300
+    scrape_http_connect_timeout: float = 5
+    scrape_http_read_timeout: float = 15
+    scrape_http_total_timeout: float = 30
+
+    scrape_rate_per_second: float = 5
+    scrape_rate_burst: int = 10
+    scrape_min_rate_per_second: float = 0.5
+    scrape_max_rate_limit_wait: float = 30
+    scrape_retry_attempts: int = 4
+    scrape_retry_base_delay: float = 0.5
+    scrape_retry_max_delay: float = 10
+
+    scrape_workers_enabled: bool = True
+    scrape_worker_concurrency: int = 4
+    scrape_worker_poll_interval: float = 1
+    scrape_task_lease_seconds: float = 300
+    scrape_task_max_attempts: int = 3
+
+    recrawl_enabled: bool = True
+    recrawl_max_age_seconds: float = 24 * 60 * 60
+    recrawl_batch_size: int = 50
+    recrawl_rate_per_second: float = 1
+    recrawl_interval_seconds: float = 15 * 60
+
     model_config = SettingsConfigDict(env_file=dotenv_path)
 
     environment: str = ENV
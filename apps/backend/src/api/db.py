@@ -1,19 +1,31 @@
+import time
 from typing import AsyncGenerator
 
+from fastapi import Request
+from sqlalchemy import make_url
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
-    create_async_engine,
     AsyncEngine,
 )
 
 from api.config import settings
+from job_agent.db_pool import DbPoolConfig, DbPoolMetrics, create_db_engine
+from job_agent.db_replicas import ReplicaRouter
 
 
-engine: AsyncEngine = create_async_engine(
-    settings.database_uri,
-    echo=False,
-    future=True,
+db_pool_config = DbPoolConfig(
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_pool_max_overflow,
+    timeout=settings.db_pool_timeout,
+    recycle=settings.db_pool_recycle,
+    pre_ping=settings.db_pool_pre_ping,
+    slow_checkout_seconds=settings.db_pool_slow_checkout_seconds,
+)
+db_pool_metrics = DbPoolMetrics(db_pool_config)
+
+engine: AsyncEngine = create_db_engine(
+    settings.database_uri, db_pool_config, db_pool_metrics
 )
 
 
@@ -22,9 +34,46 @@ async_session_maker = async_sessionmaker(
 )
 
 
+# Replicas share the primary's pool settings, each with its own pool (and its own metrics,
+# served with the rest of the replica stats)
+replica_session_makers: dict[str, async_sessionmaker[AsyncSession]] = {}
+replica_pool_metrics: dict[str, DbPoolMetrics] = {}
+for uri in settings.database_replica_uris:
+    name = make_url(uri).render_as_string(hide_password=True)
+    replica_pool_metrics[name] = DbPoolMetrics(db_pool_config)
+    replica_session_makers[name] = async_sessionmaker(
+        bind=create_db_engine(uri, db_pool_config, replica_pool_metrics[name]),
+        expire_on_commit=False,
+        autocommit=False,
+    )
+
+replica_router = ReplicaRouter(
+    async_session_maker,
+    replica_session_makers,
+    failure_cooldown_seconds=settings.db_replica_failure_cooldown_seconds,
+    pool_metrics=replica_pool_metrics,
+)
+
+# Set after a successful write, reads stay on the primary until the replicas have caught up
+READ_FROM_PRIMARY_COOKIE = "read_from_primary_until"
+
+
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     async with async_session_maker() as session:
         try:
             yield session
         finally:
             await session.close()
+
+
+async def get_read_db_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    # For read-only service methods, served by a replica when one is configured
+    try:
+        recently_wrote = (
+            float(request.cookies.get(READ_FROM_PRIMARY_COOKIE, 0)) > time.time()
+        )
+    except ValueError:
+        recently_wrote = False
+
+    async with replica_router.read_session(force_primary=recently_wrote) as session:
+        yield session
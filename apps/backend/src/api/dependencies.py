@@ -1,38 +1,46 @@
+from contextlib import AbstractAsyncContextManager
 from typing import Optional, Any, AsyncGenerator
 
-from fastapi import Depends
+from fastapi import Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from types_aiobotocore_s3 import S3Client
 
 from job_agent.scrape.dependencies import get_job_scraper
 from job_agent.scrape.job_scraper import HiringCafeJobScraper
 from job_agent.services.candidate_service import CandidateService
-from api.db import get_db_session
+from api.db import get_db_session, get_read_db_session
 from api.config import settings
 
 from job_agent.services.job_application_service import JobApplicationService
-from job_agent.services.job_listing_service import JobService
+from job_agent.services.job_listing_service import JobImportService, JobService
 
 
 import aioboto3
 from botocore.config import Config
 
+from job_agent.pdf_extraction import PdfTextExtractor
 from job_agent.services.resume_service import ResumeService
 from job_agent.services.s3_file_uploader import S3FileUploader
+from job_agent.workers.resume_worker import ResumeWorkerPool
+from job_agent.workers.scrape_worker import ScrapeWorkerPool
 
 
 _session = aioboto3.Session()
 
 
-async def get_s3_client() -> AsyncGenerator[S3Client, None]:
-    async with _session.client(
+def create_s3_client() -> AbstractAsyncContextManager[S3Client]:
+    return _session.client(
         "s3",
         endpoint_url=settings.s3_endpoint_url,
         aws_access_key_id=settings.s3_access_key_id,
         aws_secret_access_key=settings.s3_secret_access_key,
         region_name=settings.s3_region_name,
         config=Config(s3={"addressing_style": "path"}),
-    ) as s3_client:
+    )
+
+
+async def get_s3_client() -> AsyncGenerator[S3Client, None]:
+    async with create_s3_client() as s3_client:
         yield s3_client
 
 
@@ -50,11 +58,35 @@ async def get_candidate_service(
     return CandidateService(db, s3_file_uploader)
 
 
+async def get_read_only_candidate_service(
+    db: AsyncSession = Depends(get_read_db_session),
+    s3_file_uploader: S3FileUploader = Depends(get_s3_file_uploader),
+) -> CandidateService:
+    return CandidateService(db, s3_file_uploader)
+
+
 async def get_job_listing_service(
     job_scraper: HiringCafeJobScraper = Depends(get_job_scraper),
     db: AsyncSession = Depends(get_db_session),
 ) -> JobService:
-    return JobService(db, job_scraper)
+    return JobService(db, job_scraper, settings.scrape_max_concurrency)
+
+
+async def get_read_only_job_listing_service(
+    job_scraper: HiringCafeJobScraper = Depends(get_job_scraper),
+    db: AsyncSession = Depends(get_read_db_session),
+) -> JobService:
+    return JobService(db, job_scraper, settings.scrape_max_concurrency)
+
+
+async def get_job_import_service(
+    db: AsyncSession = Depends(get_db_session),
+) -> JobImportService:
+    return JobImportService(db)
+
+
+def get_scrape_worker_pool(request: Request) -> ScrapeWorkerPool:
+    return request.app.state.scrape_worker_pool
 
 
 async def get_job_application_service(
@@ -63,8 +95,35 @@ async def get_job_application_service(
     return JobApplicationService(db)
 
 
+async def get_read_only_job_application_service(
+    db: AsyncSession = Depends(get_read_db_session),
+) -> JobApplicationService:
+    return JobApplicationService(db)
+
+
+def get_pdf_extractor(request: Request) -> PdfTextExtractor:
+    return request.app.state.pdf_extractor
+
+
+def get_resume_worker_pool(request: Request) -> ResumeWorkerPool:
+    return request.app.state.resume_worker_pool
+
+
 async def get_resume_service(
     db: AsyncSession = Depends(get_db_session),
     s3_file_uploader: S3FileUploader = Depends(get_s3_file_uploader),
+    pdf_extractor: PdfTextExtractor = Depends(get_pdf_extractor),
+) -> ResumeService:
+    return ResumeService(
+        db, s3_file_uploader, pdf_extractor, settings.resume_max_upload_bytes
+    )
+
+
+async def get_read_only_resume_service(
+    db: AsyncSession = Depends(get_read_db_session),
+    s3_file_uploader: S3FileUploader = Depends(get_s3_file_uploader),
+    pdf_extractor: PdfTextExtractor = Depends(get_pdf_extractor),
 ) -> ResumeService:
-    return ResumeService(db, s3_file_uploader)
+    return ResumeService(
+        db, s3_file_uploader, pdf_extractor, settings.resume_max_upload_bytes
+    )
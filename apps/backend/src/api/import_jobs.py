@@ -0,0 +1,72 @@
+"""
+Bulk import job listings from a partner dump, without going through the API.
+
+    uv run python -m api.import_jobs listings.csv
+    uv run python -m api.import_jobs listings.ndjson --format ndjson
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import AsyncIterator
+
+from api.db import async_session_maker, engine
+from job_agent.services.job_import import JobImportFormat
+from job_agent.services.job_listing_service import JobImportService
+
+CHUNK_BYTES = 1024 * 1024
+
+
+async def _read_chunks(path: Path) -> AsyncIterator[bytes]:
+    with path.open("rb") as f:
+        while chunk := await asyncio.to_thread(f.read, CHUNK_BYTES):
+            yield chunk
+
+
+async def _import(path: Path, format: JobImportFormat) -> int:
+    started = time.perf_counter()
+    async with async_session_maker() as db:
+        result = await JobImportService(db).import_jobs(_read_chunks(path), format)
+    await engine.dispose()
+    elapsed = time.perf_counter() - started
+
+    for error in result.errors:
+        print(f"{path}:{error.line}: {error.error}", file=sys.stderr)
+    if result.failed > len(result.errors):
+        print(
+            f"... and {result.failed - len(result.errors)} more errors", file=sys.stderr
+        )
+    print(
+        f"Imported {result.imported} listings in {elapsed:.1f}s "
+        f"({result.imported / elapsed:,.0f} rows/s), {result.skipped} already existed, "
+        f"{result.failed} failed"
+    )
+    return 1 if result.failed else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk import job listings")
+    parser.add_argument("path", type=Path)
+    parser.add_argument(
+        "--format",
+        type=JobImportFormat,
+        choices=list(JobImportFormat),
+        default=None,
+        help="Defaults to the file extension (.csv, .ndjson/.jsonl)",
+    )
+    args = parser.parse_args()
+
+    format = args.format
+    if format is None:
+        format = (
+            JobImportFormat.CSV
+            if args.path.suffix.lower() == ".csv"
+            else JobImportFormat.NDJSON
+        )
+    sys.exit(asyncio.run(_import(args.path, format)))
+
+
+if __name__ == "__main__":
+    main()
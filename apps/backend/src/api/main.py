@@ -1,19 +1,126 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.middleware.cors import CORSMiddleware
 
 import asyncio
+import math
+import time
 
 from api.config import settings
+from api.dependencies import create_s3_client
+from api.db import (
+    READ_FROM_PRIMARY_COOKIE,
+    async_session_maker,
+    db_pool_metrics,
+    replica_router,
+)
+from job_agent.pdf_extraction import PdfExtractorConfig, PdfTextExtractor
+from job_agent.scrape.dependencies import create_job_scraper
+from job_agent.scrape.http import HttpPoolConfig, HttpPoolMetrics, create_client_session
+from job_agent.scrape.rate_limit import (
+    AdaptiveRateLimiter,
+    RateLimiterConfig,
+    RetryPolicy,
+)
+from job_agent.workers.recrawl_sweeper import RecrawlSweeper
+from job_agent.workers.resume_worker import ResumeWorkerPool
+from job_agent.workers.scrape_worker import ScrapeWorkerPool
 from api.routers import (
     auth_router,
     candidate_router,
     me_router,
     job_application_router,
     job_listing_router,
+    metrics_router,
 )
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    http_pool_config = HttpPoolConfig(
+        limit=settings.scrape_http_limit,
+        limit_per_host=settings.scrape_http_limit_per_host,
+        keepalive_timeout=settings.scrape_http_keepalive_timeout,
+        dns_cache_ttl=settings.scrape_http_dns_cache_ttl,
+        connect_timeout=settings.scrape_http_connect_timeout,
+        read_timeout=settings.scrape_http_read_timeout,
+        total_timeout=settings.scrape_http_total_timeout,
+    )
+    app.state.db_pool_metrics = db_pool_metrics
+    app.state.replica_router = replica_router
+    app.state.pdf_extractor = PdfTextExtractor(
+        PdfExtractorConfig(
+            workers=settings.pdf_extraction_workers,
+            max_pages=settings.pdf_extraction_max_pages,
+            timeout_seconds=settings.pdf_extraction_timeout_seconds,
+        )
+    )
+    app.state.resume_worker_pool = ResumeWorkerPool(
+        async_session_maker,
+        create_s3_client,
+        settings.s3_bucket_name,
+        app.state.pdf_extractor,
+        concurrency=settings.resume_worker_concurrency,
+        poll_interval_seconds=settings.resume_worker_poll_interval,
+        lease_seconds=settings.resume_processing_lease_seconds,
+        max_attempts=settings.resume_processing_max_attempts,
+    )
+    if settings.resume_workers_enabled:
+        app.state.resume_worker_pool.start()
+    app.state.http_pool_metrics = HttpPoolMetrics(http_pool_config)
+    app.state.http_session = create_client_session(
+        http_pool_config, app.state.http_pool_metrics
+    )
+    app.state.scrape_rate_limiter = AdaptiveRateLimiter(
+        RateLimiterConfig(
+            rate_per_second=settings.scrape_rate_per_second,
+            burst=settings.scrape_rate_burst,
+            min_rate_per_second=settings.scrape_min_rate_per_second,
+            max_wait_seconds=settings.scrape_max_rate_limit_wait,
+        )
+    )
+    app.state.scrape_retry_policy = RetryPolicy(
+        max_attempts=settings.scrape_retry_attempts,
+        base_delay_seconds=settings.scrape_retry_base_delay,
+        max_delay_seconds=settings.scrape_retry_max_delay,
+    )
+
+    app.state.scrape_worker_pool = ScrapeWorkerPool(
+        async_session_maker,
+        lambda: create_job_scraper(app.state),
+        concurrency=settings.scrape_worker_concurrency,
+        poll_interval_seconds=settings.scrape_worker_poll_interval,
+        lease_seconds=settings.scrape_task_lease_seconds,
+        max_attempts=settings.scrape_task_max_attempts,
+    )
+    if settings.scrape_workers_enabled:
+        app.state.scrape_worker_pool.start()
+
+    app.state.recrawl_sweeper = RecrawlSweeper(
+        async_session_maker,
+        lambda: create_job_scraper(app.state),
+        max_age_seconds=settings.recrawl_max_age_seconds,
+        batch_size=settings.recrawl_batch_size,
+        rate_per_second=settings.recrawl_rate_per_second,
+        interval_seconds=settings.recrawl_interval_seconds,
+        scrape_concurrency=settings.scrape_max_concurrency,
+    )
+    if settings.recrawl_enabled:
+        app.state.recrawl_sweeper.start()
+
+    try:
+        yield
+    finally:
+        await app.state.recrawl_sweeper.stop()
+        await app.state.scrape_worker_pool.stop()
+        await app.state.http_session.close()
+        await app.state.resume_worker_pool.stop()
+        app.state.pdf_extractor.close()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -33,6 +140,30 @@ class DelayMiddleware(BaseHTTPMiddleware):
 if settings.mock_delay:
     app.add_middleware(DelayMiddleware)
 
+
+class ReadYourWritesMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+        if (
+            request.method not in ("GET", "HEAD", "OPTIONS")
+            and response.status_code < 400
+        ):
+            response.set_cookie(
+                key=READ_FROM_PRIMARY_COOKIE,
+                value=str(time.time() + settings.db_read_your_writes_seconds),
+                httponly=True,
+                secure=settings.cookie_secure,
+                domain=settings.cookie_domain,
+                samesite="strict",
+                max_age=math.ceil(settings.db_read_your_writes_seconds),
+                path="/",
+            )
+        return response
+
+
+if settings.database_replica_uris:
+    app.add_middleware(ReadYourWritesMiddleware)
+
 app.include_router(auth_router, prefix="/auth", tags=["auth"])
 app.include_router(candidate_router, prefix="/candidates", tags=["candidate"])
 app.include_router(me_router, prefix="/me", tags=["me"])
@@ -40,6 +171,7 @@ app.include_router(job_listing_router, prefix="/job-listings", tags=["job-listin
 app.include_router(
     job_application_router, prefix="/job-applications", tags=["job-applications"]
 )
+app.include_router(metrics_router, prefix="/metrics", tags=["metrics"])
 
 
 @app.get("/health")
@@ -3,3 +3,4 @@ from .candidate_router import candidate_router
 from .job_application_router import job_application_router
 from .me_router import me_router
 from .job_listing_router import job_listing_router
+from .metrics_router import metrics_router
@@ -7,7 +7,11 @@ from api.routers.utils import ErrorModel
 from job_agent.services.job_application_service import (
     JobApplicationService,
 )
-from job_agent.services.schemas import CreateJobApplicationRequest, JobApplicationDTO
+from job_agent.services.schemas import (
+    CreateJobApplicationRequest,
+    JobApplicationDTO,
+    UpdateJobApplicationStatusRequest,
+)
 
 job_application_router = APIRouter()
 
@@ -26,3 +30,20 @@ async def apply_job(
     service: JobApplicationService = Depends(get_job_application_service),
 ):
     return await service.create_job_application(current_user_id, request)
+
+
+@job_application_router.patch(
+    "/{job_application_id}",
+    response_model=JobApplicationDTO,
+    responses={404: {"model": ErrorModel}},
+    operation_id="updateJobApplicationStatus",
+)
+async def update_job_application_status(
+    job_application_id: int,
+    request: UpdateJobApplicationStatusRequest,
+    current_user_id: int = Depends(get_current_user_id),
+    service: JobApplicationService = Depends(get_job_application_service),
+):
+    return await service.update_job_application_status(
+        current_user_id, job_application_id, request
+    )
@@ -1,33 +1,183 @@
-from fastapi import APIRouter, Depends
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, Query, Request
 
 from api.auth import get_current_user_id
-from api.dependencies import get_job_listing_service
+from api.dependencies import (
+    get_job_import_service,
+    get_job_listing_service,
+    get_read_only_job_listing_service,
+    get_scrape_worker_pool,
+)
 from api.routers.utils import ErrorModel
 
+from job_agent.services.job_import import JobImportFormat
 from job_agent.services.job_listing_service import (
+    JobImportService,
     JobService,
 )
-from job_agent.services.schemas import JobListingDTO, ScrapeJobListingRequest, CreateJobRequest
+from job_agent.services.pagination import MAX_PAGE_SIZE
+from job_agent.services.schemas import (
+    JobImportResultDTO,
+    JobListingDTO,
+    JobListingPageDTO,
+    JobListingSummaryDTO,
+    ScrapeJobListingRequest,
+    CreateJobRequest,
+    ScrapeJobListingsRequest,
+    ScrapeJobListingResultDTO,
+    ScrapeTaskDTO,
+)
+from job_agent.workers.scrape_worker import ScrapeWorkerPool
 
 job_listing_router = APIRouter()
 
 
+@job_listing_router.get(
+    "/",
+    response_model=JobListingPageDTO,
+    responses={400: {"model": ErrorModel}},
+    operation_id="getJobListings",
+)
+async def get_job_listings(
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    _current_user_id: int = Depends(
+        get_current_user_id
+    ),  # Just making sure the user is logged in
+    job_service: JobService = Depends(get_read_only_job_listing_service),
+):
+    return await job_service.list_jobs(cursor, limit)
+
+
+@job_listing_router.get(
+    "/search",
+    response_model=list[JobListingSummaryDTO],
+    operation_id="searchJobListings",
+)
+async def search_job_listings(
+    q: str = Query(min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    _current_user_id: int = Depends(
+        get_current_user_id
+    ),  # Just making sure the user is logged in
+    job_service: JobService = Depends(get_read_only_job_listing_service),
+):
+    return await job_service.search_jobs(q, limit)
+
+
+# Declared after /search so that doesn't get read as an id
+@job_listing_router.get(
+    "/{job_listing_id}",
+    response_model=JobListingDTO,
+    responses={404: {"model": ErrorModel}},
+    operation_id="getJobListing",
+)
+async def get_job_listing(
+    job_listing_id: int,
+    _current_user_id: int = Depends(
+        get_current_user_id
+    ),  # Just making sure the user is logged in
+    job_service: JobService = Depends(get_read_only_job_listing_service),
+):
+    return await job_service.get_job(job_listing_id)
+
+
 @job_listing_router.post(
-    "/from-url", response_model=JobListingDTO, responses={404: {"model": ErrorModel}}, operation_id="createJobFromUrl"
+    "/from-url",
+    response_model=JobListingDTO,
+    responses={404: {"model": ErrorModel}, 502: {"model": ErrorModel}},
+    operation_id="createJobFromUrl",
 )
 async def scrape_job(
     request: ScrapeJobListingRequest,
-    _current_user_id: int = Depends(get_current_user_id),  # Just making sure the user is logged in
+    _current_user_id: int = Depends(
+        get_current_user_id
+    ),  # Just making sure the user is logged in
     job_service: JobService = Depends(get_job_listing_service),
 ):
     return await job_service.fetch_job(request)
 
+
+@job_listing_router.post(
+    "/scrape-tasks",
+    response_model=ScrapeTaskDTO,
+    status_code=202,
+    responses={400: {"model": ErrorModel}},
+    operation_id="enqueueJobFromUrl",
+)
+async def enqueue_scrape_job(
+    request: ScrapeJobListingRequest,
+    _current_user_id: int = Depends(
+        get_current_user_id
+    ),  # Just making sure the user is logged in
+    job_service: JobService = Depends(get_job_listing_service),
+    scrape_worker_pool: ScrapeWorkerPool = Depends(get_scrape_worker_pool),
+):
+    task = await job_service.enqueue_fetch_job(request)
+    scrape_worker_pool.notify()
+    return task
+
+
+@job_listing_router.get(
+    "/scrape-tasks/{task_id}",
+    response_model=ScrapeTaskDTO,
+    responses={404: {"model": ErrorModel}},
+    operation_id="getScrapeTask",
+)
+async def get_scrape_task(
+    task_id: int,
+    _current_user_id: int = Depends(
+        get_current_user_id
+    ),  # Just making sure the user is logged in
+    job_service: JobService = Depends(get_read_only_job_listing_service),
+):
+    return await job_service.get_scrape_task(task_id)
+
+
+@job_listing_router.post(
+    "/from-urls",
+    response_model=list[ScrapeJobListingResultDTO],
+    operation_id="createJobsFromUrls",
+)
+async def scrape_jobs(
+    request: ScrapeJobListingsRequest,
+    _current_user_id: int = Depends(
+        get_current_user_id
+    ),  # Just making sure the user is logged in
+    job_service: JobService = Depends(get_job_listing_service),
+):
+    return await job_service.fetch_jobs(request)
+
+
 @job_listing_router.post(
     "/", response_model=JobListingDTO, operation_id="createJobManual"
 )
 async def create_job_manual(
-        request: CreateJobRequest,
-        _current_user_id: int = Depends(get_current_user_id),  # Just making sure the user is logged in
-        job_service: JobService = Depends(get_job_listing_service)
+    request: CreateJobRequest,
+    _current_user_id: int = Depends(
+        get_current_user_id
+    ),  # Just making sure the user is logged in
+    job_service: JobService = Depends(get_job_listing_service),
+):
+    return await job_service.create_job_manual(request)
+
+
+@job_listing_router.post(
+    "/import",
+    response_model=JobImportResultDTO,
+    responses={400: {"model": ErrorModel}, 415: {"model": ErrorModel}},
+    operation_id="importJobListings",
+)
+async def import_job_listings(
+    request: Request,
+    content_type: str = Header(),
+    _current_user_id: int = Depends(
+        get_current_user_id
+    ),  # Just making sure the user is logged in
+    job_import_service: JobImportService = Depends(get_job_import_service),
 ):
-    return await job_service.create_job_manual(request)
\ No newline at end of file
+    # The raw body is parsed as it arrives, send the file itself rather than a multipart form
+    return await job_import_service.import_jobs(
+        request.stream(), JobImportFormat.from_content_type(content_type)
+    )
@@ -1,24 +1,39 @@
-from typing import Annotated
+from typing import Optional
 
-from fastapi import APIRouter, Depends, Response, status, Form, UploadFile
+from fastapi import APIRouter, Depends, Header, Query, Request, Response, status
 
 from api.auth import get_current_user_id
 from api.routers.utils import ErrorModel
+from api.uploads import parse_file_upload
 from job_agent.services.candidate_service import (
     CandidateService,
 )
+from job_agent.models import JobApplicationStatus, ResumeProcessingStatus
+from job_agent.services.job_application_service import JobApplicationService
+from job_agent.services.pagination import MAX_PAGE_SIZE
+from job_agent.services.exceptions import InvalidFormException
 from job_agent.services.resume_service import ResumeService
+from job_agent.workers.resume_worker import ResumeWorkerPool
 from job_agent.services.schemas import (
     AddOrUpdateSocialRequest,
     CandidateDTO,
     CandidateSocialLinkDTO,
     UpdateCandidatePersonalInfoRequest,
     UploadResumeRequest,
-    FileContent,
+    JobApplicationPageDTO,
+    JobApplicationStatsDTO,
     ResumeDTO,
+    ResumeProcessingDTO,
     PresignedUrlDTO,
 )
-from api.dependencies import get_candidate_service, get_resume_service
+from api.dependencies import (
+    get_candidate_service,
+    get_read_only_candidate_service,
+    get_read_only_job_application_service,
+    get_read_only_resume_service,
+    get_resume_service,
+    get_resume_worker_pool,
+)
 
 me_router = APIRouter()
 
@@ -31,7 +46,7 @@ me_router = APIRouter()
 )
 async def get_me(
     current_user_id: int = Depends(get_current_user_id),
-    service: CandidateService = Depends(get_candidate_service),
+    service: CandidateService = Depends(get_read_only_candidate_service),
 ):
     return await service.get_candidate_by_id(current_user_id)
 
@@ -58,7 +73,7 @@ async def update_me_info(
 )
 async def get_me_socials(
     current_user_id: int = Depends(get_current_user_id),
-    service: CandidateService = Depends(get_candidate_service),
+    service: CandidateService = Depends(get_read_only_candidate_service),
 ):
     return await service.get_candidate_socials(current_user_id)
 
@@ -99,7 +114,7 @@ async def remove_social_link(
 )
 async def get_resumes(
     current_user_id: int = Depends(get_current_user_id),
-    service: ResumeService = Depends(get_resume_service),
+    service: ResumeService = Depends(get_read_only_resume_service),
 ):
     return await service.get_resumes_by_candidate_id(current_user_id)
 
@@ -107,24 +122,79 @@ async def get_resumes(
 @me_router.post(
     "/resumes",
     response_model=ResumeDTO,
-    responses={404: {"model": ErrorModel}, 409: {"model": ErrorModel}},
+    responses={
+        202: {
+            "model": ResumeDTO,
+            "description": "Stored, processing in the background",
+        },
+        400: {"model": ErrorModel},
+        404: {"model": ErrorModel},
+        409: {"model": ErrorModel},
+        413: {"model": ErrorModel},
+    },
     operation_id="uploadResume",
+    # The body is parsed by hand so the file can be streamed, describe it like a Form/UploadFile
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "multipart/form-data": {
+                    "schema": {
+                        "title": "Body_uploadResume",
+                        "type": "object",
+                        "required": ["name", "file"],
+                        "properties": {
+                            "name": {"type": "string", "title": "Name"},
+                            "file": {
+                                "type": "string",
+                                "format": "binary",
+                                "title": "File",
+                            },
+                        },
+                    }
+                }
+            },
+        }
+    },
 )
 async def upload_resume(
-    name: Annotated[str, Form()],
-    file: UploadFile,
+    request: Request,
+    response: Response,
+    content_type: str = Header(),
+    # Respond 202 as soon as the file is stored, poll getResumeProcessing for the text extraction
+    background: bool = Query(False),
     current_user_id: int = Depends(get_current_user_id),
     service: ResumeService = Depends(get_resume_service),
+    resume_worker_pool: ResumeWorkerPool = Depends(get_resume_worker_pool),
 ):
-    return await service.upload_resume(
+    # name has to be sent before file, it's read before the file is streamed to the service
+    fields, file = await parse_file_upload(content_type, request.stream(), "file")
+    if "name" not in fields:
+        raise InvalidFormException("missing the name field")
+    resume = await service.upload_resume(
         current_user_id,
         UploadResumeRequest(
-            name=name,
-            file=FileContent(
-                data=file.file.read(), content_type=str(file.content_type)
-            ),
+            name=fields["name"], file=file, process_in_background=background
         ),
     )
+    if resume.processing_status == ResumeProcessingStatus.PENDING:
+        response.status_code = status.HTTP_202_ACCEPTED
+        resume_worker_pool.notify()
+    return resume
+
+
+@me_router.get(
+    "/resumes/{resume_id}/processing",
+    response_model=ResumeProcessingDTO,
+    responses={404: {"model": ErrorModel}},
+    operation_id="getResumeProcessing",
+)
+async def get_resume_processing(
+    resume_id: int,
+    current_user_id: int = Depends(get_current_user_id),
+    service: ResumeService = Depends(get_read_only_resume_service),
+):
+    return await service.get_resume_processing(current_user_id, resume_id)
 
 
 @me_router.delete(
@@ -150,6 +220,34 @@ async def delete_resume(
 async def get_resume_presigned_url(
     resume_id: int,
     current_user_id: int = Depends(get_current_user_id),
-    service: ResumeService = Depends(get_resume_service),
+    service: ResumeService = Depends(get_read_only_resume_service),
 ):
     return await service.get_resume_presigned_url(current_user_id, resume_id)
+
+
+@me_router.get(
+    "/applications",
+    response_model=JobApplicationPageDTO,
+    responses={400: {"model": ErrorModel}},
+    operation_id="getJobApplications",
+)
+async def get_job_applications(
+    status: Optional[list[JobApplicationStatus]] = Query(None),
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    current_user_id: int = Depends(get_current_user_id),
+    service: JobApplicationService = Depends(get_read_only_job_application_service),
+):
+    return await service.list_job_applications(current_user_id, status, cursor, limit)
+
+
+@me_router.get(
+    "/applications/stats",
+    response_model=JobApplicationStatsDTO,
+    operation_id="getJobApplicationStats",
+)
+async def get_job_application_stats(
+    current_user_id: int = Depends(get_current_user_id),
+    service: JobApplicationService = Depends(get_read_only_job_application_service),
+):
+    return await service.get_job_application_stats(current_user_id)
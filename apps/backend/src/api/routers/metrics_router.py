@@ -0,0 +1,67 @@
+from fastapi import APIRouter, Request
+
+from job_agent.db_pool import DbPoolStats
+from job_agent.db_replicas import ReplicaRouterStats
+from job_agent.pdf_extraction import PdfExtractorStats
+from job_agent.scrape.cache import CacheStats
+from job_agent.scrape.http import HttpPoolStats
+from job_agent.scrape.rate_limit import HostRateLimitStats
+from job_agent.scrape.job_scraper import HiringCafeJobScraper
+from job_agent.workers.recrawl_sweeper import RecrawlStats
+
+metrics_router = APIRouter()
+
+
+@metrics_router.get(
+    "/db-pool", response_model=DbPoolStats, operation_id="getDbPoolStats"
+)
+async def get_db_pool_stats(request: Request):
+    return request.app.state.db_pool_metrics.stats()
+
+
+@metrics_router.get(
+    "/db-replicas",
+    response_model=ReplicaRouterStats,
+    operation_id="getDbReplicaStats",
+)
+async def get_db_replica_stats(request: Request):
+    return request.app.state.replica_router.stats()
+
+
+@metrics_router.get(
+    "/pdf-extraction",
+    response_model=PdfExtractorStats,
+    operation_id="getPdfExtractionStats",
+)
+async def get_pdf_extraction_stats(request: Request):
+    return request.app.state.pdf_extractor.stats()
+
+
+@metrics_router.get(
+    "/scraper-cache", response_model=CacheStats, operation_id="getScraperCacheStats"
+)
+async def get_scraper_cache_stats():
+    return HiringCafeJobScraper.cache_stats()
+
+
+@metrics_router.get(
+    "/scraper-http", response_model=HttpPoolStats, operation_id="getScraperHttpStats"
+)
+async def get_scraper_http_stats(request: Request):
+    return request.app.state.http_pool_metrics.stats()
+
+
+@metrics_router.get(
+    "/scraper-rate-limits",
+    response_model=list[HostRateLimitStats],
+    operation_id="getScraperRateLimitStats",
+)
+async def get_scraper_rate_limit_stats(request: Request):
+    return request.app.state.scrape_rate_limiter.stats()
+
+
+@metrics_router.get(
+    "/recrawl", response_model=RecrawlStats, operation_id="getRecrawlStats"
+)
+async def get_recrawl_stats(request: Request):
+    return request.app.state.recrawl_sweeper.stats()
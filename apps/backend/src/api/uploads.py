@@ -0,0 +1,154 @@
+from typing import AsyncIterable, AsyncIterator
+
+from python_multipart.exceptions import MultipartParseError
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+from job_agent.services.exceptions import InvalidFormException
+from job_agent.services.schemas import FileUpload
+
+# Plain text fields are buffered whole, the file is the only part that's streamed. Both limits
+# together cap what a form can make us hold before the file starts
+MAX_FIELD_BYTES = 64 * 1024
+MAX_FIELDS = 16
+
+
+async def parse_file_upload(
+    content_type: str, chunks: AsyncIterable[bytes], file_field: str
+) -> tuple[dict[str, str], FileUpload]:
+    """
+    Reads a multipart/form-data body up to the start of file_field and hands that part back as
+    a stream, passing on each chunk as it's received rather than spooling the file to disk. How
+    much of it is buffered after that is up to the consumer. Any other fields have to come before
+    the file, browsers send FormData parts in the order they were appended
+    """
+    form = _StreamingForm(content_type, chunks, file_field)
+    await form.read_fields()
+    return form.fields, FileUpload(
+        content_type=form.file_content_type, chunks=form.file_chunks()
+    )
+
+
+class _StreamingForm:
+    def __init__(
+        self, content_type: str, chunks: AsyncIterable[bytes], file_field: str
+    ):
+        media_type, params = parse_options_header(content_type)
+        if media_type != b"multipart/form-data" or b"boundary" not in params:
+            raise InvalidFormException("expected a multipart/form-data body")
+
+        self.fields: dict[str, str] = {}
+        self.file_content_type = "application/octet-stream"
+        self._chunks = aiter(chunks)
+        self._file_field = file_field
+        self._file_started = False
+        self._file_ended = False
+        self._file_data: list[bytes] = []
+        self._in_file = False
+        self._part_name = ""
+        self._field_count = 0
+        self._part_data = bytearray()
+        self._part_headers: dict[bytes, bytes] = {}
+        self._header_field = b""
+        self._header_value = b""
+        self._parser = MultipartParser(
+            params[b"boundary"],
+            {
+                "on_part_begin": self._on_part_begin,
+                "on_part_data": self._on_part_data,
+                "on_part_end": self._on_part_end,
+                "on_header_field": self._on_header_field,
+                "on_header_value": self._on_header_value,
+                "on_header_end": self._on_header_end,
+                "on_headers_finished": self._on_headers_finished,
+            },
+        )
+
+    async def read_fields(self) -> None:
+        while not self._file_started:
+            if not await self._feed():
+                raise InvalidFormException(f"missing the {self._file_field} file")
+
+    async def file_chunks(self) -> AsyncIterator[bytes]:
+        while True:
+            # Callbacks can't await, whatever the last write parsed out of the file is passed on here
+            for data in self._file_data:
+                yield data
+            self._file_data.clear()
+            if self._file_ended:
+                return
+            if not await self._feed():
+                raise InvalidFormException("the body ended partway through the file")
+
+    async def _feed(self) -> bool:
+        chunk = await anext(self._chunks, None)
+        if chunk is None:
+            return False
+        try:
+            self._parser.write(chunk)
+        except MultipartParseError as e:
+            raise InvalidFormException(str(e))
+        return True
+
+    def _on_part_begin(self) -> None:
+        self._part_data.clear()
+        self._part_headers = {}
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+        self._check_header_size()
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+        self._check_header_size()
+
+    def _check_header_size(self) -> None:
+        if len(self._header_field) + len(self._header_value) > MAX_FIELD_BYTES:
+            raise InvalidFormException("a part header is too long")
+
+    def _on_header_end(self) -> None:
+        self._part_headers[self._header_field.lower()] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self) -> None:
+        if self._file_started:
+            # Nothing reads the body past the file, anything after it is dropped
+            self._in_file = False
+            return
+        _, options = parse_options_header(
+            self._part_headers.get(b"content-disposition")
+        )
+        if b"name" not in options:
+            raise InvalidFormException("a part is missing its name")
+        self._part_name = options[b"name"].decode("utf-8", errors="replace")
+        self._in_file = self._part_name == self._file_field
+        if not self._in_file:
+            self._field_count += 1
+            if self._field_count > MAX_FIELDS:
+                raise InvalidFormException(
+                    f"too many fields, at most {MAX_FIELDS} are accepted"
+                )
+        if self._in_file:
+            self._file_started = True
+            if b"content-type" in self._part_headers:
+                self.file_content_type = self._part_headers[b"content-type"].decode(
+                    "latin-1"
+                )
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._file_ended:
+            return
+        if self._in_file:
+            self._file_data.append(data[start:end])
+            return
+        if len(self._part_data) + end - start > MAX_FIELD_BYTES:
+            raise InvalidFormException(f"the {self._part_name} field is too long")
+        self._part_data += data[start:end]
+
+    def _on_part_end(self) -> None:
+        if self._in_file:
+            self._file_ended = True
+        elif not self._file_started:
+            self.fields[self._part_name] = self._part_data.decode(
+                "utf-8", errors="replace"
+            )
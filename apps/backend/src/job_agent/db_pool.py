@@ -0,0 +1,137 @@
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DbPoolConfig:
+    pool_size: int = 5
+    max_overflow: int = 10
+    # Seconds to wait for a connection before giving up
+    timeout: float = 30
+    # Seconds before a connection is replaced, keeps it under server/proxy idle timeouts. -1 never
+    recycle: float = 1800
+    pre_ping: bool = True
+    # Checkouts slower than this are logged, they mean the pool is too small for the load
+    slow_checkout_seconds: float = 0.5
+
+
+@dataclass
+class DbPoolStats:
+    pool_size: int
+    max_overflow: int
+    checked_out: int
+    peak_checked_out: int
+    overflow: int
+    utilisation: float
+    checkouts: int
+    overflow_checkouts: int
+    timeouts: int
+    waiting: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+    slow_checkouts: int
+
+
+class DbPoolMetrics:
+    def __init__(self, config: DbPoolConfig):
+        self._config = config
+        self._pool: AsyncAdaptedQueuePool | None = None
+        self._peak_checked_out = 0
+        self._checkouts = 0
+        self._overflow_checkouts = 0
+        self._timeouts = 0
+        self._waiting = 0
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+        self._slow_checkouts = 0
+
+    def pool_class(self) -> type[AsyncAdaptedQueuePool]:
+        metrics = self
+
+        class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+            # Times the whole checkout: queueing for a free slot, connecting and pre-ping
+            def connect(self) -> PoolProxiedConnection:
+                return metrics._checkout(self, super().connect)
+
+        return InstrumentedQueuePool
+
+    def stats(self) -> DbPoolStats:
+        checked_out = self._pool.checkedout() if self._pool is not None else 0
+        capacity = self._config.pool_size + max(self._config.max_overflow, 0)
+        return DbPoolStats(
+            pool_size=self._config.pool_size,
+            max_overflow=self._config.max_overflow,
+            checked_out=checked_out,
+            peak_checked_out=self._peak_checked_out,
+            overflow=max(self._pool.overflow(), 0) if self._pool is not None else 0,
+            utilisation=checked_out / capacity if capacity else 0.0,
+            checkouts=self._checkouts,
+            overflow_checkouts=self._overflow_checkouts,
+            timeouts=self._timeouts,
+            waiting=self._waiting,
+            wait_seconds_total=self._wait_seconds_total,
+            wait_seconds_max=self._wait_seconds_max,
+            slow_checkouts=self._slow_checkouts,
+        )
+
+    def _checkout(
+        self,
+        pool: AsyncAdaptedQueuePool,
+        connect: Callable[[], PoolProxiedConnection],
+    ) -> PoolProxiedConnection:
+        # The engine swaps in a fresh pool on dispose(), stats follow whichever is in use
+        self._pool = pool
+        self._waiting += 1
+        started = time.perf_counter()
+        try:
+            connection = connect()
+        except PoolTimeoutError:
+            self._timeouts += 1
+            raise
+        finally:
+            # Counted before this checkout leaves the queue, so the log below includes it
+            waiting = self._waiting
+            self._waiting -= 1
+            waited = time.perf_counter() - started
+            self._wait_seconds_total += waited
+            self._wait_seconds_max = max(self._wait_seconds_max, waited)
+
+        checked_out = pool.checkedout()
+        self._checkouts += 1
+        self._peak_checked_out = max(self._peak_checked_out, checked_out)
+        if checked_out > self._config.pool_size:
+            self._overflow_checkouts += 1
+        if waited > self._config.slow_checkout_seconds:
+            self._slow_checkouts += 1
+            logger.warning(
+                "Waited %.3fs for a database connection (%d checked out, %d waiting, pool size %d + %d overflow)",
+                waited,
+                checked_out,
+                waiting,
+                self._config.pool_size,
+                self._config.max_overflow,
+            )
+        return connection
+
+
+def create_db_engine(
+    database_uri: str, config: DbPoolConfig, metrics: DbPoolMetrics
+) -> AsyncEngine:
+    return create_async_engine(
+        database_uri,
+        echo=False,
+        poolclass=metrics.pool_class(),
+        pool_size=config.pool_size,
+        max_overflow=config.max_overflow,
+        pool_timeout=config.timeout,
+        pool_recycle=config.recycle,
+        pool_pre_ping=config.pre_ping,
+    )
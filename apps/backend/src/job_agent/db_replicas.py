@@ -0,0 +1,142 @@
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Optional
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from job_agent.db_pool import DbPoolMetrics, DbPoolStats
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReplicaStats:
+    name: str
+    healthy: bool
+    reads: int
+    failures: int
+    # The replica's own connection pool, when it was created with DbPoolMetrics
+    pool: Optional[DbPoolStats] = None
+
+
+@dataclass
+class ReplicaRouterStats:
+    primary_reads: int
+    # Reads sent to the primary because the client wrote something just before
+    pinned_reads: int
+    failovers: int
+    replicas: list[ReplicaStats]
+
+
+class _Replica:
+    def __init__(
+        self,
+        name: str,
+        session_maker: async_sessionmaker[AsyncSession],
+        pool_metrics: Optional[DbPoolMetrics],
+    ):
+        self.name = name
+        self.session_maker = session_maker
+        self.pool_metrics = pool_metrics
+        self.unhealthy_until = 0.0
+        self.reads = 0
+        self.failures = 0
+
+
+class ReplicaRouter:
+    """
+    Hands out sessions for read-only work: round robin over the replicas, skipping any that
+    recently failed to connect, and the primary when there are none left (or none configured).
+    """
+
+    def __init__(
+        self,
+        primary: async_sessionmaker[AsyncSession],
+        replicas: dict[str, async_sessionmaker[AsyncSession]],
+        failure_cooldown_seconds: float = 30,
+        clock: Callable[[], float] = time.monotonic,
+        pool_metrics: Optional[dict[str, DbPoolMetrics]] = None,
+    ):
+        # pool_metrics is keyed like replicas
+        pool_metrics = pool_metrics or {}
+        self._primary = primary
+        self._replicas = [
+            _Replica(name, session_maker, pool_metrics.get(name))
+            for name, session_maker in replicas.items()
+        ]
+        self._failure_cooldown_seconds = failure_cooldown_seconds
+        self._clock = clock
+        self._next = 0
+        self._primary_reads = 0
+        self._pinned_reads = 0
+        self._failovers = 0
+
+    @asynccontextmanager
+    async def read_session(
+        self, force_primary: bool = False
+    ) -> AsyncIterator[AsyncSession]:
+        # force_primary is for read-your-writes, a replica may not have caught up yet
+        if force_primary and self._replicas:
+            self._pinned_reads += 1
+        for replica in [] if force_primary else self._healthy_replicas():
+            session = replica.session_maker()
+            try:
+                # Connect up front (with the pool's pre-ping) so a dead replica fails over here
+                # rather than halfway through the caller's work
+                await session.connection()
+            except (SQLAlchemyError, OSError) as e:
+                await session.close()
+                replica.failures += 1
+                replica.unhealthy_until = self._clock() + self._failure_cooldown_seconds
+                self._failovers += 1
+                logger.warning(
+                    "Read replica %s is unavailable, skipping it for %.0fs: %s",
+                    replica.name,
+                    self._failure_cooldown_seconds,
+                    e,
+                )
+                continue
+
+            replica.reads += 1
+            try:
+                yield session
+            finally:
+                await session.close()
+            return
+
+        self._primary_reads += 1
+        async with self._primary() as session:
+            yield session
+
+    def stats(self) -> ReplicaRouterStats:
+        now = self._clock()
+        return ReplicaRouterStats(
+            primary_reads=self._primary_reads,
+            pinned_reads=self._pinned_reads,
+            failovers=self._failovers,
+            replicas=[
+                ReplicaStats(
+                    name=replica.name,
+                    healthy=replica.unhealthy_until <= now,
+                    reads=replica.reads,
+                    failures=replica.failures,
+                    pool=replica.pool_metrics.stats()
+                    if replica.pool_metrics is not None
+                    else None,
+                )
+                for replica in self._replicas
+            ],
+        )
+
+    def _healthy_replicas(self) -> list[_Replica]:
+        if not self._replicas:
+            return []
+        # Rotate the starting point on every read, a replica that's cooled down gets tried again
+        start = self._next
+        self._next = (self._next + 1) % len(self._replicas)
+        now = self._clock()
+        ordered = self._replicas[start:] + self._replicas[:start]
+        return [replica for replica in ordered if replica.unhealthy_until <= now]
@@ -4,7 +4,16 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional, List
 
-from sqlalchemy import String, DateTime, Enum as SqlEnum, ForeignKey, Text
+from sqlalchemy import (
+    DDL,
+    String,
+    DateTime,
+    Enum as SqlEnum,
+    ForeignKey,
+    Text,
+    Index,
+    event,
+)
 
 from sqlalchemy.orm import (
     relationship,
@@ -116,12 +125,40 @@ class CandidateSocialLink(Base):
     link = synonym(name="_link", descriptor=link)  # type: ignore
 
 
+class ResumeProcessingStatus(str, Enum):
+    PENDING = "pending"
+    PROCESSING = "processing"
+    READY = "ready"
+    FAILED = "failed"
+
+
 class Resume(Base):
     __tablename__ = "resume"
+    __table_args__ = (
+        # Names are unique per candidate, also serves listing a candidate's resumes
+        Index("ix_resume_candidate_id_name", "candidate_id", "_name", unique=True),
+        Index("ix_resume_processing_status_id", "processing_status", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     _name: Mapped[str] = mapped_column(String(50), nullable=False)
-    text_content: Mapped[str] = mapped_column(Text, nullable=False)
+    # The whole extracted document, only loaded when asked for with undefer(Resume.text_content).
+    # None until processing has extracted it
+    text_content: Mapped[Optional[str]] = mapped_column(
+        Text, nullable=True, deferred=True, deferred_raiseload=True
+    )
+    # Resumes uploaded without waiting for extraction are queued here for the resume workers
+    processing_status: Mapped[ResumeProcessingStatus] = mapped_column(
+        SqlEnum(ResumeProcessingStatus),
+        default=ResumeProcessingStatus.READY,
+        nullable=False,
+    )
+    processing_attempts: Mapped[int] = mapped_column(default=0, nullable=False)
+    processing_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # A processing resume whose lease has expired belongs to a worker that died, it gets picked up again
+    processing_lease_expires_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime, nullable=True
+    )
 
     stored_file_id: Mapped[int] = mapped_column(
         ForeignKey("stored_file.id"), nullable=False
@@ -148,13 +185,19 @@ class Resume(Base):
         self,
         name: str,
         stored_file: "StoredFile",
-        text_content: str,
+        text_content: Optional[str],
         candidate: Candidate,
     ):
         super().__init__()
 
         self._name = name
         self.text_content = text_content
+        self.processing_status = (
+            ResumeProcessingStatus.PENDING
+            if text_content is None
+            else ResumeProcessingStatus.READY
+        )
+        self.processing_attempts = 0
         self.candidate = candidate
         self.stored_file = stored_file
 
@@ -219,13 +262,28 @@ class CoverLetter(Base):
 
 class JobListing(Base):
     __tablename__ = "job_listing"
+    __table_args__ = (
+        Index(
+            "ix_job_listing_source_external_id", "source", "external_id", unique=True
+        ),
+        Index("ix_job_listing_scraped_at", "scraped_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     title: Mapped[str] = mapped_column(String(500), nullable=False)
     company: Mapped[str] = mapped_column(String(500), nullable=False)
     application_url: Mapped[str] = mapped_column(String(500), nullable=False)
     source: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
-    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # Id of the listing at its source (e.g. the hiring.cafe job id), manual listings use their canonical url
+    external_id: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    # Often the biggest value in the row, so only loaded when asked for with undefer(JobListing.description).
+    # Raises rather than lazy loading, which can't happen implicitly under asyncio anyway
+    description: Mapped[Optional[str]] = mapped_column(
+        Text, nullable=True, deferred=True, deferred_raiseload=True
+    )
+    # sha256 of the scraped fields, lets a re-crawl skip writing listings that haven't changed
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    etag: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
 
     posted_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     scraped_at: Mapped[datetime] = mapped_column(
@@ -234,6 +292,8 @@ class JobListing(Base):
     updated_at: Mapped[datetime] = mapped_column(
         default=datetime.utcnow, nullable=False
     )
+    # Set when a re-crawl finds the posting has been taken down
+    closed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
 
     # I don't think this is needed
     # applications: Mapped[List[JobApplication]] = relationship(back_populates="job_listing")
@@ -245,6 +305,7 @@ class JobListing(Base):
         application_url: str,
         description: Optional[str] = None,
         source: Optional[str] = None,
+        external_id: Optional[str] = None,
         posted_at: Optional[datetime] = None,
         scraped_at: Optional[datetime] = None,
     ):
@@ -254,11 +315,142 @@ class JobListing(Base):
         self.application_url = application_url
         self.description = description
         self.source = source
+        self.external_id = external_id
         self.posted_at = posted_at
         if scraped_at is not None:
             self.scraped_at = scraped_at
 
 
+# Matches the browse order, listings without a posted_at are paged through separately
+Index(
+    "ix_job_listing_posted_at_id",
+    JobListing.posted_at.desc(),
+    JobListing.id.desc(),
+)
+
+# Full-text search is maintained by the database so every write path keeps it current.
+# Postgres gets a generated tsvector column with a GIN index, SQLite an external content
+# FTS5 table kept in sync with triggers. Neither is mapped, select(JobListing) never loads them
+JOB_LISTING_SEARCH_DDL = {
+    "postgresql": [
+        """
+        ALTER TABLE job_listing ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(company, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'C')
+        ) STORED
+        """,
+        "CREATE INDEX ix_job_listing_search_vector ON job_listing USING gin (search_vector)",
+    ],
+    "sqlite": [
+        """
+        CREATE VIRTUAL TABLE job_listing_fts USING fts5(
+            title, company, description,
+            content='job_listing', content_rowid='id', tokenize='porter unicode61'
+        )
+        """,
+        """
+        CREATE TRIGGER job_listing_fts_insert AFTER INSERT ON job_listing BEGIN
+            INSERT INTO job_listing_fts(rowid, title, company, description)
+            VALUES (new.id, new.title, new.company, new.description);
+        END
+        """,
+        """
+        CREATE TRIGGER job_listing_fts_delete AFTER DELETE ON job_listing BEGIN
+            INSERT INTO job_listing_fts(job_listing_fts, rowid, title, company, description)
+            VALUES ('delete', old.id, old.title, old.company, old.description);
+        END
+        """,
+        """
+        CREATE TRIGGER job_listing_fts_update AFTER UPDATE OF title, company, description
+        ON job_listing BEGIN
+            INSERT INTO job_listing_fts(job_listing_fts, rowid, title, company, description)
+            VALUES ('delete', old.id, old.title, old.company, old.description);
+            INSERT INTO job_listing_fts(rowid, title, company, description)
+            VALUES (new.id, new.title, new.company, new.description);
+        END
+        """,
+    ],
+}
+
+for _dialect, _statements in JOB_LISTING_SEARCH_DDL.items():
+    for _statement in _statements:
+        event.listen(
+            JobListing.__table__,
+            "after_create",
+            DDL(_statement).execute_if(dialect=_dialect),
+        )
+# Descriptions are compressed by Postgres itself (TOAST), so search and every reader keep seeing plain text.
+# lz4 decompresses much faster than the default pglz, but not every server is built with it. A lower
+# toast_tuple_target compresses typical 1-2KB descriptions too, and moves them out of the main heap
+JOB_LISTING_STORAGE_DDL = [
+    """
+    DO $$
+    BEGIN
+        ALTER TABLE job_listing ALTER COLUMN description SET COMPRESSION lz4;
+    EXCEPTION WHEN feature_not_supported THEN
+        RAISE NOTICE 'lz4 is not available, job_listing.description keeps the default compression';
+    END $$
+    """,
+    "ALTER TABLE job_listing SET (toast_tuple_target = 512)",
+]
+
+for _statement in JOB_LISTING_STORAGE_DDL:
+    event.listen(
+        JobListing.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="postgresql"),
+    )
+event.listen(
+    JobListing.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS job_listing_fts").execute_if(dialect="sqlite"),
+)
+
+
+class ScrapeTaskStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class ScrapeTask(Base):
+    __tablename__ = "scrape_task"
+    __table_args__ = (Index("ix_scrape_task_status_id", "status", "id"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    job_url: Mapped[str] = mapped_column(String(500), nullable=False)
+    status: Mapped[ScrapeTaskStatus] = mapped_column(
+        SqlEnum(ScrapeTaskStatus), default=ScrapeTaskStatus.QUEUED, nullable=False
+    )
+    attempts: Mapped[int] = mapped_column(default=0, nullable=False)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # A running task whose lease has expired belongs to a worker that died, it gets picked up again
+    lease_expires_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime, nullable=True
+    )
+
+    job_listing_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("job_listing.id"), nullable=True
+    )
+    job_listing: Mapped[Optional[JobListing]] = relationship()
+
+    created_at: Mapped[datetime] = mapped_column(
+        default=datetime.utcnow, nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        default=datetime.utcnow, nullable=False
+    )
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    def __init__(self, job_url: str):
+        super().__init__()
+        self.job_url = job_url
+        self.status = ScrapeTaskStatus.QUEUED
+        self.attempts = 0
+
+
 class JobApplicationStatus(str, Enum):
     PENDING = "pending"
     APPLYING = "applying"
@@ -270,6 +462,17 @@ class JobApplicationStatus(str, Enum):
 
 class JobApplication(Base):
     __tablename__ = "job_application"
+    __table_args__ = (
+        # One application per candidate per listing
+        Index(
+            "ix_job_application_candidate_id_job_listing_id",
+            "candidate_id",
+            "job_listing_id",
+            unique=True,
+        ),
+        # A candidate's applications newest first, see JobApplicationService.list_job_applications
+        Index("ix_job_application_candidate_id_id", "candidate_id", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     _application_status: Mapped[JobApplicationStatus] = mapped_column(
@@ -329,8 +532,26 @@ class JobApplication(Base):
     application_status = synonym("_application_status", descriptor=application_status)  # type: ignore
 
 
+# How many of a candidate's applications are in each status. Kept in step with job_application
+# by JobApplicationService, in the same transaction as the change it counts
+class JobApplicationStatusCount(Base):
+    __tablename__ = "job_application_status_count"
+
+    candidate_id: Mapped[int] = mapped_column(
+        ForeignKey("candidate.id"), primary_key=True
+    )
+    application_status: Mapped[JobApplicationStatus] = mapped_column(
+        SqlEnum(JobApplicationStatus), primary_key=True
+    )
+    count: Mapped[int] = mapped_column(default=0, nullable=False)
+
+
 class StoredFile(Base):
     __tablename__ = "stored_file"
+    __table_args__ = (
+        Index("ix_stored_file_content_hash", "content_hash", unique=True),
+    )
+
     id: Mapped[int] = mapped_column(primary_key=True)
     key: Mapped[str] = mapped_column(String(255), nullable=False, unique=True)
     bucket: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -338,6 +559,10 @@ class StoredFile(Base):
     uploaded_at: Mapped[datetime] = mapped_column(
         default=datetime.utcnow, nullable=False
     )
+    # sha256 of the contents, everything that uploads the same bytes shares the one file
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    # Rows pointing at this file, the object is deleted along with the last of them
+    ref_count: Mapped[int] = mapped_column(default=0, nullable=False)
 
     def __init__(self, key: str, bucket: str, content_type: Optional[str] = None):
         super().__init__()
@@ -0,0 +1,221 @@
+import asyncio
+import logging
+import multiprocessing
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from io import BytesIO
+from pathlib import Path
+from typing import NoReturn
+
+from pypdf import PdfReader
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PdfExtractorConfig:
+    workers: int = 2
+    # Longer documents are rejected outright, no real resume gets anywhere near this
+    max_pages: int = 20
+    # Wall clock a worker may spend on one document before giving up on it
+    timeout_seconds: float = 10
+    # Extra time before the worker is killed, for when it's stuck somewhere the alarm can't reach
+    kill_grace_seconds: float = 5
+
+
+@dataclass
+class PdfExtractorStats:
+    workers: int
+    running: int
+    queued: int
+    peak_queued: int
+    extracted: int
+    failed: int
+    timeouts: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+    extract_seconds_total: float
+    extract_seconds_max: float
+
+
+class PdfExtractionError(Exception):
+    pass
+
+
+class PdfTooManyPagesError(PdfExtractionError):
+    def __init__(self, pages: int, max_pages: int):
+        super().__init__(pages, max_pages)
+        self.pages = pages
+        self.max_pages = max_pages
+
+    def __str__(self) -> str:
+        return f"PDF has {self.pages} pages, the limit is {self.max_pages}"
+
+
+class PdfExtractionTimeoutError(PdfExtractionError):
+    def __str__(self) -> str:
+        return "Timed out reading the PDF"
+
+
+class PdfTextExtractor:
+    """
+    Pulls the text out of PDFs in a pool of worker processes. pypdf is pure Python, so in a thread
+    it holds the GIL and a few large uploads at once stall the event loop for every other request
+    """
+
+    def __init__(self, config: PdfExtractorConfig):
+        self._config = config
+        # One single-process pool per worker, so a stuck worker can be killed without taking
+        # down the documents the others are working on
+        self._executors: list[ProcessPoolExecutor | None] = [None] * config.workers
+        self._free_workers: asyncio.Queue[int] = asyncio.Queue()
+        for worker in range(config.workers):
+            self._free_workers.put_nowait(worker)
+        self._in_flight = 0
+        self._peak_queued = 0
+        self._extracted = 0
+        self._failed = 0
+        self._timeouts = 0
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+        self._extract_seconds_total = 0.0
+        self._extract_seconds_max = 0.0
+
+    async def extract_text(self, pdf: bytes | Path) -> str:
+        # Prefer a path, the worker reads the file itself rather than having it pickled across
+        self._in_flight += 1
+        self._peak_queued = max(
+            self._peak_queued, self._in_flight - self._config.workers
+        )
+        started = time.perf_counter()
+        try:
+            worker = await self._free_workers.get()
+        except BaseException:
+            self._in_flight -= 1
+            raise
+
+        try:
+            # The deadline starts once a worker is free, time spent queued doesn't count
+            text, extract_seconds = await asyncio.wait_for(
+                asyncio.get_running_loop().run_in_executor(
+                    self._executor(worker),
+                    _extract_text,
+                    pdf,
+                    self._config.max_pages,
+                    self._config.timeout_seconds,
+                ),
+                self._config.timeout_seconds + self._config.kill_grace_seconds,
+            )
+        except asyncio.TimeoutError:
+            # The alarm only fires between bytecodes, a worker stuck inside C code never sees it
+            logger.warning("PDF extraction worker is stuck, restarting it")
+            self._failed += 1
+            self._timeouts += 1
+            self._kill(worker)
+            raise PdfExtractionTimeoutError() from None
+        except PdfExtractionTimeoutError:
+            self._failed += 1
+            self._timeouts += 1
+            raise
+        except PdfExtractionError:
+            self._failed += 1
+            raise
+        except BrokenProcessPool:
+            # The worker died (OOM killed, segfault in a C extension), its pool is unusable now
+            logger.warning("PDF extraction worker died, restarting it")
+            self._failed += 1
+            self._close(worker)
+            raise PdfExtractionError("PDF extraction worker died")
+        finally:
+            self._in_flight -= 1
+            self._free_workers.put_nowait(worker)
+
+        waited = time.perf_counter() - started - extract_seconds
+        self._extracted += 1
+        self._wait_seconds_total += waited
+        self._wait_seconds_max = max(self._wait_seconds_max, waited)
+        self._extract_seconds_total += extract_seconds
+        self._extract_seconds_max = max(self._extract_seconds_max, extract_seconds)
+        return text
+
+    def stats(self) -> PdfExtractorStats:
+        return PdfExtractorStats(
+            workers=self._config.workers,
+            running=min(self._in_flight, self._config.workers),
+            queued=max(self._in_flight - self._config.workers, 0),
+            peak_queued=self._peak_queued,
+            extracted=self._extracted,
+            failed=self._failed,
+            timeouts=self._timeouts,
+            wait_seconds_total=self._wait_seconds_total,
+            wait_seconds_max=self._wait_seconds_max,
+            extract_seconds_total=self._extract_seconds_total,
+            extract_seconds_max=self._extract_seconds_max,
+        )
+
+    def close(self) -> None:
+        for worker in range(self._config.workers):
+            self._close(worker)
+
+    def _executor(self, worker: int) -> ProcessPoolExecutor:
+        executor = self._executors[worker]
+        if executor is None:
+            # Spawned rather than forked, a fork would inherit the event loop and open sockets
+            executor = self._executors[worker] = ProcessPoolExecutor(
+                1, mp_context=multiprocessing.get_context("spawn")
+            )
+        return executor
+
+    def _close(self, worker: int) -> None:
+        executor = self._executors[worker]
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+            self._executors[worker] = None
+
+    def _kill(self, worker: int) -> None:
+        # Shutting down alone waits on the stuck process forever. Only this worker's pool goes,
+        # and it was running nothing but the stuck document
+        executor = self._executors[worker]
+        if executor is not None:
+            for process in list(executor._processes.values()):
+                process.kill()
+        self._close(worker)
+
+
+def _extract_text(
+    pdf: bytes | Path, max_pages: int, timeout_seconds: float
+) -> tuple[str, float]:
+    # Runs in a worker process. The alarm interrupts pypdf between bytecodes, so a pathological
+    # document hands the worker back instead of pinning it
+    started = time.perf_counter()
+    signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, timeout_seconds)
+    try:
+        try:
+            reader = PdfReader(pdf if isinstance(pdf, Path) else BytesIO(pdf))
+            if len(reader.pages) > max_pages:
+                raise PdfTooManyPagesError(len(reader.pages), max_pages)
+            text = "".join(f"{page.extract_text()}\n" for page in reader.pages)
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    except _Timeout:
+        raise PdfExtractionTimeoutError() from None
+    except PdfExtractionError:
+        raise
+    except Exception as e:
+        # Uploads are untrusted, malformed files fail in all sorts of ways inside pypdf
+        raise PdfExtractionError(f"Could not read the PDF: {e}") from None
+
+    return text, time.perf_counter() - started
+
+
+class _Timeout(BaseException):
+    # Not an Exception, pypdf swallows those while recovering from broken files
+    pass
+
+
+def _raise_timeout(signum: int, frame: object) -> NoReturn:
+    raise _Timeout()
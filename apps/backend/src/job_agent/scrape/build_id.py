@@ -0,0 +1,91 @@
+import asyncio
+import re
+import time
+from typing import Callable, Optional
+
+import aiohttp
+
+# Next.js embeds the build id in the __NEXT_DATA__ blob and in its static asset paths
+_BUILD_ID_PATTERNS = [
+    re.compile(r'"buildId"\s*:\s*"([^"]+)"'),
+    re.compile(r"/_next/static/([^/\"']+)/_buildManifest\.js"),
+]
+
+
+class BuildIdNotFoundError(Exception):
+    def __init__(self, url: str):
+        super().__init__(f"Could not find a Next.js build id at {url}")
+
+
+class NextBuildIdResolver:
+    """Discovers and caches the build id of a Next.js site, refreshes are single-flight."""
+
+    def __init__(
+        self,
+        base_url: str,
+        min_refresh_interval_seconds: float = 30,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._base_url = base_url.rstrip("/")
+        self._min_refresh_interval_seconds = min_refresh_interval_seconds
+        self._clock = clock
+        self._build_id: Optional[str] = None
+        self._unchanged_refresh_at: Optional[float] = None
+        self._refresh_task: Optional[asyncio.Task[str]] = None
+
+    @property
+    def build_id(self) -> Optional[str]:
+        return self._build_id
+
+    async def get(self, session: aiohttp.ClientSession) -> str:
+        if self._build_id is not None:
+            return self._build_id
+        return await self.refresh(session, stale_build_id=None)
+
+    async def refresh(
+        self, session: aiohttp.ClientSession, stale_build_id: Optional[str]
+    ) -> str:
+        # Someone else already replaced the id the caller saw fail
+        if self._build_id is not None and self._build_id != stale_build_id:
+            return self._build_id
+
+        # A 404 for a job that doesn't exist looks just like a stale build id,
+        # once a refresh turned out to be a false alarm back off for a while.
+        # Only with an id to hand back, without one there's nothing to do but discover it
+        if (
+            self._build_id is not None
+            and self._unchanged_refresh_at is not None
+            and self._clock() - self._unchanged_refresh_at
+            < self._min_refresh_interval_seconds
+        ):
+            return self._build_id
+
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.ensure_future(self._discover(session))
+            self._refresh_task.add_done_callback(self._on_refreshed)
+
+        return await asyncio.shield(self._refresh_task)
+
+    async def _discover(self, session: aiohttp.ClientSession) -> str:
+        async with session.get(f"{self._base_url}/") as response:
+            response.raise_for_status()
+            html = await response.text()
+
+        for pattern in _BUILD_ID_PATTERNS:
+            match = pattern.search(html)
+            if match is not None:
+                return match.group(1)
+
+        raise BuildIdNotFoundError(self._base_url)
+
+    def _on_refreshed(self, task: asyncio.Task[str]) -> None:
+        self._refresh_task = None
+
+        if task.cancelled() or task.exception() is not None:
+            return
+
+        build_id = task.result()
+        self._unchanged_refresh_at = (
+            self._clock() if build_id == self._build_id else None
+        )
+        self._build_id = build_id
@@ -0,0 +1,76 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    evictions: int = 0
+    size: int = 0
+    max_size: int = 0
+
+
+class TTLCache(Generic[K, V]):
+    """LRU cache with a TTL, concurrent loads of the same key share one loader call."""
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_size: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._ttl_seconds = ttl_seconds
+        self._max_size = max_size
+        self._clock = clock
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._in_flight: dict[K, asyncio.Task[V]] = {}
+        self._stats = CacheStats(max_size=max_size)
+
+    async def get_or_load(self, key: K, loader: Callable[[], Awaitable[V]]) -> V:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > self._clock():
+                self._entries.move_to_end(key)
+                self._stats.hits += 1
+                return value
+            del self._entries[key]
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            self._stats.coalesced += 1
+        else:
+            self._stats.misses += 1
+            task = asyncio.ensure_future(loader())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t: self._on_loaded(key, t))
+
+        # Shielded so one caller going away doesn't cancel the load for everyone else
+        return await asyncio.shield(task)
+
+    def invalidate(self, key: K) -> None:
+        self._entries.pop(key, None)
+
+    def stats(self) -> CacheStats:
+        self._stats.size = len(self._entries)
+        return CacheStats(**vars(self._stats))
+
+    def _on_loaded(self, key: K, task: asyncio.Task[V]) -> None:
+        del self._in_flight[key]
+
+        if task.cancelled() or task.exception() is not None:
+            return
+
+        self._entries[key] = (self._clock() + self._ttl_seconds, task.result())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            self._stats.evictions += 1
@@ -1,5 +1,17 @@
+from fastapi import Request
+from starlette.datastructures import State
+
 from job_agent.scrape.job_scraper import HiringCafeJobScraper
 
 
-def get_job_scraper():
-    return HiringCafeJobScraper()
+def create_job_scraper(state: State) -> HiringCafeJobScraper:
+    # The session (and its connection pool) and rate limiter are owned by the app lifespan
+    return HiringCafeJobScraper(
+        state.http_session,
+        rate_limiter=state.scrape_rate_limiter,
+        retry_policy=state.scrape_retry_policy,
+    )
+
+
+def get_job_scraper(request: Request):
+    return create_job_scraper(request.app.state)
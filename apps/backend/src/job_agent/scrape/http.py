@@ -0,0 +1,130 @@
+import time
+from dataclasses import dataclass
+from types import SimpleNamespace
+
+import aiohttp
+
+
+@dataclass
+class HttpPoolConfig:
+    limit: int = 100
+    limit_per_host: int = 20
+    keepalive_timeout: float = 30
+    dns_cache_ttl: int = 300
+    connect_timeout: float = 5
+    read_timeout: float = 15
+    total_timeout: float = 30
+
+
+@dataclass
+class HttpPoolStats:
+    limit: int
+    limit_per_host: int
+    in_flight: int
+    peak_in_flight: int
+    utilisation: float
+    requests: int
+    failed_requests: int
+    connections_created: int
+    connections_reused: int
+    waiting: int
+    waits: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+
+
+class HttpPoolMetrics:
+    def __init__(self, config: HttpPoolConfig):
+        self._config = config
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._requests = 0
+        self._failed_requests = 0
+        self._connections_created = 0
+        self._connections_reused = 0
+        self._waiting = 0
+        self._waits = 0
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_request_end.append(self._on_request_end)
+        trace_config.on_request_exception.append(self._on_request_exception)
+        trace_config.on_connection_queued_start.append(self._on_queued_start)
+        trace_config.on_connection_queued_end.append(self._on_queued_end)
+        trace_config.on_connection_create_end.append(self._on_connection_created)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reused)
+        return trace_config
+
+    def stats(self) -> HttpPoolStats:
+        return HttpPoolStats(
+            limit=self._config.limit,
+            limit_per_host=self._config.limit_per_host,
+            in_flight=self._in_flight,
+            peak_in_flight=self._peak_in_flight,
+            utilisation=self._in_flight / self._config.limit
+            if self._config.limit
+            else 0.0,
+            requests=self._requests,
+            failed_requests=self._failed_requests,
+            connections_created=self._connections_created,
+            connections_reused=self._connections_reused,
+            waiting=self._waiting,
+            waits=self._waits,
+            wait_seconds_total=self._wait_seconds_total,
+            wait_seconds_max=self._wait_seconds_max,
+        )
+
+    async def _on_request_start(self, _session, _ctx: SimpleNamespace, _params):
+        self._requests += 1
+        self._in_flight += 1
+        self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+
+    async def _on_request_end(self, _session, _ctx: SimpleNamespace, _params):
+        self._in_flight -= 1
+
+    async def _on_request_exception(self, _session, _ctx: SimpleNamespace, _params):
+        self._in_flight -= 1
+        self._failed_requests += 1
+
+    async def _on_queued_start(self, _session, ctx: SimpleNamespace, _params):
+        self._waiting += 1
+        ctx.queued_at = time.perf_counter()
+
+    async def _on_queued_end(self, _session, ctx: SimpleNamespace, _params):
+        waited = time.perf_counter() - ctx.queued_at
+        self._waiting -= 1
+        self._waits += 1
+        self._wait_seconds_total += waited
+        self._wait_seconds_max = max(self._wait_seconds_max, waited)
+
+    async def _on_connection_created(self, _session, _ctx: SimpleNamespace, _params):
+        self._connections_created += 1
+
+    async def _on_connection_reused(self, _session, _ctx: SimpleNamespace, _params):
+        self._connections_reused += 1
+
+
+def create_client_session(
+    config: HttpPoolConfig, metrics: HttpPoolMetrics
+) -> aiohttp.ClientSession:
+    connector = aiohttp.TCPConnector(
+        limit=config.limit,
+        limit_per_host=config.limit_per_host,
+        keepalive_timeout=config.keepalive_timeout,
+        ttl_dns_cache=config.dns_cache_ttl,
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=config.total_timeout,
+        # Includes waiting for a free connection in the pool
+        connect=config.connect_timeout,
+        sock_connect=config.connect_timeout,
+        sock_read=config.read_timeout,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=timeout,
+        trace_configs=[metrics.trace_config()],
+    )
@@ -1,49 +1,339 @@
 # from abc import ABC, abstractmethod
 # from typing import List
-from typing import Optional
+import asyncio
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from functools import partial
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Optional,
+    TypeVar,
+)
 
 from job_agent.models import JobListing
+from job_agent.scrape.build_id import NextBuildIdResolver
+from job_agent.scrape.cache import CacheStats, TTLCache
+from job_agent.scrape.rate_limit import (
+    AdaptiveRateLimiter,
+    RateLimitedError,
+    RetryPolicy,
+)
+from job_agent.scrape.streaming import (
+    MalformedPayloadError,
+    PayloadTooLargeError,
+    extract_fields,
+)
 import aiohttp
-from datetime import datetime
+from datetime import datetime, timezone
 import logging
-import json
 
 import urllib.parse
 
+T = TypeVar("T")
+
+SOURCE = "hiring.cafe"
+
 # class JobScraper(ABC):
 #     @abstractmethod
 #     def scrape(self, someargs) -> List[JobListing]:
 #         pass
 
 
+@dataclass(frozen=True)
+class ScrapedJob:
+    title: str
+    company: str
+    application_url: str
+    description: str
+    posted_at: datetime
+
+    def to_model(self) -> JobListing:
+        return JobListing(
+            title=self.title,
+            company=self.company,
+            application_url=self.application_url,
+            description=self.description,
+            source=SOURCE,
+            posted_at=self.posted_at,
+        )
+
+
+class JobNotFoundError(Exception):
+    def __init__(self, job_id: str):
+        super().__init__(f"Job {job_id} not found")
+        self.job_id = job_id
+
+
+class ScrapeFailedError(Exception):
+    def __init__(self, job_id: str, reason: str):
+        super().__init__(f"Failed to scrape job {job_id}: {reason}")
+        self.job_id = job_id
+
+
+class _RetryableResponseError(Exception):
+    def __init__(self, status: int):
+        super().__init__(f"hiring.cafe responded with {status}")
+
+
+@dataclass
+class ScrapeResult:
+    job_id: str
+    job: Optional[JobListing] = None
+    error: Optional[Exception] = None
+
+
+@dataclass
+class RefreshResult:
+    job_id: str
+    # None when hiring.cafe answered 304 Not Modified (or the job failed)
+    job: Optional[JobListing] = None
+    etag: Optional[str] = None
+    error: Optional[Exception] = None
+
+
+@dataclass
+class _JobPayload:
+    # None when not modified
+    fields: Optional[dict[str, Any]]
+    etag: Optional[str]
+
+
 class HiringCafeJobScraper:
-    _session: Optional[aiohttp.ClientSession] = None
-    _NEXT_BUILD_ID: str = "Z1keoTDB1W9ibFKAL7z8R"
+    BASE_URL: str = "https://hiring.cafe"
+    DEFAULT_MAX_CONCURRENCY: int = 10
+    MAX_PAYLOAD_BYTES: int = 2 * 1024 * 1024
+
+    # The job payload carries a lot we never use, only these paths are pulled out of the stream
+    JOB_FIELDS: dict[str, str] = {
+        "pageProps.job.v5_processed_job_data.core_job_title": "title",
+        "pageProps.job.v5_processed_job_data.company_name": "company",
+        "pageProps.job.v5_processed_job_data.estimated_publish_date": "posted_at",
+        "pageProps.job.apply_url": "application_url",
+        "pageProps.job.job_information.description": "description",
+    }
+
+    # One resolver per site for the whole process, hiring.cafe changes its build id on every deploy
+    _build_id_resolvers: dict[str, NextBuildIdResolver] = {}
+
+    # Shared by every scraper instance so concurrent requests for one job hit hiring.cafe once.
+    # Keyed by (base url, job id), scrapers pointed at another site never see each other's jobs
+    _cache: TTLCache[tuple[str, str], ScrapedJob] = TTLCache(
+        ttl_seconds=10 * 60, max_size=1000
+    )
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        base_url: Optional[str] = None,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+    ):
+        self._session = session
+        self._base_url = (base_url or self.BASE_URL).rstrip("/")
+        self._host = urllib.parse.urlparse(self._base_url).netloc
+        self._rate_limiter = rate_limiter or AdaptiveRateLimiter()
+        self._retry_policy = retry_policy or RetryPolicy()
+
+        resolvers = HiringCafeJobScraper._build_id_resolvers
+        if self._base_url not in resolvers:
+            resolvers[self._base_url] = NextBuildIdResolver(self._base_url)
+        self._build_id_resolver = resolvers[self._base_url]
+
+    @classmethod
+    def cache_stats(cls) -> CacheStats:
+        return cls._cache.stats()
 
     async def scrape_job(self, job_id: str) -> JobListing:
-        if HiringCafeJobScraper._session is None:
-            HiringCafeJobScraper._session = aiohttp.ClientSession()
+        # Each caller gets its own JobListing, cached data is never attached to a session
+        scraped_job = await HiringCafeJobScraper._cache.get_or_load(
+            (self._base_url, job_id), lambda: self._fetch_job(job_id)
+        )
+        return scraped_job.to_model()
+
+    async def refresh_job(
+        self, job_id: str, etag: Optional[str] = None
+    ) -> RefreshResult:
+        # Always goes to hiring.cafe, with If-None-Match when we know the etag
+        scraped_job, new_etag = await self._fetch_job_conditional(job_id, etag)
+        if scraped_job is None:
+            return RefreshResult(job_id=job_id, etag=new_etag or etag)
 
-        async with HiringCafeJobScraper._session.get(
-            f"https://hiring.cafe/_next/data/{self._NEXT_BUILD_ID}/job/{urllib.parse.quote_plus(job_id)}.json",
-            # headers=headers,
-        ) as response:
-            j = await response.json()
+        HiringCafeJobScraper._cache.invalidate((self._base_url, job_id))
+        return RefreshResult(job_id=job_id, job=scraped_job.to_model(), etag=new_etag)
 
+    async def _fetch_job(self, job_id: str) -> ScrapedJob:
+        scraped_job, _ = await self._fetch_job_conditional(job_id)
+        assert scraped_job is not None
+        return scraped_job
+
+    async def _fetch_job_conditional(
+        self, job_id: str, etag: Optional[str] = None
+    ) -> tuple[Optional[ScrapedJob], Optional[str]]:
+        build_id = await self._build_id_resolver.get(self._session)
+        payload = await self._fetch_job_data(build_id, job_id, etag)
+
+        if payload is None:
+            # Either hiring.cafe redeployed or the job doesn't exist, retry once with a fresh build id
+            fresh_build_id = await self._build_id_resolver.refresh(
+                self._session, build_id
+            )
+            if fresh_build_id != build_id:
+                payload = await self._fetch_job_data(fresh_build_id, job_id, etag)
+
+        if payload is None:
+            raise JobNotFoundError(job_id)
+        if payload.fields is None:
+            return None, payload.etag
+
+        j = payload.fields
         try:
-            data = j["pageProps"]["job"]
-            processed_job_data = data["v5_processed_job_data"]
-
-            return JobListing(
-                title=processed_job_data["core_job_title"],
-                company=processed_job_data["company_name"],
-                application_url=data["apply_url"],
-                description=data["job_information"]["description"],
-                source="hiring.cafe",
-                posted_at=datetime.fromisoformat(
-                    processed_job_data["estimated_publish_date"]
-                ),
+            scraped_job = ScrapedJob(
+                title=j["title"],
+                company=j["company"],
+                application_url=j["application_url"],
+                description=j["description"],
+                posted_at=datetime.fromisoformat(j["posted_at"]),
+            )
+        except (TypeError, ValueError) as e:
+            logging.error(
+                f"Response format not as expected for job {job_id}: {j!r:.500}"
+            )
+            raise ScrapeFailedError(job_id, "unexpected response format") from e
+
+        return scraped_job, payload.etag
+
+    async def _fetch_job_data(
+        self, build_id: str, job_id: str, etag: Optional[str] = None
+    ) -> Optional[_JobPayload]:
+        url = f"{self._base_url}/_next/data/{build_id}/job/{urllib.parse.quote_plus(job_id)}.json"
+        headers = {"If-None-Match": etag} if etag else None
+
+        for attempt in range(self._retry_policy.max_attempts):
+            retry_after: Optional[float] = None
+            try:
+                await self._rate_limiter.acquire(self._host)
+                async with self._session.get(url, headers=headers) as response:
+                    if response.status == 429 or response.status >= 500:
+                        retry_after = _parse_retry_after(
+                            response.headers.get("Retry-After")
+                        )
+                        self._rate_limiter.record_failure(
+                            self._host,
+                            throttled=response.status == 429,
+                            retry_after=retry_after,
+                        )
+                        raise _RetryableResponseError(response.status)
+
+                    self._rate_limiter.record_success(self._host)
+                    if response.status == 404:
+                        return None
+                    if response.status == 304:
+                        return _JobPayload(
+                            fields=None, etag=response.headers.get("ETag")
+                        )
+                    response.raise_for_status()
+                    return _JobPayload(
+                        fields=await extract_fields(
+                            response.content, self.JOB_FIELDS, self.MAX_PAYLOAD_BYTES
+                        ),
+                        etag=response.headers.get("ETag"),
+                    )
+            except MalformedPayloadError as e:
+                logging.error(
+                    f"Response format not as expected for job {job_id}: {e}\n"
+                    f"{e.sample.decode(errors='replace')}"
+                )
+                raise ScrapeFailedError(job_id, "unexpected response format") from e
+            except PayloadTooLargeError as e:
+                raise ScrapeFailedError(job_id, str(e)) from e
+            except RateLimitedError as e:
+                raise ScrapeFailedError(job_id, str(e)) from e
+            except (
+                _RetryableResponseError,
+                aiohttp.ClientConnectionError,
+                asyncio.TimeoutError,
+            ) as e:
+                if not isinstance(e, _RetryableResponseError):
+                    self._rate_limiter.record_failure(self._host)
+                if attempt + 1 == self._retry_policy.max_attempts:
+                    raise ScrapeFailedError(job_id, str(e)) from e
+
+            self._rate_limiter.record_retry(self._host)
+            await asyncio.sleep(
+                max(retry_after or 0, self._retry_policy.backoff(attempt))
             )
-        except KeyError as e:
-            logging.error(f"Response format not as expected\n{json.dumps(j, indent=4)}")
-            raise e
+
+        raise AssertionError("unreachable")
+
+    async def scrape_jobs(
+        self, job_ids: Iterable[str], max_concurrency: Optional[int] = None
+    ) -> AsyncIterator[ScrapeResult]:
+        # Yields results in completion order, a failed job never fails the whole batch
+        async def scrape(job_id: str) -> ScrapeResult:
+            try:
+                return ScrapeResult(job_id=job_id, job=await self.scrape_job(job_id))
+            except Exception as e:
+                logging.warning(f"Failed to scrape job {job_id}: {e!r}")
+                return ScrapeResult(job_id=job_id, error=e)
+
+        async for result in _as_completed_bounded(
+            [partial(scrape, job_id) for job_id in job_ids],
+            max_concurrency or self.DEFAULT_MAX_CONCURRENCY,
+        ):
+            yield result
+
+    async def refresh_jobs(
+        self,
+        jobs: Iterable[tuple[str, Optional[str]]],
+        max_concurrency: Optional[int] = None,
+    ) -> AsyncIterator[RefreshResult]:
+        # Takes (job id, etag) pairs, yields results in completion order
+        async def refresh(job_id: str, etag: Optional[str]) -> RefreshResult:
+            try:
+                return await self.refresh_job(job_id, etag)
+            except Exception as e:
+                logging.warning(f"Failed to refresh job {job_id}: {e!r}")
+                return RefreshResult(job_id=job_id, etag=etag, error=e)
+
+        async for result in _as_completed_bounded(
+            [partial(refresh, job_id, etag) for job_id, etag in jobs],
+            max_concurrency or self.DEFAULT_MAX_CONCURRENCY,
+        ):
+            yield result
+
+
+async def _as_completed_bounded(
+    calls: list[Callable[[], Awaitable[T]]], max_concurrency: int
+) -> AsyncIterator[T]:
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(call: Callable[[], Awaitable[T]]) -> T:
+        async with semaphore:
+            return await call()
+
+    tasks = [asyncio.create_task(run(call)) for call in calls]
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            yield await next_result
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    # Retry-After is either a number of seconds or an HTTP date
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(
+            (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds(),
+            0,
+        )
+    except (TypeError, ValueError):
+        return None
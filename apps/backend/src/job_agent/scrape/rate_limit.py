@@ -0,0 +1,176 @@
+import asyncio
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+class RateLimitedError(Exception):
+    def __init__(self, host: str, wait_seconds: float):
+        super().__init__(f"Rate limited by {host} for another {wait_seconds:.1f}s")
+        self.host = host
+        self.wait_seconds = wait_seconds
+
+
+@dataclass
+class RetryPolicy:
+    max_attempts: int = 4
+    base_delay_seconds: float = 0.5
+    max_delay_seconds: float = 10
+
+    def backoff(self, attempt: int) -> float:
+        # Exponential backoff with full jitter, attempt is 0 based
+        return random.uniform(
+            0, min(self.max_delay_seconds, self.base_delay_seconds * 2**attempt)
+        )
+
+
+@dataclass
+class RateLimiterConfig:
+    rate_per_second: float = 5
+    burst: int = 10
+    min_rate_per_second: float = 0.5
+    max_wait_seconds: float = 30
+    # Share of failures in the recent window that starts slowing us down / lets us speed back up
+    error_ratio_high: float = 0.2
+    error_ratio_low: float = 0.05
+    window_size: int = 50
+
+
+@dataclass
+class HostRateLimitStats:
+    host: str
+    rate_per_second: float
+    max_rate_per_second: float
+    waiting: int
+    requests: int
+    failures: int
+    throttled: int
+    retries: int
+    error_ratio: float
+    paused_for_seconds: float
+
+
+class _HostBucket:
+    def __init__(self, host: str, config: RateLimiterConfig, now: float):
+        self.host = host
+        self.rate = config.rate_per_second
+        self.tokens = float(config.burst)
+        self.updated_at = now
+        self.paused_until = now
+        self.last_slowdown_at = float("-inf")
+        self.outcomes: deque[bool] = deque(maxlen=config.window_size)
+        self.waiting = 0
+        self.requests = 0
+        self.failures = 0
+        self.throttled = 0
+        self.retries = 0
+
+    @property
+    def error_ratio(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket per host. Honours Retry-After by pausing the host, and lowers the
+    rate multiplicatively while the recent error ratio is high, recovering additively.
+    """
+
+    def __init__(
+        self,
+        config: Optional[RateLimiterConfig] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._config = config or RateLimiterConfig()
+        self._clock = clock
+        self._buckets: dict[str, _HostBucket] = {}
+
+    async def acquire(self, host: str) -> None:
+        bucket = self._bucket(host)
+        now = self._clock()
+        self._refill(bucket, now)
+
+        # Reserve a token, a negative balance is the queue of callers ahead of us
+        bucket.tokens -= 1
+        wait = max(bucket.paused_until - now, -bucket.tokens / bucket.rate, 0)
+        if wait > self._config.max_wait_seconds:
+            bucket.tokens += 1
+            raise RateLimitedError(host, wait)
+
+        bucket.requests += 1
+        if wait > 0:
+            bucket.waiting += 1
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                bucket.waiting -= 1
+
+    def record_success(self, host: str) -> None:
+        bucket = self._bucket(host)
+        bucket.outcomes.append(True)
+
+        if bucket.error_ratio <= self._config.error_ratio_low:
+            bucket.rate = min(
+                self._config.rate_per_second,
+                bucket.rate + self._config.rate_per_second / 10,
+            )
+
+    def record_failure(
+        self, host: str, throttled: bool = False, retry_after: Optional[float] = None
+    ) -> None:
+        bucket = self._bucket(host)
+        now = self._clock()
+        bucket.outcomes.append(False)
+        bucket.failures += 1
+
+        if throttled:
+            bucket.throttled += 1
+        if retry_after is not None:
+            bucket.paused_until = max(bucket.paused_until, now + retry_after)
+
+        # At most one slowdown per second, a burst of failures from one bad moment
+        # shouldn't collapse the rate to the floor
+        if (
+            bucket.error_ratio >= self._config.error_ratio_high
+            and now - bucket.last_slowdown_at >= 1
+        ):
+            self._refill(bucket, now)
+            bucket.rate = max(self._config.min_rate_per_second, bucket.rate / 2)
+            bucket.last_slowdown_at = now
+
+    def record_retry(self, host: str) -> None:
+        self._bucket(host).retries += 1
+
+    def stats(self) -> list[HostRateLimitStats]:
+        now = self._clock()
+        return [
+            HostRateLimitStats(
+                host=bucket.host,
+                rate_per_second=bucket.rate,
+                max_rate_per_second=self._config.rate_per_second,
+                waiting=bucket.waiting,
+                requests=bucket.requests,
+                failures=bucket.failures,
+                throttled=bucket.throttled,
+                retries=bucket.retries,
+                error_ratio=bucket.error_ratio,
+                paused_for_seconds=max(bucket.paused_until - now, 0),
+            )
+            for bucket in self._buckets.values()
+        ]
+
+    def _bucket(self, host: str) -> _HostBucket:
+        if host not in self._buckets:
+            self._buckets[host] = _HostBucket(host, self._config, self._clock())
+        return self._buckets[host]
+
+    def _refill(self, bucket: _HostBucket, now: float) -> None:
+        bucket.tokens = min(
+            float(self._config.burst),
+            bucket.tokens + (now - bucket.updated_at) * bucket.rate,
+        )
+        bucket.updated_at = now
@@ -0,0 +1,182 @@
+import argparse
+import asyncio
+import json
+import random
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from aiohttp import web
+
+
+@dataclass
+class StandInConfig:
+    build_id: str = "stand-in-build"
+    latency_seconds: float = 0
+    latency_jitter_seconds: float = 0
+    # Share of job requests answered with a 503
+    error_rate: float = 0
+    # Unused bytes added to every job payload, to see how the scraper copes with big pages
+    padding_bytes: int = 0
+    # Serve one of the fixtures for job ids that weren't recorded, so load tests can use unique ids
+    serve_unknown_jobs: bool = True
+    seed: Optional[int] = None
+
+
+def load_fixtures(directory: str | Path) -> dict[str, dict[str, Any]]:
+    # One <job id>.json file per recorded /_next/data/<build id>/job/<job id>.json response
+    return {
+        path.stem: json.loads(path.read_text())
+        for path in sorted(Path(directory).glob("*.json"))
+    }
+
+
+class HiringCafeStandIn:
+    """
+    Local stand-in for hiring.cafe that replays recorded job payloads, for tests and
+    benchmarks that can't (or shouldn't) reach the real site.
+    """
+
+    def __init__(
+        self,
+        fixtures: dict[str, dict[str, Any]],
+        config: Optional[StandInConfig] = None,
+    ):
+        if not fixtures:
+            raise ValueError("At least one fixture is required")
+
+        self.config = config or StandInConfig()
+        self.build_id = self.config.build_id
+        self.home_page_hits = 0
+        self.job_hits = 0
+        # Statuses to answer the next job requests with, before anything else
+        self.failures: list[int] = []
+        # Bodies served as-is for specific job ids, e.g. to send malformed JSON
+        self.raw_bodies: dict[str, bytes] = {}
+        # Bumping this changes every ETag, as if every job had been edited
+        self.revision = 1
+        self.base_url: Optional[str] = None
+
+        self._random = random.Random(self.config.seed)
+        self._fixture_ids = sorted(fixtures)
+        # Serialized once up front so the stand-in isn't what a benchmark ends up measuring
+        self._bodies = {
+            job_id: self._render(payload) for job_id, payload in fixtures.items()
+        }
+        self._runner: Optional[web.AppRunner] = None
+
+        self.app = web.Application()
+        self.app.router.add_get("/", self.home_page)
+        self.app.router.add_get("/_next/data/{build_id}/job/{job_id}.json", self.job)
+
+    @classmethod
+    def from_directory(
+        cls, directory: str | Path, config: Optional[StandInConfig] = None
+    ) -> "HiringCafeStandIn":
+        return cls(load_fixtures(directory), config)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        self.base_url = f"http://{host}:{self._runner.addresses[0][1]}"
+        return self.base_url
+
+    async def close(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def home_page(self, request: web.Request) -> web.Response:
+        self.home_page_hits += 1
+        await self._delay()
+        return web.Response(
+            text=f'<script id="__NEXT_DATA__" type="application/json">{{"buildId":"{self.build_id}"}}</script>',
+            content_type="text/html",
+        )
+
+    async def job(self, request: web.Request) -> web.Response:
+        self.job_hits += 1
+        await self._delay()
+
+        job_id = request.match_info["job_id"]
+        if self.failures:
+            return web.Response(
+                status=self.failures.pop(0), headers={"Retry-After": "0"}
+            )
+        if self.config.error_rate and self._random.random() < self.config.error_rate:
+            return web.Response(status=503)
+        if request.match_info["build_id"] != self.build_id:
+            return web.json_response({"notFound": True}, status=404)
+        if job_id in self.raw_bodies:
+            return web.Response(
+                body=self.raw_bodies[job_id], content_type="application/json"
+            )
+
+        body = self._bodies.get(job_id)
+        if body is None:
+            if not self.config.serve_unknown_jobs:
+                return web.json_response({"notFound": True}, status=404)
+            fixture_id = self._fixture_ids[
+                zlib.crc32(job_id.encode()) % len(self._fixture_ids)
+            ]
+            body = self._bodies[fixture_id]
+
+        etag = f'"{job_id}-{self.revision}"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(
+            body=body, content_type="application/json", headers={"ETag": etag}
+        )
+
+    async def _delay(self) -> None:
+        latency = self.config.latency_seconds
+        if self.config.latency_jitter_seconds:
+            latency += self._random.uniform(0, self.config.latency_jitter_seconds)
+        if latency > 0:
+            await asyncio.sleep(latency)
+
+    def _render(self, payload: dict[str, Any]) -> bytes:
+        if self.config.padding_bytes:
+            # Padding goes first so a streaming parser has to read past it
+            job = payload["pageProps"]["job"]
+            payload = {
+                **payload,
+                "pageProps": {
+                    **payload["pageProps"],
+                    "job": {"padding": "x" * self.config.padding_bytes, **job},
+                },
+            }
+        return json.dumps(payload).encode()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve recorded hiring.cafe jobs")
+    parser.add_argument("--fixtures", default="tests/data/hiring_cafe")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--build-id", default=StandInConfig.build_id)
+    parser.add_argument("--latency", type=float, default=0)
+    parser.add_argument("--jitter", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--padding-bytes", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    stand_in = HiringCafeStandIn.from_directory(
+        args.fixtures,
+        StandInConfig(
+            build_id=args.build_id,
+            latency_seconds=args.latency,
+            latency_jitter_seconds=args.jitter,
+            error_rate=args.error_rate,
+            padding_bytes=args.padding_bytes,
+            seed=args.seed,
+        ),
+    )
+    web.run_app(stand_in.app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
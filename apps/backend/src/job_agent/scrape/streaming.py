@@ -0,0 +1,79 @@
+from typing import Any, Mapping
+
+import aiohttp
+import ijson
+
+
+class PayloadTooLargeError(Exception):
+    def __init__(self, max_bytes: int):
+        super().__init__(f"Response body exceeded {max_bytes} bytes")
+        self.max_bytes = max_bytes
+
+
+class MalformedPayloadError(Exception):
+    def __init__(self, reason: str, sample: bytes):
+        super().__init__(reason)
+        self.sample = sample
+
+
+class _CappedReader:
+    # File-like wrapper for ijson, fails fast once the body grows past max_bytes
+    # and keeps the start of the body around for logging
+    def __init__(self, stream: aiohttp.StreamReader, max_bytes: int, sample_bytes: int):
+        self._stream = stream
+        self._max_bytes = max_bytes
+        self._sample_bytes = sample_bytes
+        self._sample = bytearray()
+        self.bytes_read = 0
+
+    @property
+    def sample(self) -> bytes:
+        return bytes(self._sample)
+
+    async def read(self, n: int = -1) -> bytes:
+        chunk = await self._stream.read(n)
+        self.bytes_read += len(chunk)
+        if self.bytes_read > self._max_bytes:
+            raise PayloadTooLargeError(self._max_bytes)
+        if len(self._sample) < self._sample_bytes:
+            self._sample += chunk[: self._sample_bytes - len(self._sample)]
+        return chunk
+
+
+async def extract_fields(
+    stream: aiohttp.StreamReader,
+    fields: Mapping[str, str],
+    max_bytes: int,
+    sample_bytes: int = 2048,
+    buf_size: int = 16 * 1024,
+) -> dict[str, Any]:
+    """
+    Incrementally parses a JSON body and returns only the scalar values at the given
+    ijson prefixes (e.g. "pageProps.job.apply_url"), keyed by the names in `fields`.
+    """
+    reader = _CappedReader(stream, max_bytes, sample_bytes)
+    found: dict[str, Any] = {}
+
+    try:
+        async for prefix, event, value in ijson.parse_async(reader, buf_size=buf_size):
+            if prefix in fields and event in ("string", "number", "boolean", "null"):
+                found[fields[prefix]] = value
+                if len(found) == len(fields):
+                    break
+    except ijson.JSONError as e:
+        raise MalformedPayloadError(f"Invalid JSON: {e}", reader.sample) from e
+
+    missing = sorted(name for name in fields.values() if name not in found)
+    if missing:
+        raise MalformedPayloadError(
+            f"Missing fields: {', '.join(missing)}", reader.sample
+        )
+
+    # Read what's left so the connection can go back to the pool, past the cap it's cheaper to drop it
+    try:
+        while await reader.read(buf_size):
+            pass
+    except PayloadTooLargeError:
+        pass
+
+    return found
@@ -0,0 +1,120 @@
+import re
+from typing import Any, Optional
+
+from sqlalchemy import (
+    Select,
+    Table,
+    column,
+    func,
+    literal_column,
+    select,
+    table,
+    text,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from job_agent.models import JobListing
+
+
+def dialect_insert(db: AsyncSession, entity: Any) -> postgresql.Insert | sqlite.Insert:
+    # ON CONFLICT support lives on the dialect specific insert constructs
+    dialect_name = db.get_bind().dialect.name
+
+    if dialect_name == "postgresql":
+        return postgresql.insert(entity)
+    if dialect_name == "sqlite":
+        return sqlite.insert(entity)
+
+    raise NotImplementedError(f"Upserts are not supported on {dialect_name}")
+
+
+async def dialect_bulk_insert_ignore(
+    db: AsyncSession,
+    target: Table,
+    rows: list[dict[str, Any]],
+    index_elements: list[str],
+) -> int:
+    # For batches too big for one INSERT ... VALUES. Every row needs the same keys.
+    # Rows that conflict on index_elements are left alone, returns how many were inserted
+    if not rows:
+        return 0
+    columns = list(rows[0])
+    dialect_name = db.get_bind().dialect.name
+
+    if dialect_name == "postgresql":
+        # COPY can't resolve conflicts itself, so it fills a staging table that is then inserted in one statement
+        staging = f"{target.name}_staging"
+        await db.execute(
+            text(
+                f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS "
+                f"SELECT {', '.join(columns)} FROM {target.name} WITH NO DATA"
+            )
+        )
+        # Same connection and transaction as the session, the statement above began it
+        raw_connection = await (await db.connection()).get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            staging,
+            records=[tuple(row[name] for name in columns) for row in rows],
+            columns=columns,
+        )
+        result = await db.execute(
+            postgresql.insert(target)
+            .from_select(columns, select(table(staging, *map(column, columns))))
+            .on_conflict_do_nothing(index_elements=index_elements)
+        )
+        await db.execute(text(f"DROP TABLE {staging}"))
+        return result.rowcount
+
+    result = await db.execute(
+        dialect_insert(db, target).on_conflict_do_nothing(
+            index_elements=index_elements
+        ),
+        rows,
+    )
+    return result.rowcount
+
+
+def dialect_job_listing_search(
+    db: AsyncSession, query: str
+) -> Optional[Select[tuple[JobListing]]]:
+    # Best match first, see JOB_LISTING_SEARCH_DDL for what backs each dialect.
+    # None when the query has nothing searchable in it
+    dialect_name = db.get_bind().dialect.name
+
+    if dialect_name == "postgresql":
+        # websearch_to_tsquery accepts anything a user might type, quotes and -exclusions included
+        ts_query = func.websearch_to_tsquery(
+            literal_column("'english'::regconfig"), query
+        )
+        search_vector = literal_column("job_listing.search_vector")
+        return (
+            select(JobListing)
+            .where(search_vector.op("@@")(ts_query))
+            .order_by(
+                func.ts_rank_cd(search_vector, ts_query).desc(), JobListing.id.desc()
+            )
+        )
+
+    if dialect_name == "sqlite":
+        # FTS5 query syntax errors on stray punctuation, so only plain terms are passed through
+        terms = re.findall(r"\w+", query)
+        if not terms:
+            return None
+        fts = table("job_listing_fts", column("rowid"))
+        return (
+            select(JobListing)
+            .join(fts, fts.c.rowid == JobListing.id)
+            .where(
+                literal_column("job_listing_fts").op("MATCH")(
+                    " ".join(f'"{term}"' for term in terms)
+                )
+            )
+            # bm25 is lower for better matches, weighted like the Postgres title/company/description
+            .order_by(
+                func.bm25(literal_column("job_listing_fts"), 10.0, 5.0, 1.0),
+                JobListing.id.desc(),
+            )
+        )
+
+    raise NotImplementedError(f"Search is not supported on {dialect_name}")
@@ -6,6 +6,9 @@ from starlette.status import (
     HTTP_404_NOT_FOUND,
     HTTP_401_UNAUTHORIZED,
     HTTP_409_CONFLICT,
+    HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+    HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+    HTTP_502_BAD_GATEWAY,
 )
 
 # ===
@@ -29,6 +32,26 @@ class InvalidResumeFileTypeException(HTTPException):
         )
 
 
+class InvalidResumeFileException(HTTPException):
+    def __init__(self, reason: str):
+        super().__init__(status_code=400, detail=f"Invalid resume file: {reason}")
+
+
+class InvalidCursorException(HTTPException):
+    def __init__(self):
+        super().__init__(status_code=400, detail="Invalid pagination cursor")
+
+
+class InvalidImportFileException(HTTPException):
+    def __init__(self, reason: str):
+        super().__init__(status_code=400, detail=f"Invalid import file: {reason}")
+
+
+class InvalidFormException(HTTPException):
+    def __init__(self, reason: str):
+        super().__init__(status_code=400, detail=f"Invalid form: {reason}")
+
+
 # ===
 # 401
 # ===
@@ -56,6 +79,13 @@ class EntityWithIdNotFoundException(HTTPException):
         super().__init__(status_code=HTTP_404_NOT_FOUND, detail=message)
 
 
+class JobUrlNotFoundException(HTTPException):
+    def __init__(self, job_url: HttpUrl | str):
+        super().__init__(
+            status_code=HTTP_404_NOT_FOUND, detail=f"No job found at {job_url}"
+        )
+
+
 class CandidateNotFoundException(HTTPException):
     def __init__(
         self, candidate_id: Optional[int] = None, candidate_email: Optional[str] = None
@@ -85,6 +115,16 @@ class CoverLetterNotFoundException(EntityWithIdNotFoundException):
         super().__init__("Cover letter", cover_letter_id)
 
 
+class JobApplicationNotFoundException(EntityWithIdNotFoundException):
+    def __init__(self, job_application_id: Optional[int] = None):
+        super().__init__("Job application", job_application_id)
+
+
+class ScrapeTaskNotFoundException(EntityWithIdNotFoundException):
+    def __init__(self, task_id: Optional[int] = None):
+        super().__init__("Scrape task", task_id)
+
+
 class SocialLinkNotFoundException(HTTPException):
     def __init__(
         self,
@@ -122,3 +162,50 @@ class ResumeNameConflictException(HTTPException):
             message = f"You already have a resume with name {name}"
 
         super().__init__(status_code=HTTP_409_CONFLICT, detail=message)
+
+
+class JobApplicationConflictException(HTTPException):
+    def __init__(self, job_listing_id: int):
+        super().__init__(
+            status_code=HTTP_409_CONFLICT,
+            detail=f"You have already applied to job listing {job_listing_id}",
+        )
+
+
+# ===
+# 413
+# ===
+
+
+class ResumeTooLargeException(HTTPException):
+    def __init__(self, max_bytes: int):
+        super().__init__(
+            status_code=HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Resume is too large, the limit is {max_bytes // (1024 * 1024)}MB",
+        )
+
+
+# ===
+# 415
+# ===
+
+
+class UnsupportedImportFormatException(HTTPException):
+    def __init__(self, content_type: str):
+        super().__init__(
+            status_code=HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Unsupported import format '{content_type}'. Send text/csv (with a header row) or application/x-ndjson.",
+        )
+
+
+# ===
+# 502
+# ===
+
+
+class JobScrapeFailedException(HTTPException):
+    def __init__(self, job_url: HttpUrl | str):
+        super().__init__(
+            status_code=HTTP_502_BAD_GATEWAY,
+            detail=f"Could not fetch the job at {job_url} right now, please try again later",
+        )
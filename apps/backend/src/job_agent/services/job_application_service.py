@@ -1,104 +1,320 @@
 from typing import Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import Row, Select, and_, select, update
 
-from job_agent.models import JobApplication, Candidate, JobListing, Resume, CoverLetter
-from job_agent.services.schemas import CreateJobApplicationRequest, JobApplicationDTO
+from job_agent.models import (
+    JobApplication,
+    JobApplicationStatus,
+    JobApplicationStatusCount,
+    Candidate,
+    JobListing,
+    Resume,
+    CoverLetter,
+)
+from job_agent.services.dialects import dialect_insert
+from job_agent.services.pagination import (
+    clamp_page_size,
+    decode_cursor,
+    encode_cursor,
+)
+from job_agent.services.schemas import (
+    CreateJobApplicationRequest,
+    CoverLetterDTO,
+    JobApplicationDTO,
+    JobApplicationPageDTO,
+    JobApplicationStatsDTO,
+    JobListingSummaryDTO,
+    ResumeDTO,
+    UpdateJobApplicationStatusRequest,
+)
 from job_agent.services.exceptions import (
     CandidateNotFoundException,
+    JobApplicationConflictException,
+    JobApplicationNotFoundException,
     JobListingNotFoundException,
     CoverLetterNotFoundException,
     ResumeNotFoundException,
 )
 
 
+# Flat projection of everything a JobApplicationDTO shows, so listing a page is a single
+# query with nothing to hydrate or lazy load
+_APPLICATION_COLUMNS = (
+    JobApplication.id,
+    JobApplication.application_status,
+    JobApplication.notes,
+    JobListing.id.label("job_listing_id"),
+    JobListing.title.label("job_listing_title"),
+    JobListing.application_url.label("job_listing_application_url"),
+    JobListing.company.label("job_listing_company"),
+    JobListing.source.label("job_listing_source"),
+    JobListing.posted_at.label("job_listing_posted_at"),
+    JobListing.scraped_at.label("job_listing_scraped_at"),
+    JobListing.updated_at.label("job_listing_updated_at"),
+    JobListing.closed_at.label("job_listing_closed_at"),
+    Resume.id.label("resume_id"),
+    Resume.name.label("resume_name"),
+    Resume.created_at.label("resume_created_at"),
+    Resume.processing_status.label("resume_processing_status"),
+    CoverLetter.id.label("cover_letter_id"),
+    CoverLetter.name.label("cover_letter_name"),
+    CoverLetter.key.label("cover_letter_key"),
+)
+
+
 class JobApplicationService:
     def __init__(self, db: AsyncSession) -> None:
         self._db = db
 
-    async def _get_candidate_by_id(self, candidate_id: int) -> Candidate:
+    async def _get_application_references(
+        self, candidate_id: int, request: CreateJobApplicationRequest
+    ) -> tuple[JobListing, Resume, CoverLetter | None]:
+        # One round trip for everything the application points at. The resume and cover letter
+        # joins only match rows the candidate owns, anything missing comes back as NULL
         query = (
-            select(Candidate)
+            select(Candidate.id, JobListing, Resume, CoverLetter)
+            .select_from(Candidate)
+            .outerjoin(JobListing, JobListing.id == request.job_listing_id)
+            .outerjoin(
+                Resume,
+                and_(
+                    Resume.id == request.resume_id,
+                    Resume.candidate_id == Candidate.id,
+                ),
+            )
+            .outerjoin(
+                CoverLetter,
+                and_(
+                    CoverLetter.id == request.cover_letter_id,
+                    CoverLetter.candidate_id == Candidate.id,
+                ),
+            )
             .where(Candidate.id == candidate_id)
-            .options(selectinload(Candidate.applications))
         )
         result = await self._db.execute(query)
-        candidate = result.scalar_one_or_none()
+        row = result.one_or_none()
 
-        if candidate is None:
+        if row is None:
             raise CandidateNotFoundException(candidate_id)
+        _, job_listing, resume, cover_letter = row
+        if job_listing is None:
+            raise JobListingNotFoundException(request.job_listing_id)
+        if resume is None:
+            raise ResumeNotFoundException(request.resume_id)
+        if request.cover_letter_id is not None and cover_letter is None:
+            raise CoverLetterNotFoundException(request.cover_letter_id)
 
-        return candidate
+        return job_listing, resume, cover_letter
 
-    async def _get_job_listing_by_id(self, job_id: int) -> JobListing:
-        query = select(JobListing).where(JobListing.id == job_id)
-        result = await self._db.execute(query)
-        job_listing = result.scalar_one_or_none()
+    async def create_job_application(
+        self, candidate_id: int, request: CreateJobApplicationRequest
+    ) -> JobApplicationDTO:
+        job_listing, resume, cover_letter = await self._get_application_references(
+            candidate_id, request
+        )
 
-        if job_listing is None:
-            raise JobListingNotFoundException(job_id)
+        # Insert by id, going through the relationships would pull in the candidate's
+        # whole application history. The unique index settles double submits and retries
+        # in the same statement, a conflict returns no row
+        result = await self._db.execute(
+            dialect_insert(self._db, JobApplication)
+            .values(
+                candidate_id=candidate_id,
+                job_listing_id=job_listing.id,
+                used_resume_id=resume.id,
+                used_cover_letter_id=cover_letter.id if cover_letter else None,
+            )
+            .on_conflict_do_nothing(
+                index_elements=[
+                    JobApplication.candidate_id,
+                    JobApplication.job_listing_id,
+                ]
+            )
+            .returning(
+                JobApplication.id,
+                JobApplication.application_status,
+                JobApplication.notes,
+            )
+        )
+        row = result.one_or_none()
+        if row is None:
+            raise JobApplicationConflictException(job_listing.id)
+        job_application_id, application_status, notes = row
+        await self._adjust_status_counts(candidate_id, {application_status: 1})
+        job_application = JobApplicationDTO(
+            id=job_application_id,
+            application_status=application_status,
+            job_listing=JobListingSummaryDTO.from_model(job_listing),
+            used_resume=ResumeDTO.from_model(resume),
+            used_cover_letter=CoverLetterDTO.from_model(cover_letter)
+            if cover_letter
+            else None,
+            notes=notes,
+        )
+        await self._db.commit()
 
-        return job_listing
+        return job_application
 
-    async def _get_resume(self, user_id: int, resume_id: int) -> Resume:
-        query = (
-            select(Resume)
-            .where(Resume.id == resume_id)
-            .where(Resume.candidate_id == user_id)
-        )
-        result = await self._db.execute(query)
-        resume = result.scalar_one_or_none()
+    async def list_job_applications(
+        self,
+        candidate_id: int,
+        statuses: Optional[list[JobApplicationStatus]] = None,
+        cursor: Optional[str] = None,
+        limit: int = 20,
+    ) -> JobApplicationPageDTO:
+        # Newest first, keyset on id so deep pages cost the same as the first one
+        limit = clamp_page_size(limit)
 
-        if resume is None:
-            raise ResumeNotFoundException(resume_id)
+        query = _applications_query(candidate_id)
+        if statuses:
+            query = query.where(JobApplication.application_status.in_(statuses))
+        if cursor is not None:
+            query = query.where(
+                JobApplication.id < decode_cursor(cursor, _parse_cursor)
+            )
 
-        return resume
+        result = await self._db.execute(
+            query.order_by(JobApplication.id.desc()).limit(limit + 1)
+        )
+        rows = result.all()
 
-    async def _get_cover_letter(
-        self, user_id: int, cover_letter_id: int
-    ) -> Optional[CoverLetter]:
-        query = (
-            select(CoverLetter)
-            .where(CoverLetter.id == cover_letter_id)
-            .where(CoverLetter.candidate_id == user_id)
+        next_cursor = encode_cursor(rows[limit - 1].id) if len(rows) > limit else None
+        return JobApplicationPageDTO(
+            items=[_application_from_row(row) for row in rows[:limit]],
+            next_cursor=next_cursor,
         )
-        result = await self._db.execute(query)
-        cover_letter = result.scalar_one_or_none()
 
-        if cover_letter is None:
-            raise CoverLetterNotFoundException(cover_letter_id)
+    async def update_job_application_status(
+        self,
+        candidate_id: int,
+        job_application_id: int,
+        request: UpdateJobApplicationStatusRequest,
+    ) -> JobApplicationDTO:
+        # Lock the row so concurrent changes to the same application count it once each
+        current_status = await self._db.scalar(
+            select(JobApplication.application_status)
+            .where(
+                JobApplication.id == job_application_id,
+                JobApplication.candidate_id == candidate_id,
+            )
+            .with_for_update()
+        )
+        if current_status is None:
+            raise JobApplicationNotFoundException(job_application_id)
 
-        return cover_letter
+        new_status = request.application_status
+        if new_status != current_status:
+            await self._db.execute(
+                update(JobApplication)
+                .where(JobApplication.id == job_application_id)
+                .values(application_status=new_status)
+            )
+            await self._adjust_status_counts(
+                candidate_id, {current_status: -1, new_status: 1}
+            )
 
-    async def create_job_application(
-        self, candidate_id: int, request: CreateJobApplicationRequest
-    ) -> JobApplicationDTO:
-        # TODO: Check for existing job application for this job
-
-        candidate = await self._get_candidate_by_id(candidate_id)
-        job_listing = await self._get_job_listing_by_id(request.job_listing_id)
-        resume = (
-            await self._get_resume(candidate.id, request.resume_id)
-            if request.resume_id
-            else None
+        result = await self._db.execute(
+            _applications_query(candidate_id).where(
+                JobApplication.id == job_application_id
+            )
         )
-        cover_letter = (
-            await self._get_cover_letter(candidate.id, request.cover_letter_id)
-            if request.cover_letter_id
-            else None
+        job_application = _application_from_row(result.one())
+        await self._db.commit()
+
+        return job_application
+
+    async def get_job_application_stats(
+        self, candidate_id: int
+    ) -> JobApplicationStatsDTO:
+        # Primary key lookup on the maintained counts, no scan over job_application
+        result = await self._db.execute(
+            select(
+                JobApplicationStatusCount.application_status,
+                JobApplicationStatusCount.count,
+            ).where(JobApplicationStatusCount.candidate_id == candidate_id)
         )
+        counts = {status: 0 for status in JobApplicationStatus}
+        for status, count in result.tuples():
+            counts[status] = count
+
+        return JobApplicationStatsDTO(counts=counts, total=sum(counts.values()))
 
-        job_application = JobApplication(
-            candidate=candidate,
-            job_listing=job_listing,
-            used_resume=resume,
-            used_cover_letter=cover_letter,
+    async def _adjust_status_counts(
+        self, candidate_id: int, deltas: dict[JobApplicationStatus, int]
+    ) -> None:
+        # Runs in the caller's transaction, so the counts commit (or roll back) with the change.
+        # Rows go in status order so two opposite status changes can't deadlock on them
+        insert = dialect_insert(self._db, JobApplicationStatusCount)
+        await self._db.execute(
+            insert.values(
+                [
+                    {
+                        "candidate_id": candidate_id,
+                        "application_status": status,
+                        "count": delta,
+                    }
+                    for status, delta in sorted(deltas.items())
+                ]
+            ).on_conflict_do_update(
+                index_elements=[
+                    JobApplicationStatusCount.candidate_id,
+                    JobApplicationStatusCount.application_status,
+                ],
+                set_={
+                    "count": JobApplicationStatusCount.count + insert.excluded["count"]
+                },
+            )
         )
 
-        self._db.add(job_application)
-        await self._db.commit()
-        # await self._db.refresh(job_application)
 
-        return JobApplicationDTO.from_model(job_application)
+def _applications_query(candidate_id: int) -> Select:
+    return (
+        select(*_APPLICATION_COLUMNS)
+        .select_from(JobApplication)
+        # Applications outlive a deleted listing, they're still listed (and counted in the stats)
+        .outerjoin(JobListing, JobListing.id == JobApplication.job_listing_id)
+        .outerjoin(Resume, Resume.id == JobApplication.used_resume_id)
+        .outerjoin(CoverLetter, CoverLetter.id == JobApplication.used_cover_letter_id)
+        .where(JobApplication.candidate_id == candidate_id)
+    )
+
+
+def _application_from_row(row: Row) -> JobApplicationDTO:
+    return JobApplicationDTO(
+        id=row.id,
+        application_status=row.application_status,
+        job_listing=JobListingSummaryDTO(
+            id=row.job_listing_id,
+            title=row.job_listing_title,
+            application_url=row.job_listing_application_url,
+            company=row.job_listing_company,
+            source=row.job_listing_source,
+            posted_at=row.job_listing_posted_at,
+            scraped_at=row.job_listing_scraped_at,
+            updated_at=row.job_listing_updated_at,
+            closed_at=row.job_listing_closed_at,
+        )
+        if row.job_listing_id is not None
+        else None,
+        used_resume=ResumeDTO(
+            id=row.resume_id,
+            name=row.resume_name,
+            created_at=row.resume_created_at,
+            processing_status=row.resume_processing_status,
+        )
+        if row.resume_id is not None
+        else None,
+        used_cover_letter=CoverLetterDTO(
+            id=row.cover_letter_id, name=row.cover_letter_name, key=row.cover_letter_key
+        )
+        if row.cover_letter_id is not None
+        else None,
+        notes=row.notes,
+    )
+
+
+def _parse_cursor(application_id: int) -> int:
+    if not isinstance(application_id, int):
+        raise ValueError(application_id)
+    return application_id
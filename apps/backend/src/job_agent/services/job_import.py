@@ -0,0 +1,154 @@
+import codecs
+import csv
+import enum
+import json
+from typing import Any, AsyncIterable, AsyncIterator
+
+from pydantic import ValidationError
+
+from job_agent.services.exceptions import (
+    InvalidImportFileException,
+    UnsupportedImportFormatException,
+)
+from job_agent.services.schemas import CreateJobRequest
+
+# Longest single CSV record / NDJSON line we'll buffer, a stray quote shouldn't swallow the whole file
+MAX_RECORD_CHARS = 1024 * 1024
+
+
+class JobImportFormat(str, enum.Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+    @classmethod
+    def from_content_type(cls, content_type: str) -> "JobImportFormat":
+        media_type = content_type.split(";")[0].strip().lower()
+        if media_type in ("text/csv", "application/csv"):
+            return cls.CSV
+        if media_type in (
+            "application/x-ndjson",
+            "application/ndjson",
+            "application/jsonl",
+            "application/x-jsonlines",
+        ):
+            return cls.NDJSON
+        raise UnsupportedImportFormatException(content_type)
+
+
+async def parse_job_import(
+    chunks: AsyncIterable[bytes], format: JobImportFormat
+) -> AsyncIterator[tuple[int, CreateJobRequest | str]]:
+    """
+    Streams rows out of a CSV (with a header row) or NDJSON upload, only ever holding one
+    chunk and one record in memory. Yields (line number, request) or (line number, error)
+    """
+    records = _csv_records if format == JobImportFormat.CSV else _ndjson_records
+    async for line, data in records(_iter_lines(chunks)):
+        if isinstance(data, str):
+            yield line, data
+            continue
+        try:
+            yield line, CreateJobRequest.model_validate(data)
+        except ValidationError as e:
+            yield line, _format_validation_error(e)
+
+
+async def _iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[list[str]]:
+    # The complete lines in each chunk, the partial line at the end waits for the next one
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    try:
+        async for chunk in chunks:
+            lines = (pending + decoder.decode(chunk)).split("\n")
+            pending = lines.pop()
+            if len(pending) > MAX_RECORD_CHARS:
+                raise InvalidImportFileException(
+                    f"Line longer than {MAX_RECORD_CHARS} characters"
+                )
+            if lines:
+                yield lines
+        pending += decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        raise InvalidImportFileException("File is not valid UTF-8")
+    if pending:
+        yield [pending]
+
+
+async def _csv_records(
+    batches: AsyncIterator[list[str]],
+) -> AsyncIterator[tuple[int, dict[str, Any] | str]]:
+    header: list[str] | None = None
+    line_number = 0
+    record: list[str] = []
+    record_line = record_chars = quotes = 0
+
+    async for lines in batches:
+        for line in lines:
+            line_number += 1
+            if not record:
+                record_line = line_number
+            record.append(line)
+            record_chars += len(line)
+            # Quotes inside quoted fields are doubled, so an odd count means a field spans lines
+            quotes += line.count('"')
+            if quotes % 2:
+                if record_chars > MAX_RECORD_CHARS:
+                    raise InvalidImportFileException(
+                        f"Unterminated quoted field starting on line {record_line}"
+                    )
+                continue
+
+            text = "\n".join(record)
+            record, record_chars, quotes = [], 0, 0
+            if not text.strip():
+                continue
+
+            try:
+                values = next(csv.reader([text]))
+            except csv.Error as e:
+                yield record_line, f"Invalid CSV: {e}"
+                continue
+
+            if header is None:
+                header = [name.strip() for name in values]
+                continue
+            if len(values) != len(header):
+                yield (
+                    record_line,
+                    f"Expected {len(header)} columns, got {len(values)}",
+                )
+                continue
+            # Empty cells are missing values, not empty strings
+            yield (
+                record_line,
+                {name: value for name, value in zip(header, values) if value != ""},
+            )
+
+    if record:
+        yield record_line, f"Unterminated quoted field starting on line {record_line}"
+
+
+async def _ndjson_records(
+    batches: AsyncIterator[list[str]],
+) -> AsyncIterator[tuple[int, dict[str, Any] | str]]:
+    line_number = 0
+    async for lines in batches:
+        for line in lines:
+            line_number += 1
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, f"Invalid JSON: {e.msg}"
+                continue
+            if not isinstance(data, dict):
+                yield line_number, "Expected a JSON object"
+                continue
+            yield line_number, data
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(map(str, e['loc'])) or 'row'}: {e['msg']}" for e in error.errors()
+    )
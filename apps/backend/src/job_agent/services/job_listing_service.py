@@ -1,39 +1,426 @@
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, AsyncIterable, Optional
+
 from pydantic import HttpUrl
-from urllib.parse import urlparse
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
 
+from sqlalchemy import ColumnElement, func, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload, undefer
+
+from job_agent.models import JobListing, ScrapeTask, ScrapeTaskStatus
+from job_agent.scrape.job_scraper import (
+    SOURCE as HIRING_CAFE_SOURCE,
+    HiringCafeJobScraper,
+    JobNotFoundError,
+    ScrapeFailedError,
+)
+from job_agent.services.dialects import (
+    dialect_bulk_insert_ignore,
+    dialect_insert,
+    dialect_job_listing_search,
+)
+from job_agent.services.job_import import JobImportFormat, parse_job_import
+from job_agent.services.pagination import (
+    clamp_page_size,
+    decode_cursor,
+    encode_cursor,
+)
+
+from job_agent.services.exceptions import (
+    JobListingNotFoundException,
+    UnsupportedJobUrlException,
+    JobUrlNotFoundException,
+    JobScrapeFailedException,
+    ScrapeTaskNotFoundException,
+)
+from job_agent.services.schemas import (
+    JobImportErrorDTO,
+    JobImportResultDTO,
+    JobListingDTO,
+    JobListingPageDTO,
+    JobListingSummaryDTO,
+    ScrapeJobListingRequest,
+    CreateJobRequest,
+    ScrapeJobListingsRequest,
+    ScrapeJobListingResultDTO,
+    ScrapeTaskDTO,
+)
 
-from job_agent.models import JobListing
-from job_agent.scrape.job_scraper import HiringCafeJobScraper
 
-from job_agent.services.exceptions import UnsupportedJobUrlException
-from job_agent.services.schemas import JobListingDTO, ScrapeJobListingRequest, CreateJobRequest
+@dataclass
+class JobRefreshBatch:
+    last_id: Optional[int] = None
+    checked: int = 0
+    changed: int = 0
+    unchanged: int = 0
+    closed: int = 0
+    failed: int = 0
 
 
 class JobService:
-    def __init__(self, db: AsyncSession, job_scraper: HiringCafeJobScraper):
+    def __init__(
+        self,
+        db: AsyncSession,
+        job_scraper: HiringCafeJobScraper,
+        scrape_concurrency: Optional[int] = None,
+    ):
         self._db = db
         self._job_scraper = job_scraper
+        self._scrape_concurrency = scrape_concurrency
+
+    async def list_jobs(
+        self, cursor: Optional[str] = None, limit: int = 20
+    ) -> JobListingPageDTO:
+        # Newest first by posted_at, undated listings last. Keyset pagination so deep pages
+        # cost the same as the first one
+        limit = clamp_page_size(limit)
+        after = decode_cursor(cursor, _parse_cursor) if cursor is not None else None
+
+        # Dated and undated listings are two separate index range scans, this keeps the
+        # ordering identical on every dialect regardless of where it sorts NULLs
+        jobs: list[JobListing] = []
+        if after is None or after[0] is not None:
+            query = select(JobListing).where(
+                JobListing.closed_at.is_(None), JobListing.posted_at.is_not(None)
+            )
+            if after is not None:
+                query = query.where(
+                    tuple_(JobListing.posted_at, JobListing.id) < tuple_(*after)
+                )
+            jobs += await self._db.scalars(
+                query.order_by(JobListing.posted_at.desc(), JobListing.id.desc()).limit(
+                    limit + 1
+                )
+            )
+
+        if len(jobs) <= limit:
+            query = select(JobListing).where(
+                JobListing.closed_at.is_(None), JobListing.posted_at.is_(None)
+            )
+            if after is not None and after[0] is None:
+                query = query.where(JobListing.id < after[1])
+            jobs += await self._db.scalars(
+                query.order_by(JobListing.posted_at.desc(), JobListing.id.desc()).limit(
+                    limit + 1 - len(jobs)
+                )
+            )
+
+        next_cursor = _encode_cursor(jobs[limit - 1]) if len(jobs) > limit else None
+        return JobListingPageDTO(
+            items=[JobListingSummaryDTO.from_model(job) for job in jobs[:limit]],
+            next_cursor=next_cursor,
+        )
+
+    async def search_jobs(
+        self, query: str, limit: int = 20
+    ) -> list[JobListingSummaryDTO]:
+        limit = clamp_page_size(limit)
+        stmt = dialect_job_listing_search(self._db, query)
+        if stmt is None:
+            return []
+
+        jobs = await self._db.scalars(
+            stmt.where(JobListing.closed_at.is_(None)).limit(limit)
+        )
+        return [JobListingSummaryDTO.from_model(job) for job in jobs]
+
+    async def get_job(self, job_id: int) -> JobListingDTO:
+        job = await self._db.scalar(
+            select(JobListing)
+            .where(JobListing.id == job_id)
+            .options(undefer(JobListing.description))
+        )
+        if job is None:
+            raise JobListingNotFoundException(job_id)
+        return JobListingDTO.from_model(job)
 
     async def fetch_job(self, request: ScrapeJobListingRequest) -> JobListingDTO:
         job_id = self._parse_url_id(request.job_url)
-        job = await self._job_scraper.scrape_job(job_id)
-        self._db.add(job)
+        try:
+            job = await self._job_scraper.scrape_job(job_id)
+        except JobNotFoundError:
+            raise JobUrlNotFoundException(request.job_url)
+        except ScrapeFailedError:
+            raise JobScrapeFailedException(request.job_url)
+        [job] = await self._upsert_jobs([_to_row(job, external_id=job_id)])
         await self._db.commit()
         return JobListingDTO.from_model(job)
 
+    async def fetch_jobs(
+        self, request: ScrapeJobListingsRequest
+    ) -> list[ScrapeJobListingResultDTO]:
+        job_ids: dict[str, str] = {}
+        url_errors: dict[str, str] = {}
+        for job_url in request.job_urls:
+            try:
+                job_ids[str(job_url)] = self._parse_url_id(job_url)
+            except UnsupportedJobUrlException as e:
+                url_errors[str(job_url)] = e.detail
+
+        rows: list[dict[str, Any]] = []
+        scrape_errors: dict[str, str] = {}
+        async for result in self._job_scraper.scrape_jobs(
+            set(job_ids.values()), self._scrape_concurrency
+        ):
+            if result.job is not None:
+                rows.append(_to_row(result.job, external_id=result.job_id))
+            elif isinstance(result.error, JobNotFoundError):
+                scrape_errors[result.job_id] = f"Job {result.job_id} not found"
+            else:
+                scrape_errors[result.job_id] = f"Failed to scrape job {result.job_id}"
+
+        # One statement and one transaction for the whole batch
+        jobs = {job.external_id: job for job in await self._upsert_jobs(rows)}
+        await self._db.commit()
+
+        results = []
+        for job_url in map(str, request.job_urls):
+            job_id = job_ids.get(job_url)
+            if job_id is None:
+                results.append(
+                    ScrapeJobListingResultDTO(
+                        job_url=job_url, error=url_errors[job_url]
+                    )
+                )
+            elif job_id not in jobs:
+                results.append(
+                    ScrapeJobListingResultDTO(
+                        job_url=job_url, error=scrape_errors[job_id]
+                    )
+                )
+            else:
+                results.append(
+                    ScrapeJobListingResultDTO(
+                        job_url=job_url,
+                        job_listing=JobListingDTO.from_model(jobs[job_id]),
+                    )
+                )
+
+        return results
+
+    async def enqueue_fetch_job(
+        self, request: ScrapeJobListingRequest
+    ) -> ScrapeTaskDTO:
+        # Reject urls we can't scrape now rather than failing the task later
+        self._parse_url_id(request.job_url)
+
+        task = ScrapeTask(job_url=str(request.job_url))
+        self._db.add(task)
+        await self._db.commit()
+        return ScrapeTaskDTO.from_model(task)
+
+    async def get_scrape_task(self, task_id: int) -> ScrapeTaskDTO:
+        task = await self._db.scalar(
+            select(ScrapeTask)
+            .where(ScrapeTask.id == task_id)
+            .options(selectinload(ScrapeTask.job_listing))
+        )
+        if task is None:
+            raise ScrapeTaskNotFoundException(task_id)
+        return ScrapeTaskDTO.from_model(task)
+
+    async def run_scrape_task(self, task_id: int) -> None:
+        task = await self._db.get(ScrapeTask, task_id)
+        if task is None:
+            raise ScrapeTaskNotFoundException(task_id)
+
+        try:
+            job_listing = await self.fetch_job(
+                ScrapeJobListingRequest(job_url=task.job_url)
+            )
+        except (
+            UnsupportedJobUrlException,
+            JobUrlNotFoundException,
+            JobScrapeFailedException,
+        ) as e:
+            # The scraper already retried transient failures, these are final
+            task.status = ScrapeTaskStatus.FAILED
+            task.error = e.detail
+        else:
+            task.status = ScrapeTaskStatus.SUCCEEDED
+            task.job_listing_id = job_listing.id
+            task.error = None
+
+        task.lease_expires_at = None
+        task.finished_at = task.updated_at = datetime.utcnow()
+        await self._db.commit()
+
     async def create_job_manual(self, request: CreateJobRequest) -> JobListingDTO:
-        job = JobListing(
-            title=request.title,
-            company=request.company,
-            application_url=request.application_url,
-            description=request.description,
-            source="manual"
+        # Manual listings are shared by every user, whoever added the url first keeps it as they wrote it
+        row = _manual_row(request)
+        stmt = (
+            dialect_insert(self._db, JobListing)
+            .values(row)
+            .on_conflict_do_nothing(
+                index_elements=[JobListing.source, JobListing.external_id]
+            )
+        )
+        job = await self._db.scalar(
+            stmt.returning(JobListing).options(undefer(JobListing.description))
         )
-        self._db.add(job)
+        if job is None:
+            job = await self._db.scalar(
+                select(JobListing)
+                .where(
+                    JobListing.source == row["source"],
+                    JobListing.external_id == row["external_id"],
+                )
+                .options(undefer(JobListing.description))
+            )
         await self._db.commit()
         return JobListingDTO.from_model(job)
 
+    async def refresh_stale_jobs(
+        self, stale_before: datetime, after_id: int = 0, limit: int = 50
+    ) -> JobRefreshBatch:
+        # Walks stale listings in id order, callers pass the returned last_id back in to continue.
+        # Each batch is claimed before it's scraped so sweepers in other processes skip it rather
+        # than scraping the same listings again: claiming marks them as just scraped, and the ones
+        # that then fail to scrape get their old scraped_at back to be retried next sweep
+        now = datetime.utcnow()
+        stale = (
+            await self._db.execute(
+                select(
+                    JobListing.id,
+                    JobListing.external_id,
+                    JobListing.etag,
+                    JobListing.content_hash,
+                    JobListing.scraped_at,
+                )
+                .where(*_stale_jobs_filter(stale_before), JobListing.id > after_id)
+                .order_by(JobListing.id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+        ).all()
+
+        batch = JobRefreshBatch()
+        if not stale:
+            await self._db.commit()
+            return batch
+        batch.last_id = stale[-1].id
+
+        # Guarded as well, where SKIP LOCKED isn't supported another sweeper may have got there first
+        claimed = set(
+            await self._db.scalars(
+                update(JobListing)
+                .where(
+                    JobListing.id.in_([listing.id for listing in stale]),
+                    JobListing.scraped_at < stale_before,
+                )
+                .values(scraped_at=now)
+                .returning(JobListing.id)
+            )
+        )
+        await self._db.commit()
+        stale = [listing for listing in stale if listing.id in claimed]
+        listings = {listing.external_id: listing for listing in stale}
+
+        changed: list[dict[str, Any]] = []
+        new_etags: list[dict[str, Any]] = []
+        unchanged_ids: list[int] = []
+        closed_ids: list[int] = []
+        failed: list[dict[str, Any]] = []
+        async for result in self._job_scraper.refresh_jobs(
+            [(listing.external_id, listing.etag) for listing in stale],
+            self._scrape_concurrency,
+        ):
+            listing = listings[result.job_id]
+            batch.checked += 1
+
+            if isinstance(result.error, JobNotFoundError):
+                batch.closed += 1
+                closed_ids.append(listing.id)
+                continue
+            if result.error is not None:
+                batch.failed += 1
+                failed.append({"id": listing.id, "scraped_at": listing.scraped_at})
+                continue
+
+            row = (
+                _to_row(result.job, external_id=result.job_id)
+                if result.job is not None
+                else None
+            )
+            if row is not None and row["content_hash"] != listing.content_hash:
+                batch.changed += 1
+                changed.append(
+                    {
+                        "id": listing.id,
+                        "title": row["title"],
+                        "company": row["company"],
+                        "application_url": row["application_url"],
+                        "description": row["description"],
+                        "posted_at": row["posted_at"],
+                        "content_hash": row["content_hash"],
+                        "etag": result.etag,
+                        "scraped_at": now,
+                        "updated_at": now,
+                    }
+                )
+            elif result.etag != listing.etag:
+                batch.unchanged += 1
+                new_etags.append(
+                    {"id": listing.id, "etag": result.etag, "scraped_at": now}
+                )
+            else:
+                batch.unchanged += 1
+                unchanged_ids.append(listing.id)
+
+        # Only changed listings get their content rewritten, each kind of write is one batched statement
+        if changed:
+            await self._db.execute(update(JobListing), changed)
+        if new_etags:
+            await self._db.execute(update(JobListing), new_etags)
+        if unchanged_ids:
+            await self._db.execute(
+                update(JobListing)
+                .where(JobListing.id.in_(unchanged_ids))
+                .values(scraped_at=now)
+            )
+        if closed_ids:
+            await self._db.execute(
+                update(JobListing)
+                .where(JobListing.id.in_(closed_ids))
+                .values(closed_at=now, scraped_at=now, updated_at=now)
+            )
+        if failed:
+            await self._db.execute(update(JobListing), failed)
+        await self._db.commit()
+
+        return batch
+
+    async def get_stale_job_backlog(
+        self, stale_before: datetime
+    ) -> tuple[int, Optional[datetime]]:
+        count, oldest_scraped_at = (
+            await self._db.execute(
+                select(func.count(), func.min(JobListing.scraped_at)).where(
+                    *_stale_jobs_filter(stale_before)
+                )
+            )
+        ).one()
+        return count, oldest_scraped_at
+
+    async def _upsert_jobs(self, rows: list[dict[str, Any]]) -> list[JobListing]:
+        if not rows:
+            return []
+
+        stmt = dialect_insert(self._db, JobListing).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[JobListing.source, JobListing.external_id],
+            set_={name: stmt.excluded[name] for name in _UPSERT_COLUMNS},
+        )
+        # Callers hand the written listings straight back, description included
+        result = await self._db.scalars(
+            stmt.returning(JobListing).options(undefer(JobListing.description)),
+            execution_options={"populate_existing": True},
+        )
+        return list(result.all())
+
     def _parse_url_id(self, job_url: HttpUrl) -> str:
         parsed_url = urlparse(str(job_url))
 
@@ -45,3 +432,187 @@ class JobService:
             raise UnsupportedJobUrlException(job_url)
 
         return job_id
+
+
+class JobImportService:
+    BATCH_SIZE: int = 10_000
+    MAX_ERRORS: int = 1000
+
+    def __init__(self, db: AsyncSession):
+        self._db = db
+
+    async def import_jobs(
+        self, chunks: AsyncIterable[bytes], format: JobImportFormat
+    ) -> JobImportResultDTO:
+        # Imported like manual listings, listings that are already there are left as they are.
+        # Each batch is committed on its own, an import that fails halfway keeps the earlier batches
+        result = JobImportResultDTO(imported=0, skipped=0, failed=0, errors=[])
+        batch: dict[str, dict[str, Any]] = {}
+
+        async for line, request in parse_job_import(chunks, format):
+            error = request if isinstance(request, str) else None
+            if not isinstance(request, str):
+                try:
+                    row = _manual_row(request)
+                except ValueError:
+                    error = "application_url: Invalid URL"
+            if error is not None:
+                result.failed += 1
+                if len(result.errors) < self.MAX_ERRORS:
+                    result.errors.append(JobImportErrorDTO(line=line, error=error))
+                continue
+
+            # First one wins, as it does against listings written by earlier batches
+            if row["external_id"] in batch:
+                result.skipped += 1
+                continue
+            batch[row["external_id"]] = row
+            if len(batch) >= self.BATCH_SIZE:
+                await self._write_batch(list(batch.values()), result)
+                batch.clear()
+
+        await self._write_batch(list(batch.values()), result)
+        return result
+
+    async def _write_batch(
+        self, rows: list[dict[str, Any]], result: JobImportResultDTO
+    ) -> None:
+        if not rows:
+            return
+        inserted = await dialect_bulk_insert_ignore(
+            self._db,
+            JobListing.__table__,
+            rows,
+            index_elements=["source", "external_id"],
+        )
+        await self._db.commit()
+        result.imported += inserted
+        result.skipped += len(rows) - inserted
+
+
+# Written on every upsert, id and the source/external_id key stay as they were
+_UPSERT_COLUMNS = [
+    "title",
+    "company",
+    "application_url",
+    "description",
+    "posted_at",
+    "content_hash",
+    "scraped_at",
+    "updated_at",
+    "closed_at",
+]
+
+# Query parameters that only track where a click came from, they never identify a job
+_TRACKING_PARAMS = {
+    "gclid",
+    "fbclid",
+    "msclkid",
+    "dclid",
+    "mc_cid",
+    "mc_eid",
+    "_hsenc",
+    "_hsmi",
+    "gh_src",
+    "lever-source",
+    "lever-origin",
+    "trk",
+}
+
+
+def _canonicalize_url(url: str) -> str:
+    parsed_url = urlparse(url.strip())
+
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parsed_url.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in _TRACKING_PARAMS
+    )
+    netloc = parsed_url.netloc.lower()
+    if (parsed_url.scheme, parsed_url.port) in (("http", 80), ("https", 443)):
+        netloc = netloc.rsplit(":", 1)[0]
+
+    return urlunparse(
+        (
+            parsed_url.scheme.lower(),
+            netloc,
+            parsed_url.path.rstrip("/") or "/",
+            parsed_url.params,
+            urlencode(query),
+            "",
+        )
+    )
+
+
+def _encode_cursor(job: JobListing) -> str:
+    posted_at = job.posted_at.isoformat() if job.posted_at is not None else None
+    return encode_cursor(posted_at, job.id)
+
+
+def _parse_cursor(
+    posted_at: Optional[str], job_id: int
+) -> tuple[Optional[datetime], int]:
+    if not isinstance(job_id, int):
+        raise ValueError(job_id)
+    return (
+        datetime.fromisoformat(posted_at) if posted_at is not None else None,
+        job_id,
+    )
+
+
+def _stale_jobs_filter(stale_before: datetime) -> list[ColumnElement[bool]]:
+    return [
+        JobListing.source == HIRING_CAFE_SOURCE,
+        JobListing.external_id.is_not(None),
+        JobListing.closed_at.is_(None),
+        JobListing.scraped_at < stale_before,
+    ]
+
+
+def _content_hash(row: dict[str, Any]) -> str:
+    content = [
+        row["title"],
+        row["company"],
+        row["application_url"],
+        row["description"] or "",
+        row["posted_at"].isoformat() if row["posted_at"] else "",
+    ]
+    return hashlib.sha256("\x1f".join(content).encode()).hexdigest()
+
+
+def _to_row(job: JobListing, external_id: str) -> dict[str, Any]:
+    now = datetime.utcnow()
+    row = {
+        "title": job.title,
+        "company": job.company,
+        "application_url": _canonicalize_url(job.application_url),
+        "description": job.description,
+        "source": job.source,
+        "external_id": external_id,
+        "posted_at": job.posted_at,
+        "scraped_at": job.scraped_at or now,
+        "updated_at": now,
+        "closed_at": None,
+    }
+    row["content_hash"] = _content_hash(row)
+    return row
+
+
+def _manual_row(request: CreateJobRequest) -> dict[str, Any]:
+    # Manual listings have no id at their source, the canonical url identifies them
+    application_url = _canonicalize_url(request.application_url)
+    now = datetime.utcnow()
+    row = {
+        "title": request.title,
+        "company": request.company,
+        "application_url": application_url,
+        "description": request.description,
+        "source": "manual",
+        "external_id": application_url,
+        "posted_at": None,
+        "scraped_at": now,
+        "updated_at": now,
+        "closed_at": None,
+    }
+    row["content_hash"] = _content_hash(row)
+    return row
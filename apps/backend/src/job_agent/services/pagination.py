@@ -0,0 +1,31 @@
+import base64
+import binascii
+import json
+from typing import Any, Callable, TypeVar
+
+from job_agent.services.exceptions import InvalidCursorException
+
+T = TypeVar("T")
+
+MAX_PAGE_SIZE = 100
+
+
+def clamp_page_size(limit: int) -> int:
+    return min(max(limit, 1), MAX_PAGE_SIZE)
+
+
+def encode_cursor(*values: Any) -> str:
+    # Opaque to clients, just the keyset values of the last row on the page
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, parse: Callable[..., T]) -> T:
+    # parse gets the values encode_cursor was given and raises TypeError or ValueError
+    # when they aren't what it expects, either way the client gets InvalidCursorException
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list):
+            raise ValueError(values)
+        return parse(*values)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise InvalidCursorException()
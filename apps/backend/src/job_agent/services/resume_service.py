@@ -1,27 +1,49 @@
 import asyncio
-from io import BytesIO
+import hashlib
+import tempfile
+from contextlib import nullcontext
+from datetime import datetime
+from pathlib import Path
+from typing import IO
 
-from pypdf import PdfReader
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from sqlalchemy import select
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
 
-from job_agent.models import Candidate, Resume
+from job_agent.models import Candidate, Resume, ResumeProcessingStatus
+from job_agent.pdf_extraction import PdfExtractionError, PdfTextExtractor
 from job_agent.services.exceptions import (
+    InvalidResumeFileException,
     InvalidResumeFileTypeException,
     CandidateNotFoundException,
     ResumeNameConflictException,
     ResumeNotFoundException,
+    ResumeTooLargeException,
+)
+from job_agent.services.s3_file_uploader import S3FileUploader, S3Upload
+from job_agent.services.schemas import (
+    FileUpload,
+    UploadResumeRequest,
+    ResumeDTO,
+    ResumeProcessingDTO,
+    PresignedUrlDTO,
 )
-from job_agent.services.s3_file_uploader import S3FileUploader
-from job_agent.services.schemas import UploadResumeRequest, ResumeDTO, PresignedUrlDTO
 
 
 class ResumeService:
-    def __init__(self, db: AsyncSession, s3_file_uploader: S3FileUploader):
+    def __init__(
+        self,
+        db: AsyncSession,
+        s3_file_uploader: S3FileUploader,
+        pdf_extractor: PdfTextExtractor,
+        max_upload_bytes: int = 10 * 1024 * 1024,
+    ):
         self._db = db
         self._s3_file_uploader = s3_file_uploader
+        self._pdf_extractor = pdf_extractor
+        self._max_upload_bytes = max_upload_bytes
 
     async def upload_resume(
         self, candidate_id: int, request: UploadResumeRequest
@@ -29,39 +51,145 @@ class ResumeService:
         if request.file.content_type != "application/pdf":
             raise InvalidResumeFileTypeException(request.file.content_type)
 
-        query = (
-            select(Candidate)
-            .where(Candidate.id == candidate_id)
-            .options(selectinload(Candidate.resumes))
-        )
-        result = await self._db.execute(query)
-        candidate: Candidate | None = result.scalar_one_or_none()
+        candidate = await self._db.get(Candidate, candidate_id)
 
         if candidate is None:
             raise CandidateNotFoundException(candidate_id=candidate_id)
 
-        if any(resume.name == request.name for resume in candidate.resumes):
-            raise ResumeNameConflictException(request.name)
+        upload = self._s3_file_uploader.start_upload(request.file.content_type)
+        try:
+            # Only extracting here needs a local copy, in the background it's read back from S3
+            with (
+                nullcontext()
+                if request.process_in_background
+                else tempfile.NamedTemporaryFile(suffix=".pdf")
+            ) as pdf:
+                content_hash = await self._receive_file(request.file, upload, pdf)
+                stored_file = await self._s3_file_uploader.add_reference(
+                    content_hash, upload, request.file.content_type
+                )
+                text_content = None
+                if stored_file.ref_count > 1:
+                    # Same bytes as a resume we already have, reuse what was extracted from it
+                    await upload.abort()
+                    text_content = await self._db.scalar(
+                        select(Resume.text_content)
+                        .where(Resume.stored_file_id == stored_file.id)
+                        .limit(1)
+                    )
+                if text_content is None and pdf is not None:
+                    text_content = await self._extract_text(Path(pdf.name))
+
+            try:
+                # The unique (candidate_id, name) index is the name check. In a savepoint so the
+                # session is still usable after a conflict
+                async with self._db.begin_nested():
+                    # Queued for the resume workers if there's no text yet
+                    resume = Resume(
+                        name=request.name,
+                        stored_file=stored_file,
+                        text_content=text_content,
+                        candidate=candidate,
+                    )
+                    self._db.add(resume)
+            except IntegrityError:
+                raise ResumeNameConflictException(request.name)
+
+            if stored_file.ref_count == 1:
+                # Last, so a file we can't read or can't save the resume for never gets stored
+                await upload.complete()
+        except BaseException:
+            await upload.abort()
+            raise
 
-        stored_file = await self._s3_file_uploader.upload(request.file)
+        await self._db.commit()
 
-        resume = Resume(
-            name=request.name,
-            stored_file=stored_file,
-            text_content=await _extract_text_content_from_pdf(request.file.data),
-            candidate=candidate,
+        return ResumeDTO.from_model(resume)
+
+    async def process_resume(self, resume_id: int, attempt: int) -> bool:
+        # attempt is the processing_attempts the worker claimed the resume with. False when the
+        # claim was lost (lease expired and someone else took it, or deleted), nothing is written
+        resume = await self._db.scalar(
+            select(Resume)
+            .where(Resume.id == resume_id)
+            .options(selectinload(Resume.stored_file))
         )
+        if resume is None:
+            # Deleted while it was queued
+            return False
+
+        text_content = None
+        processing_status = ResumeProcessingStatus.READY
+        processing_error = None
+        with tempfile.NamedTemporaryFile(suffix=".pdf") as pdf:
+            await self._s3_file_uploader.download(resume.stored_file, pdf)
+            await asyncio.to_thread(pdf.flush)
+            try:
+                text_content = await self._extract_text(Path(pdf.name))
+            except InvalidResumeFileException as e:
+                # Retrying won't make the file readable, anything else is raised and retried
+                processing_status = ResumeProcessingStatus.FAILED
+                processing_error = e.detail
 
-        self._db.add(resume)
+        result = await self._db.execute(
+            update(Resume)
+            .where(
+                Resume.id == resume_id,
+                Resume.processing_status == ResumeProcessingStatus.PROCESSING,
+                Resume.processing_attempts == attempt,
+            )
+            .values(
+                text_content=text_content,
+                processing_status=processing_status,
+                processing_error=processing_error,
+                processing_lease_expires_at=None,
+                updated_at=datetime.utcnow(),
+            )
+        )
         await self._db.commit()
+        return bool(result.rowcount)
 
-        return ResumeDTO.from_model(resume)
+    async def get_resume_processing(
+        self, candidate_id: int, resume_id: int
+    ) -> ResumeProcessingDTO:
+        result = await self._db.execute(
+            select(
+                Resume.id,
+                Resume.processing_status,
+                Resume.processing_attempts,
+                Resume.processing_error,
+            )
+            .where(Resume.candidate_id == candidate_id)
+            .where(Resume.id == resume_id)
+        )
+        row = result.one_or_none()
 
-    async def get_resumes_by_candidate_id(self, candidate_id: int):
-        query = select(Resume).where(Resume.candidate_id == candidate_id)
-        result = await self._db.execute(query)
-        resumes = result.scalars().all()
-        return [ResumeDTO.from_model(resume) for resume in resumes]
+        if row is None:
+            raise ResumeNotFoundException(resume_id)
+
+        return ResumeProcessingDTO(
+            resume_id=row.id,
+            status=row.processing_status,
+            attempts=row.processing_attempts,
+            error=row.processing_error,
+        )
+
+    async def get_resumes_by_candidate_id(self, candidate_id: int) -> list[ResumeDTO]:
+        # Just the listed columns, not the whole resume text of every row
+        result = await self._db.execute(
+            select(Resume.id, Resume.name, Resume.created_at, Resume.processing_status)
+            .where(Resume.candidate_id == candidate_id)
+            .order_by(Resume.id)
+        )
+        return [
+            ResumeDTO(
+                id=row.id,
+                name=row.name,
+                created_at=row.created_at,
+                processing_status=row.processing_status,
+            )
+            for row in result
+        ]
 
     async def get_resume_presigned_url(
         self, candidate_id: int, resume_id: int
@@ -92,15 +220,36 @@ class ResumeService:
             raise ResumeNotFoundException(resume_id)
 
         await self._db.delete(resume)
+        last_reference = await self._s3_file_uploader.remove_reference(
+            resume.stored_file
+        )
         await self._db.commit()
 
-
-async def _extract_text_content_from_pdf(pdf: bytes):
-    def read() -> str:
-        reader = PdfReader(stream=BytesIO(pdf))
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
-        return text
-
-    return await asyncio.to_thread(read)
+        if last_reference:
+            await self._s3_file_uploader.delete_object(resume.stored_file)
+
+    async def _receive_file(
+        self, file: FileUpload, upload: S3Upload, pdf: IO[bytes] | None
+    ) -> str:
+        # Each chunk goes to S3 (and the local copy) as it arrives. S3Upload buffers up to a part,
+        # so memory use is bounded by S3Upload.PART_SIZE, not the file size. Returns the sha256
+        # of the contents
+        content_hash = hashlib.sha256()
+        size = 0
+        async for chunk in file.chunks:
+            size += len(chunk)
+            if size > self._max_upload_bytes:
+                raise ResumeTooLargeException(self._max_upload_bytes)
+            content_hash.update(chunk)
+            if pdf is not None:
+                await asyncio.to_thread(pdf.write, chunk)
+            await upload.write(chunk)
+        if pdf is not None:
+            await asyncio.to_thread(pdf.flush)
+        return content_hash.hexdigest()
+
+    async def _extract_text(self, pdf: Path) -> str:
+        try:
+            return await self._pdf_extractor.extract_text(pdf)
+        except PdfExtractionError as e:
+            raise InvalidResumeFileException(str(e))
@@ -1,11 +1,100 @@
-from typing import Optional
+import asyncio
+import logging
+import uuid
+from typing import IO
 
+from botocore.exceptions import BotoCoreError, ClientError
 from types_aiobotocore_s3.client import S3Client
-import uuid
+from types_aiobotocore_s3.type_defs import CompletedPartTypeDef
+from sqlalchemy import delete, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from job_agent.models import StoredFile
-from job_agent.services.schemas import FileContent, PresignedUrlDTO, StoredFileDTO
+from job_agent.services.dialects import dialect_insert
+from job_agent.services.schemas import PresignedUrlDTO, StoredFileDTO
+
+logger = logging.getLogger(__name__)
+
+
+class S3Upload:
+    """
+    Writes an object in parts as the data comes in. Data is buffered until there's a whole part,
+    so memory use is bounded by PART_SIZE (plus one write) rather than the size of the object.
+    Nothing is visible in the bucket until complete(), and files smaller than a part go up in a
+    single put_object
+    """
+
+    # S3's minimum for every part but the last
+    PART_SIZE = 5 * 1024 * 1024
+    # Downloads have no such minimum, they're copied out in much smaller pieces
+    DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, s3_client: S3Client, bucket: str, key: str, content_type: str):
+        self.bucket = bucket
+        self.key = key
+        self._s3 = s3_client
+        self._content_type = content_type
+        self._buffer = bytearray()
+        self._upload_id: str | None = None
+        self._parts: list[CompletedPartTypeDef] = []
+        self._finished = False
+
+    async def write(self, data: bytes) -> None:
+        self._buffer += data
+        if len(self._buffer) >= self.PART_SIZE:
+            await self._upload_part()
+
+    async def complete(self) -> None:
+        if self._upload_id is None:
+            await self._s3.put_object(
+                Bucket=self.bucket,
+                Key=self.key,
+                Body=bytes(self._buffer),
+                ContentType=self._content_type,
+            )
+        else:
+            if self._buffer:
+                await self._upload_part()
+            await self._s3.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=self.key,
+                UploadId=self._upload_id,
+                MultipartUpload={"Parts": self._parts},
+            )
+        self._buffer.clear()
+        self._finished = True
+
+    async def abort(self) -> None:
+        # Safe to call whatever state the upload is in, including after complete()
+        self._buffer.clear()
+        if self._upload_id is None or self._finished:
+            return
+        self._finished = True
+        try:
+            await self._s3.abort_multipart_upload(
+                Bucket=self.bucket, Key=self.key, UploadId=self._upload_id
+            )
+        except (BotoCoreError, ClientError) as e:
+            # Usually called while handling another error, don't hide that one. The bucket's
+            # lifecycle rule cleans up incomplete uploads eventually
+            logger.warning("Could not abort multipart upload of %s: %s", self.key, e)
+
+    async def _upload_part(self) -> None:
+        if self._upload_id is None:
+            response = await self._s3.create_multipart_upload(
+                Bucket=self.bucket, Key=self.key, ContentType=self._content_type
+            )
+            self._upload_id = response["UploadId"]
+        part_number = len(self._parts) + 1
+        response = await self._s3.upload_part(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self._upload_id,
+            PartNumber=part_number,
+            Body=bytes(self._buffer),
+        )
+        self._parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+        self._buffer.clear()
 
 
 class S3FileUploader:
@@ -14,22 +103,70 @@ class S3FileUploader:
         self._s3 = s3_client
         self._bucket = bucket_name
 
-    async def upload(self, file: FileContent, key: Optional[str] = None) -> StoredFile:
-        if not key:
-            key = str(uuid.uuid4())
+    def start_upload(self, content_type: str) -> S3Upload:
+        # The hash is only known once the whole file has gone past, so the key can't be based on it
+        return S3Upload(self._s3, self._bucket, str(uuid.uuid4()), content_type)
+
+    async def add_reference(
+        self, content_hash: str, upload: S3Upload, content_type: str
+    ) -> StoredFile:
+        # Uploading bytes we already have just takes another reference on them. A ref_count of 1
+        # afterwards means the file is new and the caller has to complete() the upload, otherwise
+        # it's a duplicate and should be aborted. Doesn't commit, the reference belongs with
+        # whatever uses it
+        insert = dialect_insert(self._db, StoredFile)
+        result = await self._db.execute(
+            insert.values(
+                key=upload.key,
+                bucket=self._bucket,
+                content_type=content_type,
+                content_hash=content_hash,
+                ref_count=1,
+            )
+            .on_conflict_do_update(
+                index_elements=[StoredFile.content_hash],
+                set_={"ref_count": StoredFile.ref_count + 1},
+            )
+            .returning(StoredFile)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one()
 
-        await self._s3.put_object(
-            Bucket=self._bucket, Key=key, Body=file.data, ContentType=file.content_type
+    async def remove_reference(self, stored_file: StoredFile) -> bool:
+        # Returns True if that was the last reference and the row is gone. The caller deletes the
+        # object with delete_object() once its transaction has committed, a rollback must never
+        # leave the row pointing at a missing object
+        ref_count = await self._db.scalar(
+            update(StoredFile)
+            .where(StoredFile.id == stored_file.id)
+            .values(ref_count=StoredFile.ref_count - 1)
+            .returning(StoredFile.ref_count)
         )
+        if ref_count is None or ref_count > 0:
+            return False
 
-        stored_file = StoredFile(
-            key=key, bucket=self._bucket, content_type=file.content_type
+        await self._db.execute(
+            delete(StoredFile).where(StoredFile.id == stored_file.id)
         )
+        return True
 
-        self._db.add(stored_file)
-        await self._db.commit()
+    async def delete_object(self, stored_file: StoredFile) -> None:
+        # Uploads get a fresh key every time, nothing can have started using this one again
+        try:
+            await self._s3.delete_object(Bucket=stored_file.bucket, Key=stored_file.key)
+        except (BotoCoreError, ClientError) as e:
+            # The rows are already gone, an orphaned object is only wasted space
+            logger.warning("Could not delete %s: %s", stored_file.key, e)
 
-        return stored_file
+    async def download(self, stored_file: StoredFile, file: IO[bytes]) -> None:
+        # Streamed into the file one DOWNLOAD_CHUNK_SIZE piece at a time
+        response = await self._s3.get_object(
+            Bucket=stored_file.bucket, Key=stored_file.key
+        )
+        body = response["Body"]
+        async with body:
+            async for chunk in body.iter_chunks(S3Upload.DOWNLOAD_CHUNK_SIZE):
+                await asyncio.to_thread(file.write, chunk)
 
     async def generate_presigned_url(
         self, file: StoredFile, expiration: int = 60
@@ -1,16 +1,19 @@
 from datetime import datetime
-from io import BytesIO
-from typing import Optional
+from typing import AsyncIterable, Optional
 
-from pydantic import BaseModel, EmailStr, HttpUrl, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, HttpUrl, Field
 
 from job_agent.models import (
     Candidate,
     CandidateSocialLink,
     Resume,
+    ResumeProcessingStatus,
     CoverLetter,
     JobApplication,
+    JobApplicationStatus,
     JobListing,
+    ScrapeTask,
+    ScrapeTaskStatus,
     StoredFile,
 )
 
@@ -74,10 +77,23 @@ class ResumeDTO(BaseModel):
     id: int
     name: str
     created_at: datetime
+    processing_status: ResumeProcessingStatus
 
     @classmethod
     def from_model(cls, model: Resume) -> "ResumeDTO":
-        return cls(id=model.id, name=model.name, created_at=model.created_at)
+        return cls(
+            id=model.id,
+            name=model.name,
+            created_at=model.created_at,
+            processing_status=model.processing_status,
+        )
+
+
+class ResumeProcessingDTO(BaseModel):
+    resume_id: int
+    status: ResumeProcessingStatus
+    attempts: int
+    error: Optional[str]
 
 
 class CoverLetterDTO(BaseModel):
@@ -102,7 +118,8 @@ class CreateJobApplicationRequest(BaseModel):
 
 class JobApplicationDTO(BaseModel):
     id: int
-    job_listing: "JobListingDTO"
+    application_status: JobApplicationStatus
+    job_listing: Optional["JobListingSummaryDTO"]
     used_resume: Optional[ResumeDTO]
     used_cover_letter: Optional[CoverLetterDTO]
     notes: Optional[str]
@@ -111,7 +128,10 @@ class JobApplicationDTO(BaseModel):
     def from_model(cls, job_application: JobApplication):
         return cls(
             id=job_application.id,
-            job_listing=JobListingDTO.from_model(job_application.job_listing),
+            application_status=job_application.application_status,
+            job_listing=JobListingSummaryDTO.from_model(job_application.job_listing)
+            if job_application.job_listing
+            else None,
             used_resume=ResumeDTO.from_model(job_application.used_resume)
             if job_application.used_resume
             else None,
@@ -124,16 +144,51 @@ class JobApplicationDTO(BaseModel):
         )
 
 
-class JobListingDTO(BaseModel):
+class JobApplicationPageDTO(BaseModel):
+    items: list[JobApplicationDTO]
+    # Opaque, pass it back as `cursor` to get the next page. None on the last page
+    next_cursor: Optional[str]
+
+
+class UpdateJobApplicationStatusRequest(BaseModel):
+    application_status: JobApplicationStatus
+
+
+class JobApplicationStatsDTO(BaseModel):
+    # Every status is present, zero if the candidate has no applications in it
+    counts: dict[JobApplicationStatus, int]
+    total: int
+
+
+class JobListingSummaryDTO(BaseModel):
     id: int
     title: str
     application_url: str
     company: str
     source: Optional[str]
-    description: Optional[str]
     posted_at: Optional[datetime]
     scraped_at: datetime
     updated_at: datetime
+    closed_at: Optional[datetime] = None
+
+    @classmethod
+    def from_model(cls, job_listing: JobListing):
+        return cls(
+            id=job_listing.id,
+            title=job_listing.title,
+            application_url=job_listing.application_url,
+            company=job_listing.company,
+            source=job_listing.source,
+            posted_at=job_listing.posted_at,
+            scraped_at=job_listing.scraped_at,
+            updated_at=job_listing.updated_at,
+            closed_at=job_listing.closed_at,
+        )
+
+
+class JobListingDTO(JobListingSummaryDTO):
+    # Needs the listing loaded with undefer(JobListing.description)
+    description: Optional[str]
 
     @classmethod
     def from_model(cls, job_listing: JobListing):
@@ -147,21 +202,83 @@ class JobListingDTO(BaseModel):
             posted_at=job_listing.posted_at,
             scraped_at=job_listing.scraped_at,
             updated_at=job_listing.updated_at,
+            closed_at=job_listing.closed_at,
         )
 
 
+class JobListingPageDTO(BaseModel):
+    items: list[JobListingSummaryDTO]
+    # Opaque, pass it back as `cursor` to get the next page. None on the last page
+    next_cursor: Optional[str]
+
+
 class ScrapeJobListingRequest(BaseModel):
     job_url: HttpUrl
 
 
-class FileContent(BaseModel):
-    data: bytes
+class ScrapeJobListingsRequest(BaseModel):
+    job_urls: list[HttpUrl] = Field(min_length=1, max_length=1000)
+
+
+class ScrapeJobListingResultDTO(BaseModel):
+    job_url: str
+    job_listing: Optional[JobListingDTO] = None
+    error: Optional[str] = None
+
+
+class ScrapeTaskDTO(BaseModel):
+    id: int
+    job_url: str
+    status: ScrapeTaskStatus
+    attempts: int
+    error: Optional[str]
+    job_listing: Optional[JobListingSummaryDTO]
+    created_at: datetime
+    finished_at: Optional[datetime]
+
+    @classmethod
+    def from_model(cls, task: ScrapeTask) -> "ScrapeTaskDTO":
+        return cls(
+            id=task.id,
+            job_url=task.job_url,
+            status=task.status,
+            attempts=task.attempts,
+            error=task.error,
+            job_listing=JobListingSummaryDTO.from_model(task.job_listing)
+            if task.job_listing_id is not None
+            else None,
+            created_at=task.created_at,
+            finished_at=task.finished_at,
+        )
+
+
+class JobImportErrorDTO(BaseModel):
+    line: int
+    error: str
+
+
+class JobImportResultDTO(BaseModel):
+    imported: int
+    # Valid rows for listings that already existed (or came earlier in the file), left as they were
+    skipped: int
+    failed: int
+    # Capped, `failed` has the full count
+    errors: list[JobImportErrorDTO]
+
+
+class FileUpload(BaseModel):
+    # The file as it's read off the request, it can only be iterated once
     content_type: str
+    chunks: AsyncIterable[bytes]
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
 
 
 class UploadResumeRequest(BaseModel):
     name: str
-    file: FileContent
+    file: FileUpload
+    # Return once the file is stored, the text is extracted afterwards by the resume workers
+    process_in_background: bool = False
 
 
 class UpdateCandidatePersonalInfoRequest(BaseModel):
@@ -192,7 +309,7 @@ class PresignedUrlDTO(BaseModel):
 
 
 class CreateJobRequest(BaseModel):
-    title: str
-    company: str
-    application_url: str
+    title: str = Field(max_length=500)
+    company: str = Field(max_length=500)
+    application_url: str = Field(max_length=500)
     description: Optional[str] = None
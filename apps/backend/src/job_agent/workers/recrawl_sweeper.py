@@ -0,0 +1,152 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from job_agent.scrape.job_scraper import HiringCafeJobScraper
+from job_agent.services.job_listing_service import JobService
+
+
+@dataclass
+class RecrawlStats:
+    sweeping: bool
+    sweeps_completed: int
+    checked: int
+    changed: int
+    unchanged: int
+    closed: int
+    failed: int
+    current_sweep_checked: int
+    last_sweep_started_at: Optional[datetime]
+    last_sweep_finished_at: Optional[datetime]
+    # Listings still past max age after the last sweep (failures, or more than a sweep can get through)
+    stale_listings: int
+    max_lag_seconds: Optional[float]
+
+
+class RecrawlSweeper:
+    """
+    Periodically re-scrapes hiring.cafe listings older than max_age_seconds, in batches
+    and at no more than rate_per_second, so closed or edited postings don't stay stale.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        job_scraper_factory: Callable[[], HiringCafeJobScraper],
+        max_age_seconds: float = 24 * 60 * 60,
+        batch_size: int = 50,
+        rate_per_second: float = 1,
+        interval_seconds: float = 15 * 60,
+        scrape_concurrency: Optional[int] = None,
+    ):
+        self._session_maker = session_maker
+        self._job_scraper_factory = job_scraper_factory
+        self._max_age = timedelta(seconds=max_age_seconds)
+        self._batch_size = batch_size
+        self._rate_per_second = rate_per_second
+        self._interval_seconds = interval_seconds
+        self._scrape_concurrency = scrape_concurrency
+        self._task: Optional[asyncio.Task] = None
+
+        self._sweeping = False
+        self._sweeps_completed = 0
+        self._checked = 0
+        self._changed = 0
+        self._unchanged = 0
+        self._closed = 0
+        self._failed = 0
+        self._current_sweep_checked = 0
+        self._last_sweep_started_at: Optional[datetime] = None
+        self._last_sweep_finished_at: Optional[datetime] = None
+        self._stale_listings = 0
+        self._oldest_scraped_at: Optional[datetime] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.sweep()
+            except Exception:
+                logging.exception("Re-crawl sweep failed")
+            await asyncio.sleep(self._interval_seconds)
+
+    async def sweep(self) -> None:
+        started_at = datetime.utcnow()
+        stale_before = started_at - self._max_age
+        self._sweeping = True
+        self._current_sweep_checked = 0
+        self._last_sweep_started_at = started_at
+
+        try:
+            after_id = 0
+            while True:
+                batch_started = time.monotonic()
+                async with self._session_maker() as db:
+                    batch = await self._job_service(db).refresh_stale_jobs(
+                        stale_before, after_id, self._batch_size
+                    )
+                if batch.last_id is None:
+                    break
+
+                after_id = batch.last_id
+                self._current_sweep_checked += batch.checked
+                self._checked += batch.checked
+                self._changed += batch.changed
+                self._unchanged += batch.unchanged
+                self._closed += batch.closed
+                self._failed += batch.failed
+
+                # Spread the batch's requests out so a sweep never crowds out user scrapes
+                elapsed = time.monotonic() - batch_started
+                await asyncio.sleep(
+                    max(batch.checked / self._rate_per_second - elapsed, 0)
+                )
+
+            async with self._session_maker() as db:
+                (
+                    self._stale_listings,
+                    self._oldest_scraped_at,
+                ) = await self._job_service(db).get_stale_job_backlog(stale_before)
+            self._sweeps_completed += 1
+            self._last_sweep_finished_at = datetime.utcnow()
+        finally:
+            self._sweeping = False
+
+    def stats(self) -> RecrawlStats:
+        max_lag_seconds = None
+        if self._oldest_scraped_at is not None:
+            max_lag_seconds = (
+                datetime.utcnow() - self._oldest_scraped_at
+            ).total_seconds()
+
+        return RecrawlStats(
+            sweeping=self._sweeping,
+            sweeps_completed=self._sweeps_completed,
+            checked=self._checked,
+            changed=self._changed,
+            unchanged=self._unchanged,
+            closed=self._closed,
+            failed=self._failed,
+            current_sweep_checked=self._current_sweep_checked,
+            last_sweep_started_at=self._last_sweep_started_at,
+            last_sweep_finished_at=self._last_sweep_finished_at,
+            stale_listings=self._stale_listings,
+            max_lag_seconds=max_lag_seconds,
+        )
+
+    def _job_service(self, db: AsyncSession) -> JobService:
+        return JobService(db, self._job_scraper_factory(), self._scrape_concurrency)
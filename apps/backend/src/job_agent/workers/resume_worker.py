@@ -0,0 +1,187 @@
+import asyncio
+import logging
+from contextlib import AbstractAsyncContextManager
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from types_aiobotocore_s3.client import S3Client
+
+from job_agent.models import Resume, ResumeProcessingStatus
+from job_agent.pdf_extraction import PdfTextExtractor
+from job_agent.services.resume_service import ResumeService
+from job_agent.services.s3_file_uploader import S3FileUploader
+
+
+class ResumeWorkerPool:
+    """
+    Extracts the text of resumes uploaded without waiting for it, with a fixed number of workers.
+    The queue is the resume table itself, pending resumes survive restarts and several processes
+    can share them.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        s3_client_factory: Callable[[], AbstractAsyncContextManager[S3Client]],
+        bucket_name: str,
+        pdf_extractor: PdfTextExtractor,
+        concurrency: int = 2,
+        poll_interval_seconds: float = 1.0,
+        lease_seconds: float = 2 * 60,
+        max_attempts: int = 3,
+    ):
+        self._session_maker = session_maker
+        self._s3_client_factory = s3_client_factory
+        self._bucket_name = bucket_name
+        self._pdf_extractor = pdf_extractor
+        self._concurrency = concurrency
+        self._poll_interval_seconds = poll_interval_seconds
+        self._lease = timedelta(seconds=lease_seconds)
+        self._max_attempts = max_attempts
+        self._wake = asyncio.Event()
+        self._workers: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        self._workers = [
+            asyncio.create_task(self._run()) for _ in range(self._concurrency)
+        ]
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def notify(self) -> None:
+        # Workers poll anyway, this just saves new uploads from waiting out the poll interval
+        self._wake.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                claimed = await self._claim()
+            except Exception:
+                logging.exception("Failed to claim a resume to process")
+                claimed = None
+
+            if claimed is None:
+                await self._wait()
+            else:
+                await self._process(*claimed)
+
+    async def _wait(self) -> None:
+        try:
+            await asyncio.wait_for(self._wake.wait(), self._poll_interval_seconds)
+        except asyncio.TimeoutError:
+            pass
+        self._wake.clear()
+
+    async def _claim(self) -> Optional[tuple[int, int]]:
+        # The resume id and the attempt it was claimed as, which later writes are guarded on
+        async with self._session_maker() as db:
+            now = datetime.utcnow()
+            lease_expired = and_(
+                Resume.processing_status == ResumeProcessingStatus.PROCESSING,
+                Resume.processing_lease_expires_at < now,
+            )
+
+            # Resumes whose worker keeps dying on them are given up on
+            await db.execute(
+                update(Resume)
+                .where(lease_expired, Resume.processing_attempts >= self._max_attempts)
+                .values(
+                    processing_status=ResumeProcessingStatus.FAILED,
+                    processing_error=f"Gave up after {self._max_attempts} attempts",
+                    processing_lease_expires_at=None,
+                    updated_at=now,
+                )
+            )
+
+            claimable = or_(
+                Resume.processing_status == ResumeProcessingStatus.PENDING,
+                lease_expired,
+            )
+            while True:
+                row = (
+                    await db.execute(
+                        select(Resume.id, Resume.processing_attempts)
+                        .where(claimable)
+                        .order_by(Resume.id)
+                        .limit(1)
+                        .with_for_update(skip_locked=True)
+                    )
+                ).one_or_none()
+                if row is None:
+                    await db.commit()
+                    return None
+                resume_id, attempts = row
+
+                # Guarded so two workers can never both win the same resume, even where SKIP LOCKED isn't supported
+                result = await db.execute(
+                    update(Resume)
+                    .where(
+                        Resume.id == resume_id,
+                        Resume.processing_attempts == attempts,
+                        claimable,
+                    )
+                    .values(
+                        processing_status=ResumeProcessingStatus.PROCESSING,
+                        processing_attempts=Resume.processing_attempts + 1,
+                        processing_lease_expires_at=now + self._lease,
+                        updated_at=now,
+                    )
+                )
+                await db.commit()
+                if result.rowcount:
+                    return resume_id, attempts + 1
+
+    async def _process(self, resume_id: int, attempt: int) -> None:
+        try:
+            async with (
+                self._session_maker() as db,
+                self._s3_client_factory() as s3_client,
+            ):
+                s3_file_uploader = S3FileUploader(db, s3_client, self._bucket_name)
+                processed = await ResumeService(
+                    db, s3_file_uploader, self._pdf_extractor
+                ).process_resume(resume_id, attempt)
+            if not processed:
+                logging.warning(
+                    f"Dropped the result for resume {resume_id}, its claim was lost"
+                )
+        except asyncio.CancelledError:
+            # Shutting down, hand the resume back instead of waiting for its lease to expire
+            await asyncio.shield(self._release(resume_id, attempt, count_attempt=False))
+            raise
+        except Exception:
+            logging.exception(f"Processing resume {resume_id} failed")
+            await self._release(resume_id, attempt, count_attempt=True)
+
+    async def _release(self, resume_id: int, attempt: int, count_attempt: bool) -> None:
+        try:
+            async with self._session_maker() as db:
+                resume = await db.get(Resume, resume_id)
+                if (
+                    resume is None
+                    or resume.processing_status != ResumeProcessingStatus.PROCESSING
+                    or resume.processing_attempts != attempt
+                ):
+                    return
+
+                now = datetime.utcnow()
+                if not count_attempt:
+                    resume.processing_attempts -= 1
+                if resume.processing_attempts >= self._max_attempts:
+                    resume.processing_status = ResumeProcessingStatus.FAILED
+                    resume.processing_error = (
+                        f"Gave up after {self._max_attempts} attempts"
+                    )
+                else:
+                    resume.processing_status = ResumeProcessingStatus.PENDING
+                resume.processing_lease_expires_at = None
+                resume.updated_at = now
+                await db.commit()
+        except Exception:
+            logging.exception(f"Failed to release resume {resume_id}")
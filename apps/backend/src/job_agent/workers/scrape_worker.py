@@ -0,0 +1,156 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from job_agent.models import ScrapeTask, ScrapeTaskStatus
+from job_agent.scrape.job_scraper import HiringCafeJobScraper
+from job_agent.services.job_listing_service import JobService
+
+
+class ScrapeWorkerPool:
+    """
+    Drains the scrape_task table with a fixed number of workers. The queue lives in
+    the database, so tasks survive restarts and several processes can share it.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        job_scraper_factory: Callable[[], HiringCafeJobScraper],
+        concurrency: int = 4,
+        poll_interval_seconds: float = 1.0,
+        lease_seconds: float = 5 * 60,
+        max_attempts: int = 3,
+    ):
+        self._session_maker = session_maker
+        self._job_scraper_factory = job_scraper_factory
+        self._concurrency = concurrency
+        self._poll_interval_seconds = poll_interval_seconds
+        self._lease = timedelta(seconds=lease_seconds)
+        self._max_attempts = max_attempts
+        self._wake = asyncio.Event()
+        self._workers: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        self._workers = [
+            asyncio.create_task(self._run()) for _ in range(self._concurrency)
+        ]
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def notify(self) -> None:
+        # Workers poll anyway, this just saves new tasks from waiting out the poll interval
+        self._wake.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                task_id = await self._claim()
+            except Exception:
+                logging.exception("Failed to claim a scrape task")
+                task_id = None
+
+            if task_id is None:
+                await self._wait()
+            else:
+                await self._process(task_id)
+
+    async def _wait(self) -> None:
+        try:
+            await asyncio.wait_for(self._wake.wait(), self._poll_interval_seconds)
+        except asyncio.TimeoutError:
+            pass
+        self._wake.clear()
+
+    async def _claim(self) -> Optional[int]:
+        async with self._session_maker() as db:
+            now = datetime.utcnow()
+            lease_expired = and_(
+                ScrapeTask.status == ScrapeTaskStatus.RUNNING,
+                ScrapeTask.lease_expires_at < now,
+            )
+
+            # Tasks whose worker keeps dying on them are given up on
+            await db.execute(
+                update(ScrapeTask)
+                .where(lease_expired, ScrapeTask.attempts >= self._max_attempts)
+                .values(
+                    status=ScrapeTaskStatus.FAILED,
+                    error=f"Gave up after {self._max_attempts} attempts",
+                    lease_expires_at=None,
+                    finished_at=now,
+                    updated_at=now,
+                )
+            )
+
+            claimable = or_(ScrapeTask.status == ScrapeTaskStatus.QUEUED, lease_expired)
+            while True:
+                task_id = await db.scalar(
+                    select(ScrapeTask.id)
+                    .where(claimable)
+                    .order_by(ScrapeTask.id)
+                    .limit(1)
+                    .with_for_update(skip_locked=True)
+                )
+                if task_id is None:
+                    await db.commit()
+                    return None
+
+                # Guarded so two workers can never both win the same task, even where SKIP LOCKED isn't supported
+                result = await db.execute(
+                    update(ScrapeTask)
+                    .where(ScrapeTask.id == task_id, claimable)
+                    .values(
+                        status=ScrapeTaskStatus.RUNNING,
+                        attempts=ScrapeTask.attempts + 1,
+                        lease_expires_at=now + self._lease,
+                        updated_at=now,
+                    )
+                )
+                await db.commit()
+                if result.rowcount:
+                    return task_id
+
+    async def _process(self, task_id: int) -> None:
+        try:
+            async with self._session_maker() as db:
+                await JobService(db, self._job_scraper_factory()).run_scrape_task(
+                    task_id
+                )
+        except asyncio.CancelledError:
+            # Shutting down, hand the task back instead of waiting for its lease to expire
+            await asyncio.shield(self._release(task_id, count_attempt=False))
+            raise
+        except Exception:
+            logging.exception(f"Scrape task {task_id} failed")
+            await self._release(task_id, count_attempt=True)
+
+    async def _release(self, task_id: int, count_attempt: bool) -> None:
+        try:
+            async with self._session_maker() as db:
+                task = await db.get(ScrapeTask, task_id)
+                if task is None or task.status != ScrapeTaskStatus.RUNNING:
+                    return
+
+                now = datetime.utcnow()
+                if not count_attempt:
+                    task.attempts -= 1
+                if task.attempts >= self._max_attempts:
+                    task.status = ScrapeTaskStatus.FAILED
+                    task.error = f"Gave up after {self._max_attempts} attempts"
+                    task.finished_at = now
+                else:
+                    task.status = ScrapeTaskStatus.QUEUED
+                task.lease_expires_at = None
+                task.updated_at = now
+                await db.commit()
+        except Exception:
+            logging.exception(f"Failed to release scrape task {task_id}")
@@ -2,6 +2,7 @@
 from typing import AsyncGenerator
 import asyncio
 import aioboto3
+import aiohttp
 import botocore
 import pytest
 import pytest_asyncio
@@ -17,7 +18,10 @@ from types_aiobotocore_s3.client import S3Client
 
 from job_agent.models import (
     Base,
+    Candidate,
 )
+from job_agent.pdf_extraction import PdfExtractorConfig, PdfTextExtractor
+from job_agent.services.resume_service import ResumeService
 from job_agent.services.s3_file_uploader import S3FileUploader
 
 POSTGRES_IMAGE = "postgres:16"
@@ -267,7 +271,49 @@ async def db_session(db_connection):
         yield session
 
 
+@pytest_asyncio.fixture(scope="function")
+async def http_session() -> AsyncGenerator[aiohttp.ClientSession, None]:
+    async with aiohttp.ClientSession() as session:
+        yield session
+
+
 @pytest.fixture
 def sample_resume() -> bytes:
     with open("tests/data/resume-sample.pdf", "rb") as f:
         return f.read()
+
+
+@pytest.fixture
+def pdf_extractor():
+    extractor = PdfTextExtractor(PdfExtractorConfig(workers=1))
+    yield extractor
+    extractor.close()
+
+
+@pytest.fixture
+def resume_service(db_session, s3_file_uploader, pdf_extractor) -> ResumeService:
+    return ResumeService(db_session, s3_file_uploader, pdf_extractor)
+
+
+@pytest.fixture
+def add_candidate(db_session):
+    """Adds candidates with everything but the email fixed, flushed so they have ids."""
+
+    async def add(email: str = "jane@example.com") -> Candidate:
+        candidate = Candidate(
+            first_name="Jane",
+            last_name="Doe",
+            phone="1234567890",
+            email=email,
+            hashed_password="hashed",
+        )
+        db_session.add(candidate)
+        await db_session.flush()
+        return candidate
+
+    return add
+
+
+@pytest.fixture
+async def candidate(add_candidate) -> Candidate:
+    return await add_candidate()
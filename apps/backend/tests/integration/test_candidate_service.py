@@ -16,7 +16,6 @@ from job_agent.services.schemas import (
     CandidateLoginRequest,
     AddOrUpdateSocialRequest,
     UploadResumeRequest,
-    FileContent,
 )
 from job_agent.models import Candidate, CandidateSocialLink
 from job_agent.services.exceptions import (
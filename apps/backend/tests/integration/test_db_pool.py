@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from job_agent.db_pool import DbPoolConfig, DbPoolMetrics, create_db_engine
+
+
+@pytest.mark.asyncio
+async def test_db_pool__should_record_waits_and_timeouts(db_engine, caplog):
+    # Arrange
+    config = DbPoolConfig(
+        pool_size=1, max_overflow=1, timeout=0.3, slow_checkout_seconds=0.05
+    )
+    metrics = DbPoolMetrics(config)
+    engine = create_db_engine(
+        db_engine.url.render_as_string(hide_password=False), config, metrics
+    )
+
+    async def hold_connection(seconds: float):
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await asyncio.sleep(seconds)
+
+    # Act
+    try:
+        holders = [asyncio.create_task(hold_connection(0.2)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        await hold_connection(0)
+        await asyncio.gather(*holders)
+        # Two fit in the pool, the third times out waiting for them
+        results = await asyncio.gather(
+            *(hold_connection(0.5) for _ in range(3)), return_exceptions=True
+        )
+        # Read while the pool is still live, dispose() closes it
+        stats = metrics.stats()
+    finally:
+        await engine.dispose()
+
+    # Assert
+    errors = [result for result in results if isinstance(result, BaseException)]
+    assert len(errors) == 1
+    assert isinstance(errors[0], PoolTimeoutError)
+    assert stats.checked_out == 0
+    assert stats.peak_checked_out == 2
+    assert stats.overflow_checkouts > 0
+    assert stats.timeouts == 1
+    assert stats.slow_checkouts > 0
+    assert stats.wait_seconds_max >= 0.05
+    assert "Waited" in caplog.text
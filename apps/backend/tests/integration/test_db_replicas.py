@@ -0,0 +1,118 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy import NullPool, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from job_agent.db_pool import DbPoolConfig, DbPoolMetrics, create_db_engine
+from job_agent.db_replicas import ReplicaRouter
+
+
+@pytest_asyncio.fixture
+async def session_makers(db_engine):
+    url = db_engine.url.render_as_string(hide_password=False)
+    # Nothing listens on port 1, connecting fails straight away
+    down_url = db_engine.url.set(host="127.0.0.1", port=1).render_as_string(
+        hide_password=False
+    )
+    engines = {
+        name: create_async_engine(
+            down_url if name == "down" else url,
+            poolclass=NullPool,
+            connect_args={"timeout": 2},
+        )
+        for name in ("primary", "replica-1", "replica-2", "down")
+    }
+    try:
+        yield {
+            name: async_sessionmaker(bind=engine) for name, engine in engines.items()
+        }
+    finally:
+        for engine in engines.values():
+            await engine.dispose()
+
+
+async def _read_from(router: ReplicaRouter, session_makers, force_primary=False) -> str:
+    async with router.read_session(force_primary) as session:
+        await session.execute(text("SELECT 1"))
+        return next(
+            name
+            for name, session_maker in session_makers.items()
+            if session_maker.kw["bind"] is session.bind
+        )
+
+
+@pytest.mark.asyncio
+async def test_read_session__should_round_robin_and_fail_over(session_makers, caplog):
+    # Arrange
+    now = 0.0
+    router = ReplicaRouter(
+        session_makers["primary"],
+        {name: session_makers[name] for name in ("replica-1", "down", "replica-2")},
+        failure_cooldown_seconds=30,
+        clock=lambda: now,
+    )
+
+    # Act
+    reads = [await _read_from(router, session_makers) for _ in range(4)]
+    pinned = await _read_from(router, session_makers, force_primary=True)
+    now += 31
+    [await _read_from(router, session_makers) for _ in range(3)]
+
+    # Assert
+    assert reads == ["replica-1", "replica-2", "replica-2", "replica-1"]
+    assert pinned == "primary"
+    assert "Read replica" in caplog.text
+    stats = router.stats()
+    assert stats.pinned_reads == 1
+    assert stats.failovers == 2
+    assert [(replica.name, replica.healthy) for replica in stats.replicas] == [
+        ("replica-1", True),
+        ("down", False),
+        ("replica-2", True),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_read_session__should_use_primary__without_replicas(session_makers):
+    # Arrange
+    router = ReplicaRouter(session_makers["primary"], {})
+
+    # Act
+    read = await _read_from(router, session_makers)
+
+    # Assert
+    assert read == "primary"
+    assert router.stats().primary_reads == 1
+
+
+@pytest.mark.asyncio
+async def test_read_session__should_report_replica_pool_stats(
+    db_engine, session_makers
+):
+    # Arrange
+    config = DbPoolConfig(pool_size=1, max_overflow=0)
+    metrics = DbPoolMetrics(config)
+    engine = create_db_engine(
+        db_engine.url.render_as_string(hide_password=False), config, metrics
+    )
+    router = ReplicaRouter(
+        session_makers["primary"],
+        {
+            "replica": async_sessionmaker(bind=engine),
+            "other": session_makers["replica-1"],
+        },
+        pool_metrics={"replica": metrics},
+    )
+
+    # Act
+    try:
+        async with router.read_session() as session:
+            await session.execute(text("SELECT 1"))
+        stats = router.stats()
+    finally:
+        await engine.dispose()
+
+    # Assert
+    assert stats.replicas[0].pool.checkouts == 1
+    assert stats.replicas[0].pool.checked_out == 0
+    assert stats.replicas[1].pool is None
@@ -0,0 +1,394 @@
+import pytest
+from sqlalchemy import event, func, select
+
+from job_agent.models import (
+    Candidate,
+    CoverLetter,
+    JobApplication,
+    JobApplicationStatus,
+    JobListing,
+    Resume,
+    StoredFile,
+)
+from job_agent.services.exceptions import (
+    CandidateNotFoundException,
+    CoverLetterNotFoundException,
+    InvalidCursorException,
+    JobApplicationConflictException,
+    JobApplicationNotFoundException,
+    JobListingNotFoundException,
+    ResumeNotFoundException,
+)
+from job_agent.services.job_application_service import JobApplicationService
+from job_agent.services.schemas import (
+    CreateJobApplicationRequest,
+    UpdateJobApplicationStatusRequest,
+)
+
+
+@pytest.fixture
+def service(db_session):
+    return JobApplicationService(db_session)
+
+
+@pytest.fixture
+def add_applicant(db_session, add_candidate):
+    async def add(email: str) -> tuple[Candidate, Resume, CoverLetter]:
+        candidate = await add_candidate(email)
+        resume = Resume(
+            name="Resume",
+            stored_file=StoredFile(key=f"resumes/{email}", bucket="test-bucket"),
+            text_content="Resume text",
+            candidate=candidate,
+        )
+        cover_letter = CoverLetter(
+            name="Cover letter", key=f"letters/{email}", candidate=candidate
+        )
+        db_session.add_all([resume, cover_letter])
+        await db_session.flush()
+        return candidate, resume, cover_letter
+
+    return add
+
+
+async def _add_job_listing(db_session, number: int) -> JobListing:
+    job_listing = JobListing(
+        title="Software Engineer",
+        company="Software Corp",
+        application_url=f"https://example.com/jobs/{number}",
+    )
+    db_session.add(job_listing)
+    await db_session.flush()
+    return job_listing
+
+
+@pytest.fixture
+async def job_listing(db_session):
+    return await _add_job_listing(db_session, 0)
+
+
+@pytest.mark.asyncio
+async def test_create_job_application__should_insert_by_ids__when_references_valid(
+    service, db_session, add_applicant, job_listing
+):
+    # Arrange
+    candidate, resume, cover_letter = await add_applicant("jane@example.com")
+    request = CreateJobApplicationRequest(
+        job_listing_id=job_listing.id,
+        resume_id=resume.id,
+        cover_letter_id=cover_letter.id,
+    )
+
+    # Act
+    dto = await service.create_job_application(candidate.id, request)
+
+    # Assert
+    assert dto.job_listing.id == job_listing.id
+    assert dto.used_resume.id == resume.id
+    assert dto.used_cover_letter.id == cover_letter.id
+    db_application = await db_session.get(JobApplication, dto.id)
+    assert db_application.candidate_id == candidate.id
+    assert db_application.used_cover_letter_id == cover_letter.id
+
+
+@pytest.mark.asyncio
+async def test_create_job_application__should_use_same_queries__regardless_of_history(
+    service, db_session, add_applicant, job_listing
+):
+    # Arrange
+    candidate, resume, _ = await add_applicant("jane@example.com")
+    job_listings = [await _add_job_listing(db_session, i) for i in range(1, 23)]
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    async def apply(job_listing: JobListing):
+        await service.create_job_application(
+            candidate.id,
+            CreateJobApplicationRequest(
+                job_listing_id=job_listing.id, resume_id=resume.id
+            ),
+        )
+
+    sync_engine = db_session.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", record)
+
+    # Act
+    try:
+        await apply(job_listings[0])
+        first = len(statements)
+        for job_listing in job_listings[1:-1]:
+            await apply(job_listing)
+        statements.clear()
+        await apply(job_listings[-1])
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", record)
+
+    # Assert
+    # Validate, insert, bump the status count
+    assert len(statements) == first == 3
+    count = await db_session.scalar(
+        select(func.count())
+        .select_from(JobApplication)
+        .where(JobApplication.candidate_id == candidate.id)
+    )
+    assert count == 22
+
+
+@pytest.mark.asyncio
+async def test_create_job_application__should_raise_conflict__when_already_applied(
+    service, db_session, add_applicant, job_listing
+):
+    # Arrange
+    candidate, resume, _ = await add_applicant("jane@example.com")
+    request = CreateJobApplicationRequest(
+        job_listing_id=job_listing.id, resume_id=resume.id
+    )
+    await service.create_job_application(candidate.id, request)
+
+    # Act / Assert
+    with pytest.raises(JobApplicationConflictException):
+        await service.create_job_application(candidate.id, request)
+
+    count = await db_session.scalar(
+        select(func.count())
+        .select_from(JobApplication)
+        .where(JobApplication.candidate_id == candidate.id)
+    )
+    assert count == 1
+
+
+@pytest.mark.asyncio
+async def test_create_job_application__should_raise__when_references_missing_or_not_owned(
+    service, db_session, add_applicant, job_listing
+):
+    # Arrange
+    candidate, resume, cover_letter = await add_applicant("jane@example.com")
+    other, other_resume, other_cover_letter = await add_applicant("john@example.com")
+
+    # Act / Assert
+    with pytest.raises(CandidateNotFoundException):
+        await service.create_job_application(
+            999999,
+            CreateJobApplicationRequest(
+                job_listing_id=job_listing.id, resume_id=resume.id
+            ),
+        )
+    with pytest.raises(JobListingNotFoundException):
+        await service.create_job_application(
+            candidate.id,
+            CreateJobApplicationRequest(job_listing_id=999999, resume_id=resume.id),
+        )
+    with pytest.raises(ResumeNotFoundException):
+        await service.create_job_application(
+            candidate.id,
+            CreateJobApplicationRequest(
+                job_listing_id=job_listing.id, resume_id=other_resume.id
+            ),
+        )
+    with pytest.raises(CoverLetterNotFoundException):
+        await service.create_job_application(
+            candidate.id,
+            CreateJobApplicationRequest(
+                job_listing_id=job_listing.id,
+                resume_id=resume.id,
+                cover_letter_id=other_cover_letter.id,
+            ),
+        )
+
+
+@pytest.mark.asyncio
+async def test_list_job_applications__should_page_newest_first_in_one_query(
+    service, db_session, add_applicant
+):
+    # Arrange
+    candidate, resume, cover_letter = await add_applicant("jane@example.com")
+    other, other_resume, _ = await add_applicant("john@example.com")
+    job_listings = [await _add_job_listing(db_session, i) for i in range(5)]
+    for job_listing in job_listings:
+        await service.create_job_application(
+            candidate.id,
+            CreateJobApplicationRequest(
+                job_listing_id=job_listing.id,
+                resume_id=resume.id,
+                cover_letter_id=cover_letter.id,
+            ),
+        )
+    await service.create_job_application(
+        other.id,
+        CreateJobApplicationRequest(
+            job_listing_id=job_listings[0].id, resume_id=other_resume.id
+        ),
+    )
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    sync_engine = db_session.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", record)
+
+    # Act
+    try:
+        first_page = await service.list_job_applications(candidate.id, limit=3)
+        first_page_statements = len(statements)
+        second_page = await service.list_job_applications(
+            candidate.id, cursor=first_page.next_cursor, limit=3
+        )
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", record)
+
+    # Assert
+    assert first_page_statements == 1
+    assert len(statements) == 2
+    items = first_page.items + second_page.items
+    assert [item.job_listing.id for item in items] == [
+        job_listing.id for job_listing in reversed(job_listings)
+    ]
+    assert first_page.next_cursor is not None
+    assert second_page.next_cursor is None
+    assert items[0].used_resume.name == "Resume"
+    assert items[0].used_cover_letter.id == cover_letter.id
+    assert items[0].application_status == JobApplicationStatus.PENDING
+
+
+@pytest.mark.asyncio
+async def test_list_job_applications__should_filter_by_status(
+    service, db_session, add_applicant
+):
+    # Arrange
+    candidate, resume, _ = await add_applicant("jane@example.com")
+    job_listings = [await _add_job_listing(db_session, i) for i in range(3)]
+    applications = [
+        await service.create_job_application(
+            candidate.id,
+            CreateJobApplicationRequest(
+                job_listing_id=job_listing.id, resume_id=resume.id
+            ),
+        )
+        for job_listing in job_listings
+    ]
+    applied = await db_session.get(JobApplication, applications[1].id)
+    applied.application_status = JobApplicationStatus.APPLIED
+    await db_session.flush()
+
+    # Act
+    page = await service.list_job_applications(
+        candidate.id, statuses=[JobApplicationStatus.APPLIED]
+    )
+
+    # Assert
+    assert [item.id for item in page.items] == [applications[1].id]
+    assert page.items[0].application_status == JobApplicationStatus.APPLIED
+
+
+@pytest.mark.asyncio
+async def test_list_job_applications__should_include_applications__without_a_listing(
+    service, db_session, add_applicant, job_listing
+):
+    # Arrange
+    candidate, resume, _ = await add_applicant("jane@example.com")
+    application = await service.create_job_application(
+        candidate.id,
+        CreateJobApplicationRequest(job_listing_id=job_listing.id, resume_id=resume.id),
+    )
+    orphaned = await db_session.get(JobApplication, application.id)
+    orphaned.job_listing_id = None
+    await db_session.flush()
+
+    # Act
+    page = await service.list_job_applications(candidate.id)
+    stats = await service.get_job_application_stats(candidate.id)
+
+    # Assert
+    assert [item.id for item in page.items] == [application.id]
+    assert page.items[0].job_listing is None
+    assert page.items[0].used_resume.id == resume.id
+    assert stats.total == len(page.items)
+
+
+@pytest.mark.asyncio
+async def test_list_job_applications__should_raise__when_cursor_invalid(service):
+    # Act / Assert
+    with pytest.raises(InvalidCursorException):
+        await service.list_job_applications(1, cursor="not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_job_application_stats__should_follow_creates_and_status_changes(
+    service, db_session, add_applicant
+):
+    # Arrange
+    candidate, resume, _ = await add_applicant("jane@example.com")
+    job_listings = [await _add_job_listing(db_session, i) for i in range(3)]
+    applications = [
+        await service.create_job_application(
+            candidate.id,
+            CreateJobApplicationRequest(
+                job_listing_id=job_listing.id, resume_id=resume.id
+            ),
+        )
+        for job_listing in job_listings
+    ]
+
+    # Act
+    updated = await service.update_job_application_status(
+        candidate.id,
+        applications[0].id,
+        UpdateJobApplicationStatusRequest(
+            application_status=JobApplicationStatus.INTERVIEWING
+        ),
+    )
+    await service.update_job_application_status(
+        candidate.id,
+        applications[0].id,
+        UpdateJobApplicationStatusRequest(
+            application_status=JobApplicationStatus.INTERVIEWING
+        ),
+    )
+    stats = await service.get_job_application_stats(candidate.id)
+
+    # Assert
+    assert updated.application_status == JobApplicationStatus.INTERVIEWING
+    assert updated.job_listing.id == job_listings[0].id
+    assert stats.counts[JobApplicationStatus.PENDING] == 2
+    assert stats.counts[JobApplicationStatus.INTERVIEWING] == 1
+    assert stats.counts[JobApplicationStatus.OFFERED] == 0
+    assert stats.total == 3
+
+    actual = await db_session.execute(
+        select(JobApplication.application_status, func.count())
+        .where(JobApplication.candidate_id == candidate.id)
+        .group_by(JobApplication.application_status)
+    )
+    assert {status: count for status, count in stats.counts.items() if count} == dict(
+        actual.tuples().all()
+    )
+
+
+@pytest.mark.asyncio
+async def test_update_job_application_status__should_raise__when_not_owned(
+    service, db_session, add_applicant, job_listing
+):
+    # Arrange
+    candidate, resume, _ = await add_applicant("jane@example.com")
+    other, _, _ = await add_applicant("john@example.com")
+    application = await service.create_job_application(
+        candidate.id,
+        CreateJobApplicationRequest(job_listing_id=job_listing.id, resume_id=resume.id),
+    )
+
+    # Act / Assert
+    with pytest.raises(JobApplicationNotFoundException):
+        await service.update_job_application_status(
+            other.id,
+            application.id,
+            UpdateJobApplicationStatusRequest(
+                application_status=JobApplicationStatus.APPLIED
+            ),
+        )
+
+    stats = await service.get_job_application_stats(candidate.id)
+    assert stats.counts[JobApplicationStatus.PENDING] == 1
+    assert (await service.get_job_application_stats(other.id)).total == 0
@@ -1,17 +1,34 @@
 import pytest
-from datetime import datetime
+from datetime import datetime, timedelta
 from pydantic import HttpUrl
+from sqlalchemy import select, func
+from sqlalchemy.orm import undefer
 
+from job_agent.services.job_import import JobImportFormat
 from job_agent.services.job_listing_service import (
+    JobImportService,
     JobService,
 )
-from job_agent.services.schemas import JobListingDTO, ScrapeJobListingRequest
+from job_agent.services.schemas import (
+    JobListingDTO,
+    ScrapeJobListingRequest,
+    ScrapeJobListingsRequest,
+    CreateJobRequest,
+)
 from job_agent.models import JobListing
-from job_agent.services.exceptions import UnsupportedJobUrlException
+from job_agent.scrape.job_scraper import HiringCafeJobScraper
+from job_agent.services.exceptions import (
+    InvalidCursorException,
+    JobListingNotFoundException,
+    UnsupportedJobUrlException,
+)
 
 
-class MockScraper:
+class MockScraper(HiringCafeJobScraper):
     async def scrape_job(self, job_id: str) -> JobListing:
+        if job_id == "missing":
+            raise KeyError("pageProps")
+
         return JobListing(
             title="Software Engineer",
             company="Software Corp",
@@ -24,8 +41,8 @@ class MockScraper:
 
 
 @pytest.fixture
-def job_scraper():
-    return MockScraper()
+def job_scraper(http_session):
+    return MockScraper(http_session)
 
 
 @pytest.fixture
@@ -33,6 +50,16 @@ def job_service(db_session, job_scraper):
     return JobService(db_session, job_scraper)
 
 
+@pytest.fixture
+def job_import_service(db_session):
+    return JobImportService(db_session)
+
+
+async def _chunks(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
 @pytest.mark.asyncio
 async def test_fetch_job__should_work__with_valid_url(job_service, db_session):
     # Arrange
@@ -71,3 +98,325 @@ async def test_fetch_job__should_raise__on_missing_job_id(job_service):
     # Act & Assert
     with pytest.raises(UnsupportedJobUrlException):
         await job_service.fetch_job(request)
+
+
+@pytest.mark.asyncio
+async def test_fetch_jobs__should_report_failures_per_item(job_service, db_session):
+    # Arrange
+    request = ScrapeJobListingsRequest(
+        job_urls=[
+            "https://hiring.cafe/job/first",
+            "https://hiring.cafe/jobs/invalid",
+            "https://hiring.cafe/job/missing",
+            "https://hiring.cafe/job/second",
+        ]
+    )
+
+    # Act
+    results = await job_service.fetch_jobs(request)
+
+    # Assert
+    assert [result.job_url for result in results] == [
+        str(job_url) for job_url in request.job_urls
+    ]
+    assert results[0].job_listing is not None
+    assert results[0].job_listing.application_url == "https://hiring.cafe/job/first"
+    assert results[1].job_listing is None and results[1].error is not None
+    assert results[2].job_listing is None and results[2].error is not None
+    assert results[3].job_listing is not None
+
+    for result in (results[0], results[3]):
+        db_job = await db_session.get(JobListing, result.job_listing.id)
+        assert db_job is not None
+
+
+@pytest.mark.asyncio
+async def test_fetch_job__should_update_in_place__when_scraped_again(
+    job_service, db_session
+):
+    # Arrange
+    request = ScrapeJobListingRequest(job_url="https://hiring.cafe/job/rescraped")
+    first = await job_service.fetch_job(request)
+
+    # Act
+    second = await job_service.fetch_job(request)
+
+    # Assert
+    assert second.id == first.id
+    assert second.scraped_at >= first.scraped_at
+
+    result = await db_session.execute(
+        select(func.count())
+        .select_from(JobListing)
+        .where(JobListing.external_id == "rescraped")
+    )
+    assert result.scalar_one() == 1
+
+
+@pytest.mark.asyncio
+async def test_create_job_manual__should_keep_first_listing__on_canonical_url(
+    job_service,
+):
+    # Arrange
+    first_request = CreateJobRequest(
+        title="Backend Engineer",
+        company="Software Corp",
+        application_url="https://Jobs.Example.com/apply/42/?utm_source=board&b=2&a=1",
+    )
+    second_request = CreateJobRequest(
+        title="Senior Backend Engineer",
+        company="Software Corp",
+        application_url="https://jobs.example.com/apply/42?a=1&b=2&gclid=abc#top",
+    )
+
+    # Act
+    first = await job_service.create_job_manual(first_request)
+    second = await job_service.create_job_manual(second_request)
+
+    # Assert
+    assert second.id == first.id
+    assert second.title == "Backend Engineer"
+    assert second.application_url == "https://jobs.example.com/apply/42?a=1&b=2"
+
+
+@pytest.mark.asyncio
+async def test_create_job_manual__should_keep_ref__as_part_of_the_url(job_service):
+    # Arrange
+    # Some boards identify the job by ?ref=, stripping it would merge different listings
+    first_request = CreateJobRequest(
+        title="Backend Engineer",
+        company="Software Corp",
+        application_url="https://jobs.example.com/apply?ref=1",
+    )
+    second_request = CreateJobRequest(
+        title="Frontend Engineer",
+        company="Software Corp",
+        application_url="https://jobs.example.com/apply?ref=2",
+    )
+
+    # Act
+    first = await job_service.create_job_manual(first_request)
+    second = await job_service.create_job_manual(second_request)
+
+    # Assert
+    assert second.id != first.id
+    assert second.application_url == "https://jobs.example.com/apply?ref=2"
+
+
+@pytest.mark.asyncio
+async def test_list_jobs__should_page_through_every_listing_once(
+    job_service, db_session
+):
+    # Arrange
+    posted_at = datetime(2025, 8, 1)
+    for i in range(7):
+        db_session.add(
+            JobListing(
+                title=f"Dated {i}",
+                company="Software Corp",
+                application_url=f"https://jobs.example.com/dated/{i}",
+                # Two listings share each posted_at so the id tie-break matters
+                posted_at=posted_at - timedelta(days=i // 2),
+            )
+        )
+    for i in range(3):
+        db_session.add(
+            JobListing(
+                title=f"Undated {i}",
+                company="Software Corp",
+                application_url=f"https://jobs.example.com/undated/{i}",
+            )
+        )
+    await db_session.commit()
+
+    # Act
+    pages = [await job_service.list_jobs(limit=3)]
+    while pages[-1].next_cursor is not None:
+        pages.append(await job_service.list_jobs(pages[-1].next_cursor, limit=3))
+
+    # Assert
+    items = [item for page in pages for item in page.items]
+    assert [len(page.items) for page in pages] == [3, 3, 3, 1]
+    assert len({item.id for item in items}) == 10
+    dated = [(item.posted_at, item.id) for item in items[:7]]
+    assert dated == sorted(dated, reverse=True)
+    assert all(item.posted_at is None for item in items[7:])
+    assert [item.id for item in items[7:]] == sorted(
+        (item.id for item in items[7:]), reverse=True
+    )
+
+
+@pytest.mark.asyncio
+async def test_list_jobs__should_raise__on_invalid_cursor(job_service):
+    # Act & Assert
+    with pytest.raises(InvalidCursorException):
+        await job_service.list_jobs("not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_get_job__should_load_description__left_out_of_list_views(
+    job_service, db_session
+):
+    # Arrange
+    created = await job_service.create_job_manual(
+        CreateJobRequest(
+            title="Backend Engineer",
+            company="Software Corp",
+            application_url="https://jobs.example.com/apply/described",
+            description="A long description. " * 500,
+        )
+    )
+    db_session.expunge_all()
+
+    # Act
+    page = await job_service.list_jobs()
+    job = await job_service.get_job(created.id)
+
+    # Assert
+    assert "description" not in page.items[0].model_dump()
+    assert job.description == "A long description. " * 500
+    with pytest.raises(JobListingNotFoundException):
+        await job_service.get_job(created.id + 1)
+
+
+@pytest.mark.asyncio
+async def test_search_jobs__should_rank_title_matches_first(job_service, db_session):
+    # Arrange
+    db_session.add_all(
+        [
+            JobListing(
+                title="Platform Engineer",
+                company="Cloud Corp",
+                application_url="https://jobs.example.com/platform",
+                description="Run our Kubernetes clusters and CI pipelines.",
+            ),
+            JobListing(
+                title="Kubernetes Engineer",
+                company="Container Corp",
+                application_url="https://jobs.example.com/kubernetes",
+                description="Operate clusters at scale.",
+            ),
+            JobListing(
+                title="Accountant",
+                company="Numbers Ltd",
+                application_url="https://jobs.example.com/accountant",
+                description="Balance the books.",
+            ),
+        ]
+    )
+    await db_session.commit()
+
+    # Act
+    results = await job_service.search_jobs("kubernetes")
+
+    # Assert
+    assert [result.title for result in results] == [
+        "Kubernetes Engineer",
+        "Platform Engineer",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_search_jobs__should_see_updated_listings(job_service, db_session):
+    # Arrange
+    created = await job_service.create_job_manual(
+        CreateJobRequest(
+            title="Backend Engineer",
+            company="Software Corp",
+            application_url="https://jobs.example.com/apply/search",
+        )
+    )
+
+    # Act
+    job = await db_session.get(JobListing, created.id)
+    job.title = "Rust Engineer"
+    await db_session.commit()
+
+    # Assert
+    assert [result.title for result in await job_service.search_jobs("rust")] == [
+        "Rust Engineer"
+    ]
+    assert await job_service.search_jobs("backend") == []
+    assert await job_service.search_jobs('"(') == []
+
+
+@pytest.mark.asyncio
+async def test_import_jobs__should_report_errors_per_row__from_csv(
+    job_import_service, db_session
+):
+    # Arrange
+    data = (
+        "title,company,application_url,description\r\n"
+        "Backend Engineer,Software Corp,https://jobs.example.com/1,\r\n"
+        ',Software Corp,https://jobs.example.com/2,"No title"\r\n'
+        '"Data Engineer, ML",Data Corp,https://jobs.example.com/3,"Line one\r\n'
+        'Line ""two"""\r\n'
+        "Too,few\r\n"
+        "\r\n"
+        "Frontend Engineer,Software Corp,https://jobs.example.com/4,Last row"
+    ).encode()
+
+    # Act
+    # Tiny chunks so rows, quoted newlines and \r\n all get split across chunks
+    result = await job_import_service.import_jobs(_chunks(data, 7), JobImportFormat.CSV)
+
+    # Assert
+    assert result.imported == 3
+    assert result.skipped == 0
+    assert result.failed == 2
+    assert [(error.line, error.error) for error in result.errors] == [
+        (3, "title: Field required"),
+        (6, "Expected 4 columns, got 2"),
+    ]
+    jobs = {
+        job.title: job
+        for job in await db_session.scalars(
+            select(JobListing)
+            .where(JobListing.source == "manual")
+            .options(undefer(JobListing.description))
+        )
+    }
+    assert set(jobs) == {"Backend Engineer", "Data Engineer, ML", "Frontend Engineer"}
+    assert jobs["Backend Engineer"].description is None
+    assert jobs["Data Engineer, ML"].description == 'Line one\r\nLine "two"'
+
+
+@pytest.mark.asyncio
+async def test_import_jobs__should_skip_existing_listings__from_ndjson(
+    job_import_service, job_service, db_session
+):
+    # Arrange
+    await job_service.create_job_manual(
+        CreateJobRequest(
+            title="Backend Engineer",
+            company="Software Corp",
+            application_url="https://jobs.example.com/apply/42",
+        )
+    )
+    data = b"\n".join(
+        [
+            b'{"title": "Senior Backend Engineer", "company": "Software Corp", "application_url": "https://jobs.example.com/apply/42?utm_source=board"}',
+            b'{"title": "Platform Engineer", "company": "Software Corp", "application_url": "https://jobs.example.com/apply/43"}',
+            b'{"title": "Staff Platform Engineer", "company": "Software Corp", "application_url": "https://jobs.example.com/apply/43/"}',
+            b'{"title": "Broken", ',
+            b"[1, 2]",
+            b'{"title": 7, "company": "Software Corp", "application_url": "https://jobs.example.com/apply/44"}',
+        ]
+    )
+
+    # Act
+    result = await job_import_service.import_jobs(
+        _chunks(data, 64), JobImportFormat.NDJSON
+    )
+
+    # Assert
+    assert result.imported == 1
+    assert result.skipped == 2
+    assert [error.line for error in result.errors] == [4, 5, 6]
+    assert result.errors[1].error == "Expected a JSON object"
+    titles = await db_session.scalars(
+        select(JobListing.title)
+        .where(JobListing.source == "manual")
+        .order_by(JobListing.id)
+    )
+    assert list(titles) == ["Backend Engineer", "Platform Engineer"]
@@ -1,11 +1,28 @@
+import asyncio
+
 import pytest
-from job_agent.scrape.job_scraper import HiringCafeJobScraper
+import pytest_asyncio
+
+from job_agent.scrape.http import HttpPoolConfig, HttpPoolMetrics, create_client_session
+from job_agent.scrape.job_scraper import (
+    HiringCafeJobScraper,
+    JobNotFoundError,
+    ScrapeFailedError,
+)
+from job_agent.scrape.rate_limit import (
+    AdaptiveRateLimiter,
+    RateLimitedError,
+    RateLimiterConfig,
+    RetryPolicy,
+)
+from job_agent.scrape.stand_in import HiringCafeStandIn, StandInConfig
 
 
+@pytest.mark.live
 @pytest.mark.asyncio
-async def test_hiring_cafe_job_scraper():
+async def test_hiring_cafe_job_scraper(http_session):
     # Arrange
-    scraper = HiringCafeJobScraper()
+    scraper = HiringCafeJobScraper(http_session)
     job_id = "c3VjY2Vzc2ZhY3RvcnNfX19jb21fX19raXdpcmFpbGx0X19fMTIxMjc2Mzg2Ng"  # This will need to change from time to time
 
     # Act
@@ -17,3 +34,241 @@ async def test_hiring_cafe_job_scraper():
     assert result.title is not None
     assert result.description is not None
     assert result.company is not None
+
+
+KIWIRAIL_JOB_ID = "c3VjY2Vzc2ZhY3RvcnNfX19jb21fX19raXdpcmFpbGx0ZF9fXzEyMTI3NjM4NjY"
+FIXTURE_COMPANIES = {"KiwiRail", "Canva", "Xero"}
+
+
+@pytest_asyncio.fixture
+async def hiring_cafe():
+    stand_in = HiringCafeStandIn.from_directory(
+        "tests/data/hiring_cafe",
+        StandInConfig(build_id="build-1", latency_seconds=0.01),
+    )
+    await stand_in.start()
+    try:
+        yield stand_in
+    finally:
+        await stand_in.close()
+
+
+@pytest.mark.asyncio
+async def test_scrape_job__should_discover_build_id(hiring_cafe, http_session):
+    # Arrange
+    scraper = HiringCafeJobScraper(http_session, hiring_cafe.base_url)
+
+    # Act
+    result = await scraper.scrape_job(KIWIRAIL_JOB_ID)
+
+    # Assert
+    assert result.title == "Senior Software Engineer"
+    assert result.company == "KiwiRail"
+    assert (
+        result.application_url
+        == "https://jobs.kiwirail.co.nz/job/Wellington-Senior-Software-Engineer/1212763866/"
+    )
+    assert hiring_cafe.home_page_hits == 1
+
+
+@pytest.mark.asyncio
+async def test_scrape_job__should_refresh_build_id_once__after_redeploy(
+    hiring_cafe, http_session
+):
+    # Arrange
+    scraper = HiringCafeJobScraper(http_session, hiring_cafe.base_url)
+    await scraper.scrape_job("before-redeploy")
+    hiring_cafe.build_id = "build-2"
+
+    # Act
+    results = await asyncio.gather(
+        *(scraper.scrape_job(f"after-redeploy-{i}") for i in range(10))
+    )
+
+    # Assert
+    assert {result.company for result in results} <= FIXTURE_COMPANIES
+    assert hiring_cafe.home_page_hits == 2
+
+
+@pytest.mark.asyncio
+async def test_scrape_job__should_raise__when_job_missing(hiring_cafe, http_session):
+    # Arrange
+    scraper = HiringCafeJobScraper(http_session, hiring_cafe.base_url)
+    hiring_cafe.config.serve_unknown_jobs = False
+
+    # Act & Assert
+    with pytest.raises(JobNotFoundError):
+        await scraper.scrape_job("missing")
+
+
+@pytest.mark.asyncio
+async def test_scrape_job__should_not_share_cached_jobs__between_sites(
+    hiring_cafe, http_session
+):
+    # Arrange
+    other_site = HiringCafeStandIn.from_directory(
+        "tests/data/hiring_cafe",
+        StandInConfig(build_id="build-1", serve_unknown_jobs=False),
+    )
+    await other_site.start()
+    await HiringCafeJobScraper(http_session, hiring_cafe.base_url).scrape_job(
+        "only-on-first-site"
+    )
+
+    # Act & Assert
+    try:
+        with pytest.raises(JobNotFoundError):
+            await HiringCafeJobScraper(http_session, other_site.base_url).scrape_job(
+                "only-on-first-site"
+            )
+    finally:
+        await other_site.close()
+
+
+@pytest.mark.asyncio
+async def test_create_client_session__should_record_pool_metrics(hiring_cafe):
+    # Arrange
+    config = HttpPoolConfig(limit=2, limit_per_host=2)
+    metrics = HttpPoolMetrics(config)
+
+    # Act
+    async with create_client_session(config, metrics) as session:
+        scraper = HiringCafeJobScraper(session, hiring_cafe.base_url)
+        await asyncio.gather(*(scraper.scrape_job(f"pooled-{i}") for i in range(6)))
+
+    # Assert
+    stats = metrics.stats()
+    assert stats.requests == 7  # home page + 6 jobs
+    assert stats.in_flight == 0
+    assert stats.peak_in_flight <= 6
+    assert stats.connections_created <= 2
+    assert stats.waits > 0
+
+
+@pytest.mark.asyncio
+async def test_scrape_job__should_retry__on_transient_failures(
+    hiring_cafe, http_session
+):
+    # Arrange
+    rate_limiter = AdaptiveRateLimiter()
+    scraper = HiringCafeJobScraper(
+        http_session,
+        hiring_cafe.base_url,
+        rate_limiter=rate_limiter,
+        retry_policy=RetryPolicy(max_attempts=3, base_delay_seconds=0.01),
+    )
+    hiring_cafe.failures = [429, 503]
+
+    # Act
+    result = await scraper.scrape_job("flaky")
+
+    # Assert
+    assert result.company in FIXTURE_COMPANIES
+    [stats] = rate_limiter.stats()
+    assert stats.retries == 2
+    assert stats.throttled == 1
+    assert stats.failures == 2
+
+
+@pytest.mark.asyncio
+async def test_scrape_job__should_raise__when_retries_exhausted(
+    hiring_cafe, http_session
+):
+    # Arrange
+    scraper = HiringCafeJobScraper(
+        http_session,
+        hiring_cafe.base_url,
+        retry_policy=RetryPolicy(max_attempts=2, base_delay_seconds=0.01),
+    )
+    await scraper.scrape_job("warm-up")
+    hiring_cafe.failures = [500, 500]
+
+    # Act & Assert
+    with pytest.raises(ScrapeFailedError):
+        await scraper.scrape_job("broken")
+
+
+@pytest.mark.asyncio
+async def test_scrape_job__should_log_sample__when_payload_malformed(
+    hiring_cafe, http_session, caplog
+):
+    # Arrange
+    scraper = HiringCafeJobScraper(http_session, hiring_cafe.base_url)
+    hiring_cafe.raw_bodies["malformed"] = (
+        b'{"pageProps": {"job": {"apply_url": "https://jobs.example.com/x", '
+        + b'"padding": "'
+        + b"x" * 100_000
+        + b'"'
+    )
+
+    # Act & Assert
+    with pytest.raises(ScrapeFailedError):
+        await scraper.scrape_job("malformed")
+    assert "Response format not as expected" in caplog.text
+    assert len(caplog.text) < 10_000
+
+
+@pytest.mark.asyncio
+async def test_scrape_job__should_raise__when_payload_too_large(
+    hiring_cafe, http_session
+):
+    # Arrange
+    scraper = HiringCafeJobScraper(http_session, hiring_cafe.base_url)
+    scraper.MAX_PAYLOAD_BYTES = 64 * 1024
+    hiring_cafe.raw_bodies["huge"] = (
+        b'{"pageProps": {"job": {"padding": "' + b"x" * 200_000 + b'"}}}'
+    )
+
+    # Act & Assert
+    with pytest.raises(ScrapeFailedError, match="exceeded"):
+        await scraper.scrape_job("huge")
+
+
+@pytest.mark.asyncio
+async def test_refresh_job__should_use_conditional_request(hiring_cafe, http_session):
+    # Arrange
+    scraper = HiringCafeJobScraper(http_session, hiring_cafe.base_url)
+    first = await scraper.refresh_job("conditional")
+
+    # Act
+    not_modified = await scraper.refresh_job("conditional", first.etag)
+    hiring_cafe.revision = 2
+    modified = await scraper.refresh_job("conditional", first.etag)
+
+    # Assert
+    assert first.job is not None
+    assert not_modified.job is None
+    assert not_modified.etag == first.etag
+    assert modified.job is not None
+    assert modified.etag != first.etag
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter__should_slow_down__when_error_ratio_rises():
+    # Arrange
+    now = 0.0
+    rate_limiter = AdaptiveRateLimiter(
+        RateLimiterConfig(rate_per_second=8, min_rate_per_second=1),
+        clock=lambda: now,
+    )
+
+    # Act
+    for _ in range(3):
+        now += 1
+        rate_limiter.record_failure("hiring.cafe")
+
+    # Assert
+    [stats] = rate_limiter.stats()
+    assert stats.rate_per_second == 1
+    assert stats.error_ratio == 1
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter__should_fail_fast__when_paused_by_retry_after():
+    # Arrange
+    rate_limiter = AdaptiveRateLimiter(RateLimiterConfig(max_wait_seconds=5))
+    rate_limiter.record_failure("hiring.cafe", throttled=True, retry_after=60)
+
+    # Act & Assert
+    with pytest.raises(RateLimitedError):
+        await rate_limiter.acquire("hiring.cafe")
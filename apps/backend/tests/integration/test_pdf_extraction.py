@@ -0,0 +1,133 @@
+import asyncio
+from io import BytesIO
+
+import pytest
+from pypdf import PdfReader, PdfWriter
+
+from job_agent.pdf_extraction import (
+    PdfExtractionError,
+    PdfExtractionTimeoutError,
+    PdfExtractorConfig,
+    PdfTextExtractor,
+    PdfTooManyPagesError,
+)
+
+
+def _make_extractor(**config) -> PdfTextExtractor:
+    return PdfTextExtractor(PdfExtractorConfig(workers=1, **config))
+
+
+def _repeat_pages(pdf: bytes, times: int) -> bytes:
+    writer = PdfWriter()
+    for _ in range(times):
+        writer.append(PdfReader(BytesIO(pdf)))
+    out = BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+@pytest.mark.asyncio
+async def test_extract_text__should_return_page_text__when_pdf_valid(sample_resume):
+    # Arrange
+    extractor = _make_extractor()
+    expected = "".join(
+        f"{page.extract_text()}\n" for page in PdfReader(BytesIO(sample_resume)).pages
+    )
+
+    # Act
+    try:
+        text = await extractor.extract_text(sample_resume)
+    finally:
+        extractor.close()
+
+    # Assert
+    assert text == expected
+    assert text.strip()
+    stats = extractor.stats()
+    assert stats.extracted == 1
+    assert stats.failed == 0
+    assert stats.extract_seconds_total > 0
+
+
+@pytest.mark.asyncio
+async def test_extract_text__should_raise__when_pdf_exceeds_limits(sample_resume):
+    # Arrange
+    extractor = _make_extractor(max_pages=2)
+
+    # Act / Assert
+    try:
+        with pytest.raises(PdfTooManyPagesError):
+            await extractor.extract_text(_repeat_pages(sample_resume, 3))
+        with pytest.raises(PdfExtractionError):
+            await extractor.extract_text(b"not a pdf")
+        # The worker is still usable after failures
+        assert await extractor.extract_text(_repeat_pages(sample_resume, 2))
+    finally:
+        extractor.close()
+
+    stats = extractor.stats()
+    assert stats.failed == 2
+    assert stats.extracted == 1
+
+
+@pytest.mark.asyncio
+async def test_extract_text__should_time_out__when_extraction_too_slow(sample_resume):
+    # Arrange
+    extractor = _make_extractor(timeout_seconds=0.001, max_pages=200)
+
+    # Act / Assert
+    try:
+        with pytest.raises(PdfExtractionTimeoutError):
+            await extractor.extract_text(_repeat_pages(sample_resume, 200))
+    finally:
+        extractor.close()
+
+    assert extractor.stats().timeouts == 1
+
+
+@pytest.mark.asyncio
+async def test_extract_text__should_kill_worker__when_alarm_never_fires(sample_resume):
+    # Arrange
+    # A zero timeout never arms the worker's alarm, like a worker stuck in C code
+    config = PdfExtractorConfig(
+        workers=1, timeout_seconds=0, kill_grace_seconds=0.01, max_pages=200
+    )
+    extractor = PdfTextExtractor(config)
+
+    # Act / Assert
+    try:
+        with pytest.raises(PdfExtractionTimeoutError):
+            await extractor.extract_text(_repeat_pages(sample_resume, 200))
+        config.kill_grace_seconds = 30
+        # The pool is started again for the next document
+        assert await extractor.extract_text(sample_resume)
+    finally:
+        extractor.close()
+
+    stats = extractor.stats()
+    assert stats.timeouts == 1
+    assert stats.extracted == 1
+
+
+@pytest.mark.asyncio
+async def test_extract_text__should_not_time_out__when_queued_behind_other_documents(
+    sample_resume,
+):
+    # Arrange
+    # Together the documents take longer than the deadline, each one on its own doesn't
+    extractor = _make_extractor(timeout_seconds=1, kill_grace_seconds=0.5)
+
+    # Act
+    try:
+        texts = await asyncio.gather(
+            *(extractor.extract_text(sample_resume) for _ in range(100))
+        )
+    finally:
+        extractor.close()
+
+    # Assert
+    assert all(texts)
+    stats = extractor.stats()
+    assert stats.timeouts == 0
+    assert stats.extracted == 100
+    assert stats.peak_queued > 0
@@ -0,0 +1,193 @@
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Optional
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from job_agent.models import JobListing
+from job_agent.scrape.job_scraper import (
+    HiringCafeJobScraper,
+    JobNotFoundError,
+    RefreshResult,
+    ScrapeFailedError,
+)
+from job_agent.services.job_listing_service import JobService
+from job_agent.services.schemas import ScrapeJobListingRequest
+from job_agent.workers.recrawl_sweeper import RecrawlSweeper
+
+
+class MockScraper(HiringCafeJobScraper):
+    titles: dict[str, str] = {}
+    closed: set[str] = set()
+    failing: set[str] = set()
+    # Runs once, during the first refresh, to interleave something with a sweep
+    during_refresh: Optional[Callable[[], Awaitable[None]]] = None
+
+    def _job(self, job_id: str) -> JobListing:
+        return JobListing(
+            title=self.titles.get(job_id, "Software Engineer"),
+            company="Software Corp",
+            application_url=f"https://jobs.example.com/{job_id}",
+            source="hiring.cafe",
+            description="An exciting software role.",
+            posted_at=datetime(2025, 8, 1),
+        )
+
+    async def scrape_job(self, job_id: str) -> JobListing:
+        return self._job(job_id)
+
+    async def refresh_job(
+        self, job_id: str, etag: Optional[str] = None
+    ) -> RefreshResult:
+        during_refresh, MockScraper.during_refresh = MockScraper.during_refresh, None
+        if during_refresh is not None:
+            await during_refresh()
+        if job_id in self.closed:
+            raise JobNotFoundError(job_id)
+        if job_id in self.failing:
+            raise ScrapeFailedError(job_id, "unavailable")
+        return RefreshResult(job_id=job_id, job=self._job(job_id), etag=etag)
+
+
+@pytest.fixture
+def job_scraper(http_session):
+    MockScraper.titles = {}
+    MockScraper.closed = set()
+    MockScraper.failing = set()
+    MockScraper.during_refresh = None
+    return MockScraper(http_session)
+
+
+@pytest.fixture
+def recrawl_sweeper(db_connection, job_scraper):
+    session_maker = async_sessionmaker(bind=db_connection, expire_on_commit=False)
+    return RecrawlSweeper(
+        session_maker,
+        lambda: job_scraper,
+        max_age_seconds=60 * 60,
+        batch_size=2,
+        rate_per_second=1000,
+    )
+
+
+@pytest.mark.asyncio
+async def test_sweep__should_only_rewrite_changed_listings(
+    db_session, job_scraper, recrawl_sweeper
+):
+    # Arrange
+    job_service = JobService(db_session, job_scraper)
+    listings = {}
+    for job_id in ["same", "edited", "taken-down"]:
+        listings[job_id] = await job_service.fetch_job(
+            ScrapeJobListingRequest(job_url=f"https://hiring.cafe/job/{job_id}")
+        )
+    long_ago = datetime.utcnow() - timedelta(days=2)
+    await db_session.execute(
+        update(JobListing).values(scraped_at=long_ago, updated_at=long_ago)
+    )
+    await db_session.commit()
+    MockScraper.titles["edited"] = "Senior Software Engineer"
+    MockScraper.closed.add("taken-down")
+
+    # Act
+    await recrawl_sweeper.sweep()
+
+    # Assert
+    rows = {
+        job_id: await db_session.get(JobListing, listing.id, populate_existing=True)
+        for job_id, listing in listings.items()
+    }
+    assert rows["same"].updated_at == long_ago
+    assert rows["same"].scraped_at > long_ago
+    assert rows["edited"].title == "Senior Software Engineer"
+    assert rows["edited"].updated_at > long_ago
+    assert rows["taken-down"].closed_at is not None
+
+    stats = recrawl_sweeper.stats()
+    assert stats.sweeps_completed == 1
+    assert (stats.checked, stats.changed, stats.unchanged, stats.closed) == (3, 1, 1, 1)
+    assert stats.stale_listings == 0
+
+
+@pytest.mark.asyncio
+async def test_sweep__should_skip_fresh_listings(
+    db_session, job_scraper, recrawl_sweeper
+):
+    # Arrange
+    job_service = JobService(db_session, job_scraper)
+    await job_service.fetch_job(
+        ScrapeJobListingRequest(job_url="https://hiring.cafe/job/fresh")
+    )
+
+    # Act
+    await recrawl_sweeper.sweep()
+
+    # Assert
+    stats = recrawl_sweeper.stats()
+    assert stats.checked == 0
+    assert stats.max_lag_seconds is None
+
+
+async def _add_stale_listings(db_session, job_scraper, job_ids: list[str]) -> datetime:
+    job_service = JobService(db_session, job_scraper)
+    for job_id in job_ids:
+        await job_service.fetch_job(
+            ScrapeJobListingRequest(job_url=f"https://hiring.cafe/job/{job_id}")
+        )
+    long_ago = datetime.utcnow() - timedelta(days=2)
+    await db_session.execute(
+        update(JobListing).values(scraped_at=long_ago, updated_at=long_ago)
+    )
+    await db_session.commit()
+    return long_ago
+
+
+@pytest.mark.asyncio
+async def test_sweep__should_skip_listings__claimed_by_another_sweep(
+    db_connection, db_session, job_scraper, recrawl_sweeper
+):
+    # Arrange
+    await _add_stale_listings(db_session, job_scraper, ["first", "second"])
+    other_batches = []
+
+    async def sweep_in_another_process():
+        session_maker = async_sessionmaker(bind=db_connection, expire_on_commit=False)
+        async with session_maker() as db:
+            other_batches.append(
+                await JobService(db, job_scraper).refresh_stale_jobs(
+                    datetime.utcnow() - timedelta(hours=1)
+                )
+            )
+
+    MockScraper.during_refresh = sweep_in_another_process
+
+    # Act
+    await recrawl_sweeper.sweep()
+
+    # Assert
+    assert other_batches[0].checked == 0
+    assert recrawl_sweeper.stats().checked == 2
+
+
+@pytest.mark.asyncio
+async def test_sweep__should_leave_failed_listings_stale(
+    db_session, job_scraper, recrawl_sweeper
+):
+    # Arrange
+    long_ago = await _add_stale_listings(db_session, job_scraper, ["ok", "broken"])
+    MockScraper.failing.add("broken")
+
+    # Act
+    await recrawl_sweeper.sweep()
+
+    # Assert
+    result = await db_session.execute(
+        select(JobListing.external_id, JobListing.scraped_at)
+    )
+    scraped_at = {external_id: scraped_at for external_id, scraped_at in result}
+    assert scraped_at["broken"] == long_ago
+    assert scraped_at["ok"] > long_ago
+    stats = recrawl_sweeper.stats()
+    assert stats.failed == 1
+    assert stats.stale_listings == 1
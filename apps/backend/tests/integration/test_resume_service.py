@@ -0,0 +1,215 @@
+import os
+
+import pytest
+from sqlalchemy import func, select
+
+from job_agent.models import Resume, StoredFile
+from job_agent.services.exceptions import (
+    ResumeNameConflictException,
+    ResumeTooLargeException,
+)
+from job_agent.services.resume_service import ResumeService
+from job_agent.services.s3_file_uploader import S3Upload
+from job_agent.services.schemas import FileUpload, UploadResumeRequest
+
+
+async def _object_keys(s3_client, s3_config) -> list[str]:
+    response = await s3_client.list_objects_v2(Bucket=s3_config["bucket_name"])
+    return [obj["Key"] for obj in response.get("Contents", [])]
+
+
+async def _chunks(data: bytes, chunk_size: int):
+    for start in range(0, len(data), chunk_size):
+        yield data[start : start + chunk_size]
+
+
+def _upload(name: str, data: bytes, chunk_size: int = 64 * 1024) -> UploadResumeRequest:
+    return UploadResumeRequest(
+        name=name,
+        file=FileUpload(
+            content_type="application/pdf", chunks=_chunks(data, chunk_size)
+        ),
+    )
+
+
+@pytest.mark.asyncio
+async def test_upload_resume__should_reuse_stored_file__when_content_already_uploaded(
+    resume_service,
+    db_session,
+    candidate,
+    pdf_extractor,
+    s3_client,
+    s3_config,
+    sample_resume,
+):
+    # Act
+    first = await resume_service.upload_resume(
+        candidate.id, _upload("Resume", sample_resume)
+    )
+    second = await resume_service.upload_resume(
+        candidate.id, _upload("Same resume", sample_resume)
+    )
+
+    # Assert
+    result = await db_session.execute(
+        select(Resume.stored_file_id, Resume.text_content).where(
+            Resume.id.in_([first.id, second.id])
+        )
+    )
+    rows = result.all()
+    assert rows[0] == rows[1]
+    assert rows[0].text_content.strip()
+
+    stored_file = await db_session.get(StoredFile, rows[0].stored_file_id)
+    assert stored_file.ref_count == 2
+    assert await _object_keys(s3_client, s3_config) == [stored_file.key]
+    assert pdf_extractor.stats().extracted == 1
+
+
+@pytest.mark.asyncio
+async def test_delete_resume__should_delete_object__when_last_reference_removed(
+    resume_service, db_session, candidate, s3_client, s3_config, sample_resume
+):
+    # Arrange
+    first = await resume_service.upload_resume(
+        candidate.id, _upload("Resume", sample_resume)
+    )
+    second = await resume_service.upload_resume(
+        candidate.id, _upload("Same resume", sample_resume)
+    )
+    stored_file_id = await db_session.scalar(
+        select(Resume.stored_file_id).where(Resume.id == first.id)
+    )
+
+    # Act
+    await resume_service.delete_resume(candidate.id, first.id)
+    refs_after_first = await db_session.scalar(
+        select(StoredFile.ref_count).where(StoredFile.id == stored_file_id)
+    )
+    keys_after_first = await _object_keys(s3_client, s3_config)
+    await resume_service.delete_resume(candidate.id, second.id)
+
+    # Assert
+    assert refs_after_first == 1
+    assert len(keys_after_first) == 1
+    assert await db_session.get(StoredFile, stored_file_id) is None
+    assert await _object_keys(s3_client, s3_config) == []
+
+
+@pytest.mark.asyncio
+async def test_upload_resume__should_raise_conflict_and_not_store_file__when_name_taken(
+    resume_service, candidate, s3_client, s3_config, sample_resume
+):
+    # Arrange
+    await resume_service.upload_resume(candidate.id, _upload("Resume", sample_resume))
+    keys_before = await _object_keys(s3_client, s3_config)
+
+    # Act
+    with pytest.raises(ResumeNameConflictException):
+        await resume_service.upload_resume(
+            candidate.id, _upload("Resume", sample_resume + b"\n% edited\n")
+        )
+
+    # Assert
+    assert await _object_keys(s3_client, s3_config) == keys_before
+
+
+@pytest.mark.asyncio
+async def test_get_resumes_by_candidate_id__should_list_resumes__when_candidate_has_resumes(
+    resume_service, candidate, sample_resume
+):
+    # Arrange
+    first = await resume_service.upload_resume(
+        candidate.id, _upload("Resume", sample_resume)
+    )
+    second = await resume_service.upload_resume(
+        candidate.id, _upload("Other resume", sample_resume)
+    )
+
+    # Act
+    resumes = await resume_service.get_resumes_by_candidate_id(candidate.id)
+
+    # Assert
+    assert resumes == [first, second]
+
+
+@pytest.mark.asyncio
+async def test_upload_resume__should_raise_too_large__when_over_limit(
+    db_session,
+    s3_file_uploader,
+    pdf_extractor,
+    candidate,
+    s3_client,
+    s3_config,
+    sample_resume,
+):
+    # Arrange
+    resume_service = ResumeService(
+        db_session,
+        s3_file_uploader,
+        pdf_extractor,
+        max_upload_bytes=len(sample_resume) - 1,
+    )
+
+    # Act
+    with pytest.raises(ResumeTooLargeException):
+        await resume_service.upload_resume(
+            candidate.id, _upload("Resume", sample_resume, chunk_size=1024)
+        )
+
+    # Assert
+    assert await db_session.scalar(select(func.count()).select_from(StoredFile)) == 0
+    assert await _object_keys(s3_client, s3_config) == []
+    assert pdf_extractor.stats().extracted == 0
+
+
+@pytest.mark.asyncio
+async def test_s3_upload__should_upload_in_parts__when_larger_than_part_size(
+    s3_file_uploader, s3_client, s3_config
+):
+    # Arrange
+    data = os.urandom(S3Upload.PART_SIZE * 2 + 1024)
+    upload = s3_file_uploader.start_upload("application/octet-stream")
+
+    # Act
+    async for chunk in _chunks(data, 1024 * 1024):
+        await upload.write(chunk)
+    await upload.complete()
+
+    # Assert
+    response = await s3_client.get_object(
+        Bucket=s3_config["bucket_name"], Key=upload.key
+    )
+    # Multipart objects' ETags end in the number of parts
+    assert response["ETag"].strip('"').endswith("-3")
+    assert await response["Body"].read() == data
+
+
+@pytest.mark.asyncio
+async def test_remove_reference__should_keep_object__until_delete_object_called(
+    resume_service,
+    db_session,
+    s3_file_uploader,
+    candidate,
+    s3_client,
+    s3_config,
+    sample_resume,
+):
+    # Arrange
+    resume = await resume_service.upload_resume(
+        candidate.id, _upload("Resume", sample_resume)
+    )
+    stored_file = await db_session.scalar(
+        select(StoredFile).join(Resume).where(Resume.id == resume.id)
+    )
+    await db_session.delete(await db_session.get(Resume, resume.id))
+
+    # Act
+    last_reference = await s3_file_uploader.remove_reference(stored_file)
+    keys_before_delete = await _object_keys(s3_client, s3_config)
+    await s3_file_uploader.delete_object(stored_file)
+
+    # Assert
+    assert last_reference
+    assert keys_before_delete == [stored_file.key]
+    assert await _object_keys(s3_client, s3_config) == []
@@ -0,0 +1,169 @@
+import asyncio
+from contextlib import nullcontext
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from job_agent.models import Resume, ResumeProcessingStatus
+from job_agent.services.resume_service import ResumeService
+from job_agent.services.schemas import FileUpload, UploadResumeRequest
+from job_agent.workers.resume_worker import ResumeWorkerPool
+
+
+@pytest.fixture
+def resume_worker_pool(db_connection, s3_client, s3_config, pdf_extractor):
+    # Every worker session shares the test's rollback-wrapped connection, so one worker at a time
+    session_maker = async_sessionmaker(bind=db_connection, expire_on_commit=False)
+    return ResumeWorkerPool(
+        session_maker,
+        lambda: nullcontext(s3_client),
+        s3_config["bucket_name"],
+        pdf_extractor,
+        concurrency=1,
+        poll_interval_seconds=0.01,
+        max_attempts=2,
+    )
+
+
+async def _chunks(data: bytes):
+    yield data
+
+
+def _upload(name: str, data: bytes) -> UploadResumeRequest:
+    return UploadResumeRequest(
+        name=name,
+        file=FileUpload(content_type="application/pdf", chunks=_chunks(data)),
+        process_in_background=True,
+    )
+
+
+async def wait_for_processing(
+    resume_service: ResumeService, candidate_id: int, resume_id: int
+):
+    for _ in range(500):
+        processing = await resume_service.get_resume_processing(candidate_id, resume_id)
+        if processing.status in (
+            ResumeProcessingStatus.READY,
+            ResumeProcessingStatus.FAILED,
+        ):
+            return processing
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"Resume {resume_id} was never processed")
+
+
+@pytest.mark.asyncio
+async def test_upload_resume__should_extract_text_in_worker_pool__when_processed_in_background(
+    resume_service,
+    db_session,
+    candidate,
+    pdf_extractor,
+    resume_worker_pool,
+    sample_resume,
+):
+    # Arrange
+    resume = await resume_service.upload_resume(
+        candidate.id, _upload("Resume", sample_resume)
+    )
+    assert resume.processing_status == ResumeProcessingStatus.PENDING
+    assert pdf_extractor.stats().extracted == 0
+
+    # Act
+    resume_worker_pool.start()
+    try:
+        processing = await wait_for_processing(resume_service, candidate.id, resume.id)
+        text_content = await db_session.scalar(
+            select(Resume.text_content).where(Resume.id == resume.id)
+        )
+    finally:
+        # Stopping can cancel a worker mid-query on the shared connection, nothing reads after it
+        await resume_worker_pool.stop()
+
+    # Assert
+    assert processing.status == ResumeProcessingStatus.READY
+    assert processing.attempts == 1
+    assert processing.error is None
+    assert text_content.strip()
+
+
+@pytest.mark.asyncio
+async def test_worker_pool__should_fail_without_retrying__when_pdf_unreadable(
+    resume_service, candidate, resume_worker_pool
+):
+    # Arrange
+    resume = await resume_service.upload_resume(
+        candidate.id, _upload("Resume", b"%PDF-1.4 not really")
+    )
+
+    # Act
+    resume_worker_pool.start()
+    try:
+        processing = await wait_for_processing(resume_service, candidate.id, resume.id)
+    finally:
+        await resume_worker_pool.stop()
+
+    # Assert
+    assert processing.status == ResumeProcessingStatus.FAILED
+    assert processing.attempts == 1
+    assert "Invalid resume file" in processing.error
+
+
+@pytest.mark.asyncio
+async def test_worker_pool__should_give_up__after_max_attempts(
+    resume_service, candidate, resume_worker_pool, s3_client, s3_config, sample_resume
+):
+    # Arrange
+    resume = await resume_service.upload_resume(
+        candidate.id, _upload("Resume", sample_resume)
+    )
+    response = await s3_client.list_objects_v2(Bucket=s3_config["bucket_name"])
+    for obj in response["Contents"]:
+        await s3_client.delete_object(Bucket=s3_config["bucket_name"], Key=obj["Key"])
+
+    # Act
+    resume_worker_pool.start()
+    try:
+        processing = await wait_for_processing(resume_service, candidate.id, resume.id)
+    finally:
+        await resume_worker_pool.stop()
+
+    # Assert
+    assert processing.status == ResumeProcessingStatus.FAILED
+    assert processing.attempts == 2
+    assert processing.error == "Gave up after 2 attempts"
+
+
+@pytest.mark.asyncio
+async def test_process_resume__should_drop_result__when_claim_lost(
+    resume_service, db_session, candidate, sample_resume
+):
+    # Arrange
+    resume = await resume_service.upload_resume(
+        candidate.id, _upload("Resume", sample_resume)
+    )
+    # Another worker took the resume over after this one's lease (attempt 1) expired
+    await db_session.execute(
+        update(Resume)
+        .where(Resume.id == resume.id)
+        .values(
+            processing_status=ResumeProcessingStatus.PROCESSING,
+            processing_attempts=2,
+        )
+    )
+    await db_session.commit()
+
+    # Act
+    processed = await resume_service.process_resume(resume.id, attempt=1)
+
+    # Assert
+    assert not processed
+    row = (
+        await db_session.execute(
+            select(Resume.processing_status, Resume.text_content).where(
+                Resume.id == resume.id
+            )
+        )
+    ).one()
+    assert row.processing_status == ResumeProcessingStatus.PROCESSING
+    assert row.text_content is None
+    assert await resume_service.process_resume(resume.id, attempt=2)
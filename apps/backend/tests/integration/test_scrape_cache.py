@@ -0,0 +1,124 @@
+import asyncio
+
+import pytest
+
+from job_agent.scrape.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.mark.asyncio
+async def test_get_or_load__should_hit__when_loaded_before(clock):
+    # Arrange
+    cache: TTLCache[str, int] = TTLCache(ttl_seconds=60, max_size=10, clock=clock)
+    calls = 0
+
+    async def loader() -> int:
+        nonlocal calls
+        calls += 1
+        return 42
+
+    # Act
+    first = await cache.get_or_load("job", loader)
+    second = await cache.get_or_load("job", loader)
+
+    # Assert
+    assert first == second == 42
+    assert calls == 1
+    stats = cache.stats()
+    assert stats.misses == 1
+    assert stats.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_get_or_load__should_coalesce__concurrent_loads(clock):
+    # Arrange
+    cache: TTLCache[str, int] = TTLCache(ttl_seconds=60, max_size=10, clock=clock)
+    release = asyncio.Event()
+    calls = 0
+
+    async def loader() -> int:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return 42
+
+    # Act
+    pending = [asyncio.create_task(cache.get_or_load("job", loader)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*pending)
+
+    # Assert
+    assert results == [42] * 5
+    assert calls == 1
+    assert cache.stats().coalesced == 4
+
+
+@pytest.mark.asyncio
+async def test_get_or_load__should_reload__when_expired(clock):
+    # Arrange
+    cache: TTLCache[str, int] = TTLCache(ttl_seconds=60, max_size=10, clock=clock)
+    values = iter([1, 2])
+
+    async def loader() -> int:
+        return next(values)
+
+    await cache.get_or_load("job", loader)
+    clock.now += 61
+
+    # Act
+    result = await cache.get_or_load("job", loader)
+
+    # Assert
+    assert result == 2
+    assert cache.stats().misses == 2
+
+
+@pytest.mark.asyncio
+async def test_get_or_load__should_evict_least_recently_used(clock):
+    # Arrange
+    cache: TTLCache[str, str] = TTLCache(ttl_seconds=60, max_size=2, clock=clock)
+
+    async def load(key: str) -> str:
+        return await cache.get_or_load(key, lambda: asyncio.sleep(0, result=key))
+
+    await load("a")
+    await load("b")
+    await load("a")
+
+    # Act
+    await load("c")
+
+    # Assert
+    stats = cache.stats()
+    assert stats.evictions == 1
+    assert stats.size == 2
+    await load("a")
+    assert cache.stats().hits == 2  # "a" survived, "b" was evicted
+
+
+@pytest.mark.asyncio
+async def test_get_or_load__should_not_cache__failures(clock):
+    # Arrange
+    cache: TTLCache[str, int] = TTLCache(ttl_seconds=60, max_size=10, clock=clock)
+
+    async def failing_loader() -> int:
+        raise KeyError("pageProps")
+
+    # Act & Assert
+    with pytest.raises(KeyError):
+        await cache.get_or_load("job", failing_loader)
+
+    assert await cache.get_or_load("job", lambda: asyncio.sleep(0, result=1)) == 1
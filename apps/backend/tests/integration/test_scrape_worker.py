@@ -0,0 +1,157 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from job_agent.models import JobListing, ScrapeTask, ScrapeTaskStatus
+from job_agent.scrape.job_scraper import HiringCafeJobScraper, JobNotFoundError
+from job_agent.services.exceptions import UnsupportedJobUrlException
+from job_agent.services.job_listing_service import JobService
+from job_agent.services.schemas import ScrapeJobListingRequest
+from job_agent.workers.scrape_worker import ScrapeWorkerPool
+
+
+class MockScraper(HiringCafeJobScraper):
+    async def scrape_job(self, job_id: str) -> JobListing:
+        if job_id == "gone":
+            raise JobNotFoundError(job_id)
+        if job_id == "crash":
+            raise RuntimeError("worker blew up")
+
+        return JobListing(
+            title="Software Engineer",
+            company="Software Corp",
+            application_url=f"https://jobs.example.com/{job_id}",
+            source="hiring.cafe",
+            description="An exciting software role.",
+        )
+
+
+@pytest.fixture
+def job_service(db_session, http_session):
+    return JobService(db_session, MockScraper(http_session))
+
+
+@pytest.fixture
+def scrape_worker_pool(db_connection, http_session):
+    # Every worker session shares the test's rollback-wrapped connection, so one worker at a time
+    session_maker = async_sessionmaker(bind=db_connection, expire_on_commit=False)
+    return ScrapeWorkerPool(
+        session_maker,
+        lambda: MockScraper(http_session),
+        concurrency=1,
+        poll_interval_seconds=0.01,
+        max_attempts=2,
+    )
+
+
+async def wait_for_task(job_service: JobService, task_id: int):
+    for _ in range(500):
+        task = await job_service.get_scrape_task(task_id)
+        if task.status in (ScrapeTaskStatus.SUCCEEDED, ScrapeTaskStatus.FAILED):
+            return task
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"Scrape task {task_id} never finished")
+
+
+@pytest.mark.asyncio
+async def test_enqueue_fetch_job__should_be_processed_by_worker_pool(
+    job_service, scrape_worker_pool
+):
+    # Arrange
+    task = await job_service.enqueue_fetch_job(
+        ScrapeJobListingRequest(job_url="https://hiring.cafe/job/queued123")
+    )
+    assert task.status == ScrapeTaskStatus.QUEUED
+
+    # Act
+    scrape_worker_pool.start()
+    try:
+        task = await wait_for_task(job_service, task.id)
+    finally:
+        await scrape_worker_pool.stop()
+
+    # Assert
+    assert task.status == ScrapeTaskStatus.SUCCEEDED
+    assert task.attempts == 1
+    assert task.job_listing is not None
+    assert task.job_listing.application_url == "https://jobs.example.com/queued123"
+
+
+@pytest.mark.asyncio
+async def test_enqueue_fetch_job__should_raise__on_unsupported_url(job_service):
+    # Arrange
+    request = ScrapeJobListingRequest(job_url="https://example.com/careers/1")
+
+    # Act & Assert
+    with pytest.raises(UnsupportedJobUrlException):
+        await job_service.enqueue_fetch_job(request)
+
+
+@pytest.mark.asyncio
+async def test_worker_pool__should_fail_task__when_job_missing(
+    job_service, scrape_worker_pool
+):
+    # Arrange
+    task = await job_service.enqueue_fetch_job(
+        ScrapeJobListingRequest(job_url="https://hiring.cafe/job/gone")
+    )
+
+    # Act
+    scrape_worker_pool.start()
+    try:
+        task = await wait_for_task(job_service, task.id)
+    finally:
+        await scrape_worker_pool.stop()
+
+    # Assert
+    assert task.status == ScrapeTaskStatus.FAILED
+    assert task.attempts == 1
+    assert "No job found" in task.error
+
+
+@pytest.mark.asyncio
+async def test_worker_pool__should_give_up__after_max_attempts(
+    job_service, scrape_worker_pool
+):
+    # Arrange
+    task = await job_service.enqueue_fetch_job(
+        ScrapeJobListingRequest(job_url="https://hiring.cafe/job/crash")
+    )
+
+    # Act
+    scrape_worker_pool.start()
+    try:
+        task = await wait_for_task(job_service, task.id)
+    finally:
+        await scrape_worker_pool.stop()
+
+    # Assert
+    assert task.status == ScrapeTaskStatus.FAILED
+    assert task.attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_worker_pool__should_reclaim_task__when_lease_expired(
+    job_service, scrape_worker_pool, db_session
+):
+    # Arrange
+    abandoned = ScrapeTask(job_url="https://hiring.cafe/job/abandoned")
+    abandoned.status = ScrapeTaskStatus.RUNNING
+    abandoned.attempts = 1
+    abandoned.lease_expires_at = datetime.utcnow() - timedelta(minutes=1)
+    db_session.add(abandoned)
+    await db_session.commit()
+    db_session.expunge(abandoned)
+
+    # Act
+    scrape_worker_pool.start()
+    try:
+        task = await wait_for_task(job_service, abandoned.id)
+    finally:
+        await scrape_worker_pool.stop()
+
+    # Assert
+    assert task.status == ScrapeTaskStatus.SUCCEEDED
+    assert task.attempts == 2